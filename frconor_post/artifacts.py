@@ -0,0 +1,275 @@
+"""Index of generated image files.
+
+When an image job finishes, the files it wrote to the output directory
+(output.image_directory) are found by an OutputWatcher and recorded in
+state/image_artifacts.sqlite3 with their size, dimensions and generation
+time. Artifacts are indexed by job batch and, once the post is logged,
+by post ID, so picking the image for a post is a lookup rather than a
+search of the output directory.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import struct
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import NamedTuple
+
+from .config import get_output_dir, get_state_dir
+
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".webp")
+
+ARTIFACT_COLUMNS = (
+    "id", "path", "variation", "width", "height", "bytes", "seconds",
+    "job_id", "batch_id", "post_id", "created_at",
+)
+
+_VARIATION_NAME = re.compile(r"variation_(\d+)", re.IGNORECASE)
+
+
+class ImageArtifact(NamedTuple):
+    """A generated image file."""
+    id: int
+    path: str
+    variation: int
+    width: int | None  # None if the header couldn't be read
+    height: int | None
+    bytes: int
+    seconds: float  # Wall time of the job that produced it
+    job_id: int
+    batch_id: str
+    post_id: str | None  # Set once the post using the batch is logged
+    created_at: float
+
+
+def get_artifacts_db_path() -> Path:
+    """Get the path to the image artifact index."""
+    return get_state_dir() / "image_artifacts.sqlite3"
+
+
+def _connect() -> sqlite3.Connection:
+    path = get_artifacts_db_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS artifacts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path TEXT NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            variation INTEGER NOT NULL,
+            width INTEGER,
+            height INTEGER,
+            bytes INTEGER NOT NULL,
+            seconds REAL NOT NULL,
+            job_id INTEGER NOT NULL,
+            batch_id TEXT NOT NULL,
+            post_id TEXT,
+            created_at REAL NOT NULL,
+            UNIQUE (path, mtime_ns)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS artifacts_batch ON artifacts (batch_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS artifacts_post ON artifacts (post_id)")
+    return conn
+
+
+def image_size(path: Path) -> tuple[int, int] | None:
+    """Width and height from a PNG, JPEG or WebP header, or None if unreadable."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(32)
+            if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+                return struct.unpack(">II", head[16:24])
+
+            if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+                kind = head[12:16]
+                if kind == b"VP8X":
+                    w, h = head[24:27], head[27:30]
+                    return int.from_bytes(w, "little") + 1, int.from_bytes(h, "little") + 1
+                if kind == b"VP8L":
+                    bits = int.from_bytes(head[21:25], "little")
+                    return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+                if kind == b"VP8 ":
+                    w, h = struct.unpack("<HH", head[26:30])
+                    return w & 0x3FFF, h & 0x3FFF
+                return None
+
+            if head.startswith(b"\xff\xd8"):
+                # Walk the JPEG segments to the first start-of-frame marker
+                f.seek(2)
+                while True:
+                    marker = f.read(2)
+                    if len(marker) < 2 or marker[0] != 0xFF:
+                        return None
+                    length = struct.unpack(">H", f.read(2))[0]
+                    if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+                        height, width = struct.unpack(">xHH", f.read(5))
+                        return width, height
+                    f.seek(length - 2, os.SEEK_CUR)
+    except (OSError, struct.error):
+        pass
+    return None
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file's contents, for caching work derived from it."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _snapshot(directory: Path) -> dict[str, tuple[int, int]]:
+    """(mtime_ns, size) of the image files directly in a directory."""
+    files = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.lower().endswith(IMAGE_SUFFIXES) and entry.is_file():
+                    stat = entry.stat()
+                    files[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        pass
+    return files
+
+
+class OutputWatcher:
+    """Notices image files written to the output directory after it was created.
+
+    Takes one listing of the directory's top level up front; afterwards a
+    file with the expected name is checked with a single stat, and the
+    directory is only listed again when the generator named the file
+    differently.
+    """
+
+    def __init__(self, directory: Path | None = None):
+        self.directory = directory if directory is not None else get_output_dir()
+        self._before = _snapshot(self.directory)
+
+    def _changed(self, name: str) -> bool:
+        try:
+            stat = (self.directory / name).stat()
+        except OSError:
+            return False
+        return self._before.get(name) != (stat.st_mtime_ns, stat.st_size)
+
+    def new_files(self, expected: str | None = None) -> list[Path]:
+        """Image files created or rewritten since the watcher was created, oldest first.
+
+        Args:
+            expected: File name the generator was asked to use
+        """
+        if expected and self._changed(expected):
+            return [self.directory / expected]
+
+        after = _snapshot(self.directory)
+        changed = [(sig[0], name) for name, sig in after.items() if self._before.get(name) != sig]
+        return [self.directory / name for _, name in sorted(changed)]
+
+
+def variation_from_name(path: Path) -> int | None:
+    """Variation number in a file name like variation_2.png."""
+    match = _VARIATION_NAME.search(path.stem)
+    return int(match.group(1)) if match else None
+
+
+def record_artifacts(
+    paths: list[Path],
+    job_id: int,
+    batch_id: str,
+    variation: int,
+    seconds: float
+) -> list[ImageArtifact]:
+    """Add a job's files to the index. Files already recorded (same path and mtime) are skipped.
+
+    Args:
+        paths: Files the job wrote
+        job_id: Image job ID
+        batch_id: Batch the job belongs to
+        variation: The job's variation number, or 0 if it produced all of them
+        seconds: Wall time of the job
+
+    Returns:
+        The newly recorded artifacts
+    """
+    rows = []
+    now = time.time()
+    for n, path in enumerate(paths, start=1):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        size = image_size(path) or (None, None)
+        number = variation or variation_from_name(path) or n
+        rows.append((str(path), stat.st_mtime_ns, number, size[0], size[1], stat.st_size,
+                     round(seconds, 2), job_id, batch_id, now))
+
+    with closing(_connect()) as conn, conn:
+        ids = []
+        for row in rows:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO artifacts (path, mtime_ns, variation, width, height, bytes, "
+                "seconds, job_id, batch_id, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row
+            )
+            if cursor.rowcount:
+                ids.append(cursor.lastrowid)
+        return _select(conn, f"id IN ({', '.join('?' * len(ids))})", tuple(ids)) if ids else []
+
+
+def _select(conn: sqlite3.Connection, where: str, params: tuple) -> list[ImageArtifact]:
+    rows = conn.execute(
+        f"SELECT {', '.join(ARTIFACT_COLUMNS)} FROM artifacts WHERE {where} ORDER BY variation, id",
+        params
+    ).fetchall()
+    return [ImageArtifact(*row) for row in rows]
+
+
+def list_artifacts(batch_id: str) -> list[ImageArtifact]:
+    """Artifacts of one job batch, by variation."""
+    with closing(_connect()) as conn:
+        return _select(conn, "batch_id = ?", (batch_id,))
+
+
+def get_post_artifacts(post_id: str) -> list[ImageArtifact]:
+    """Artifacts generated for a logged post, by variation."""
+    with closing(_connect()) as conn:
+        return _select(conn, "post_id = ?", (post_id,))
+
+
+def assign_post(batch_id: str, post_id: str) -> int:
+    """Index a batch's artifacts under the post they were generated for.
+
+    Returns:
+        Number of artifacts assigned
+    """
+    with closing(_connect()) as conn, conn:
+        return conn.execute(
+            "UPDATE artifacts SET post_id = ? WHERE batch_id = ?", (post_id, batch_id)
+        ).rowcount
+
+
+def format_size(num_bytes: int) -> str:
+    """Human-readable file size."""
+    if num_bytes < 1024:
+        return f"{num_bytes} B"
+    if num_bytes < 1024 * 1024:
+        return f"{num_bytes / 1024:.0f} KB"
+    return f"{num_bytes / (1024 * 1024):.1f} MB"
+
+
+def format_artifacts_display(artifacts: list[ImageArtifact]) -> str:
+    """Format artifacts as a numbered list for picking one."""
+    lines = []
+    for n, artifact in enumerate(artifacts, start=1):
+        dimensions = f"{artifact.width}x{artifact.height}" if artifact.width else "?x?"
+        lines.append(
+            f"  {n}. {Path(artifact.path).name:24} {dimensions:>11}  "
+            f"{format_size(artifact.bytes):>8}  {artifact.seconds:.0f}s"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,171 @@
+"""Record and replay provider CLI interactions.
+
+With llm.cassette.mode = "record", every provider call (and every image
+generation call) is appended to a cassette: one JSON line per call with
+the prompt, each stdout line and when it arrived, stderr, the exit status
+and the total time.
+
+frcmed-replay is a stand-in for the provider CLIs that plays a cassette
+back. Point a provider's "command" (llm.providers.<name>.command) at it
+and the workflows run offline and deterministically, with the recorded
+latency scaled by llm.cassette.latency_scale (0 for no delay). The
+prompt is found the same way the real CLIs receive it, on stdin or as an
+argument, so any prompt_via mode works. Persistent sessions are not
+replayed; leave llm.providers.<name>.session disabled when replaying.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from .config import get_project_root, load_settings
+
+
+DEFAULT_CASSETTE = "state/cassettes/default.jsonl"
+
+# Exit status when a prompt has no recording
+NOT_RECORDED = 3
+
+_write_lock = threading.Lock()
+
+
+class Interaction(NamedTuple):
+    """One recorded CLI call."""
+    prompt_sha256: str
+    command: str
+    prompt: str
+    # (seconds since start, line) for each stdout line, newline kept
+    lines: list[tuple[float, str]]
+    stderr: str
+    returncode: int
+    seconds: float
+
+
+def prompt_key(prompt: str) -> str:
+    """Cassette key for a prompt."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def get_cassette_config(llm_config: dict | None = None) -> dict:
+    """The llm.cassette section of settings.json."""
+    if llm_config is None:
+        llm_config = load_settings().get("llm", {})
+    return llm_config.get("cassette", {})
+
+
+def get_cassette_path(cassette_config: dict) -> Path:
+    """Cassette file path (relative paths are from the project root)."""
+    path = Path(os.environ.get("FRCMED_CASSETTE") or cassette_config.get("path", DEFAULT_CASSETTE))
+    return path.expanduser() if path.expanduser().is_absolute() else get_project_root() / path
+
+
+def is_recording(llm_config: dict) -> bool:
+    """Whether calls should be recorded (llm.cassette.mode = "record")."""
+    return get_cassette_config(llm_config).get("mode", "off") == "record"
+
+
+def record_interaction(
+    llm_config: dict,
+    command: str,
+    prompt: str,
+    lines: list[tuple[float, str]],
+    stderr: str,
+    returncode: int,
+    seconds: float
+) -> None:
+    """Append one call to the cassette, if recording. Never raises."""
+    if not is_recording(llm_config):
+        return
+
+    interaction = Interaction(prompt_key(prompt), command, prompt, lines, stderr, returncode, seconds)
+    path = get_cassette_path(get_cassette_config(llm_config))
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _write_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(interaction._asdict(), ensure_ascii=False) + "\n")
+    except OSError:
+        pass  # Recording is a side channel; never fail a call over it
+
+
+def load_cassette(path: Path) -> dict[str, Interaction]:
+    """Load a cassette, keyed by prompt hash. A later recording of the same prompt wins."""
+    interactions = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+                interaction = Interaction(**data)
+            except (ValueError, TypeError):
+                continue  # e.g. a line cut short by an interrupted recording
+            interactions[interaction.prompt_sha256] = interaction
+    return interactions
+
+
+def find_interaction(interactions: dict[str, Interaction], candidates: list[str]) -> Interaction | None:
+    """The recording for the first candidate prompt that has one."""
+    for candidate in candidates:
+        interaction = interactions.get(prompt_key(candidate))
+        if interaction is not None:
+            return interaction
+    return None
+
+
+def replay(interaction: Interaction, latency_scale: float) -> int:
+    """Write a recording's output with its (scaled) timing; return its exit status."""
+    start = time.monotonic()
+
+    def wait_until(offset: float) -> None:
+        delay = start + offset * latency_scale - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    for offset, line in interaction.lines:
+        wait_until(offset)
+        sys.stdout.write(line)
+        sys.stdout.flush()
+
+    wait_until(interaction.seconds)
+    if interaction.stderr:
+        sys.stderr.write(interaction.stderr)
+    return interaction.returncode
+
+
+def main() -> None:
+    """Entry point for frcmed-replay, a stand-in provider CLI."""
+    cassette_config = get_cassette_config()
+    path = get_cassette_path(cassette_config)
+    scale = float(os.environ.get("FRCMED_REPLAY_SCALE", cassette_config.get("latency_scale", 1.0)))
+
+    # The prompt arrives on stdin (prompt_via "stdin") or as an argument;
+    # argv-mode calls get an empty stdin, so both are tried
+    stdin = "" if sys.stdin is None or sys.stdin.isatty() else sys.stdin.read()
+    candidates = ([stdin] if stdin else []) + sys.argv[1:]
+
+    try:
+        interactions = load_cassette(path)
+    except OSError as e:
+        sys.stderr.write(f"frcmed-replay: cannot read cassette {path}: {e}\n")
+        sys.exit(NOT_RECORDED)
+
+    interaction = find_interaction(interactions, candidates)
+    if interaction is None:
+        prompt = max(candidates, key=len, default="")
+        sys.stderr.write(
+            f"frcmed-replay: no recording in {path} for this prompt "
+            f"(sha256 {prompt_key(prompt)[:12]}, {len(prompt)} chars)\n"
+        )
+        sys.exit(NOT_RECORDED)
+
+    sys.exit(replay(interaction, scale))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,14 @@
 """CLI entry point for Fr. Conor Daily Post Generator."""
 
 import argparse
+import re
 import sys
+import threading
+from collections.abc import Callable, Iterator
 from pathlib import Path
 
 from . import __version__
+from .artifacts import ImageArtifact, format_artifacts_display
 from .composer import compose_post, format_post_preview, format_post_text, validate_post
 from .config import (
     get_current_art_style,
@@ -14,16 +18,33 @@ from .config import (
     load_settings,
     load_state,
 )
+from .export import start_exports
 from .fetcher import fetch_transcript, get_transcript_excerpt
 from .image_generator import (
     build_image_prompt,
     ensure_output_directory,
     format_image_prompt_display,
-    generate_images,
 )
+from .image_jobs import ImageBatch, format_batch_summary, submit_images
+from .llm_cache import format_cache_stats
 from .output import finalize_post, format_success_message
-from .quote_generator import format_hooks_display, generate_quotes
+from .prefetch import Prefetcher, get_prefetch_budget
+from .preview import show_preview
+from .providers import ProviderCancelled
+from .quote_generator import (
+    Hook,
+    build_quote_prompt,
+    format_hook_lines,
+    generate_quotes_chunked,
+    generate_quotes_stream,
+    get_chunked_refill_excerpt,
+    merge_hooks,
+    missing_hook_slots,
+    refill_hooks,
+)
 from .shortener import shorten_url
+from .telemetry import format_stats, load_spans
+from .tokens import estimate_tokens, get_prompt_budget
 from .utils import extract_title_from_apple_url, validate_urls
 
 
@@ -52,6 +73,92 @@ def get_input(prompt: str, default: str = "") -> str:
     return input(f"{prompt}: ").strip()
 
 
+class HookStream:
+    """Generates hooks on a background thread, printing each as it arrives.
+
+    The main thread can read hooks (and let the user pick one) while the
+    rest of the batch is still being generated. Hooks that arrive while the
+    user is typing are held back and printed before the next prompt.
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[threading.Event], Iterator[Hook]],
+        on_done: Callable[[], object] | None = None
+    ):
+        self.hooks: list[Hook] = []
+        self._on_done = on_done
+        self.error: Exception | None = None
+        self.cancel_event = threading.Event()
+        self.first = threading.Event()
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+        self._prompting = False
+        self._held: list[str] = []
+        self._thread = threading.Thread(target=self._run, args=(generate,), daemon=True)
+        self._thread.start()
+
+    def _run(self, generate: Callable[[threading.Event], Iterator[Hook]]):
+        section = None
+        try:
+            for hook in generate(self.cancel_event):
+                if self.cancel_event.is_set():
+                    break
+                lines, section = format_hook_lines(hook, section)
+                self._print("\n".join(lines))
+                self.hooks.append(hook)
+                self.first.set()
+        except Exception as e:
+            self.error = e
+        finally:
+            if not self.cancel_event.is_set() and self.hooks:
+                self._print(f"\n✓ Generated {len(self.hooks)} hooks")
+                if self.error:
+                    self._print(f"  ⚠ Generation stopped early: {self.error}")
+            self.first.set()
+            self.done.set()
+            if self._on_done is not None and not self.cancel_event.is_set() and not self.error:
+                self._on_done()
+
+    def _print(self, text: str):
+        """Print now, or hold the text back while the user is at a prompt."""
+        with self._lock:
+            if self._prompting:
+                self._held.append(text)
+            else:
+                print(text, flush=True)
+
+    def get_input(self, prompt: str, default: str = "") -> str:
+        """get_input, keeping streamed hooks off the line the user is typing on.
+
+        Args:
+            prompt: Prompt text
+            default: Value returned on empty input
+
+        Returns:
+            The user's answer
+        """
+        with self._lock:
+            self._prompting = True
+        try:
+            return get_input(prompt, default)
+        finally:
+            with self._lock:
+                self._prompting = False
+                held, self._held = self._held, []
+                if held:
+                    print("\n".join(held), flush=True)
+
+    def wait_first(self):
+        """Block until the first hook arrives (or generation ends)."""
+        self.first.wait()
+
+    def cancel(self):
+        """Stop generation and kill the provider process."""
+        self.cancel_event.set()
+        self._thread.join(timeout=5)
+
+
 def show_history():
     """Display post history."""
     history = load_history()
@@ -74,6 +181,60 @@ def show_history():
         print(f"  Hook: \"{hook}\"")
 
 
+def wait_for_images(batch: ImageBatch | None) -> list[ImageArtifact]:
+    """Wait for background image jobs, reporting how they went.
+
+    Returns:
+        The generated image files, by variation
+    """
+    if batch is None:
+        return []
+
+    if any(job.status in ("pending", "running") for job in batch.jobs()):
+        print()
+        print("Waiting for images to finish (Ctrl-C to stop; resume with `frcmed-image --jobs`)...")
+    jobs = batch.wait()
+
+    summary = format_batch_summary(jobs)
+    if summary:
+        print(summary)
+    elif all(job.status == "done" for job in jobs):
+        print("  Images generated successfully!")
+    else:
+        print("  Image generation failed. You can generate manually later.")
+
+    artifacts = batch.artifacts()
+    if artifacts:
+        print(format_artifacts_display(artifacts))
+    elif any(job.status == "done" for job in jobs):
+        print(f"  No new images found in {ensure_output_directory()}")
+    return artifacts
+
+
+def leave_images(batch: ImageBatch | None):
+    """On quit, say where unfinished image jobs can be picked up instead of waiting."""
+    if batch is None:
+        return
+    if any(job.status in ("pending", "running") for job in batch.jobs()):
+        print(f"Image batch {batch.batch_id} is unfinished - resume it with `frcmed-image --jobs`.")
+
+
+def select_image(artifacts: list[ImageArtifact]) -> ImageArtifact | None:
+    """Ask which generated image goes with the post (None to post without one)."""
+    if not artifacts:
+        return None
+    if len(artifacts) == 1:
+        return artifacts[0]
+
+    while True:
+        choice = get_input(f"Select image [1-{len(artifacts)}], [s]kip", "1")
+        if choice.lower() == 's':
+            return None
+        if choice.isdigit() and 1 <= int(choice) <= len(artifacts):
+            return artifacts[int(choice) - 1]
+        print(f"Please enter a number between 1 and {len(artifacts)}, or s.")
+
+
 def run_workflow(args):
     """Run the main post generation workflow."""
     print_header()
@@ -153,43 +314,114 @@ def run_workflow(args):
     else:
         # Generate quotes via LLM
         transcript_excerpt = get_transcript_excerpt(transcript.text)
+        prompt_tokens = estimate_tokens(build_quote_prompt(episode_title, transcript_excerpt, llm_provider))
+        prompt_budget = get_prompt_budget(llm_provider, settings.get("llm", {}))
+
+        # Long talks (retreats, multi-part series) use map-reduce over the full text
+        quote_config = settings.get("llm", {}).get("quote_generation", {})
+        chunked = transcript.word_count > quote_config.get("chunked_threshold_words", 4000)
+
+        def generate_hooks(use_cache: bool, cancel_event: threading.Event) -> Iterator[Hook]:
+            if chunked:
+                return iter(generate_quotes_chunked(
+                    episode_title, transcript.text, llm_provider, use_cache, cancel_event
+                ))
+            return generate_quotes_stream(
+                episode_title, transcript_excerpt, llm_provider, use_cache, cancel_event
+            )
+
+        # Generate the next batch once the user has a full one to read
+        prefetcher = Prefetcher(
+            lambda cancel_event: list(generate_hooks(False, cancel_event)),
+            get_prefetch_budget(settings.get("llm", {}))
+        )
 
-        try:
+        def run_generation(use_cache: bool = True) -> HookStream:
+            return HookStream(lambda cancel_event: generate_hooks(use_cache, cancel_event),
+                              on_done=prefetcher.start)
+
+        if chunked:
+            print(f"Generating 15 hooks using {llm_provider} (chunked, long transcript)...")
+        else:
             print(f"Generating 15 hooks using {llm_provider}...")
-            hooks = generate_quotes(episode_title, transcript_excerpt, llm_provider)
-            print(f"✓ Generated {len(hooks)} hooks")
-            print()
-            print(format_hooks_display(hooks))
-        except Exception as e:
-            print(f"✗ Failed to generate quotes: {e}")
+            print(f"  Estimated prompt size: ~{prompt_tokens} tokens (budget {prompt_budget})")
+
+        # Hooks are printed as they stream in; selection opens with the first one
+        stream = run_generation()
+        stream.wait_first()
+        if not stream.hooks:
+            print(f"✗ Failed to generate quotes: {stream.error or 'no hooks in response'}")
             print("  You may need to configure the LLM CLI tool.")
             sys.exit(1)
 
         # User selection
-        print()
-        print("─" * 40)
         selected_hook = None
 
         while selected_hook is None:
-            choice = get_input("Enter hook number (1-15), [r]egenerate, or [q]uit")
+            choice = stream.get_input("\nEnter hook number (1-15), [k]eep some and refill the rest, [r]egenerate, or [q]uit")
 
             if choice.lower() == 'q':
+                stream.cancel()
+                prefetcher.cancel()
                 print("Cancelled.")
                 sys.exit(0)
             elif choice.lower() == 'r':
+                stream.cancel()
                 print("\nRegenerating hooks...")
-                hooks = generate_quotes(episode_title, transcript_excerpt, llm_provider)
-                print(format_hooks_display(hooks))
+                batch = prefetcher.take()
+                if batch:
+                    stream = HookStream(lambda cancel_event: iter(batch), on_done=prefetcher.start)
+                else:
+                    stream = run_generation(use_cache=False)
+                stream.wait_first()
+            elif choice.lower() == 'k':
+                hooks = list(stream.hooks)
+                keep_numbers = {int(n) for n in re.findall(r"\d+", stream.get_input("Hook numbers to keep (e.g. 1 4 7)"))}
+                kept = [hook for hook in hooks if hook.number in keep_numbers]
+                if not kept:
+                    print("No hooks kept - use [r]egenerate for a whole new batch.")
+                    continue
+                slots = missing_hook_slots(kept)
+                if not slots:
+                    print("All slots are kept - pick one by number.")
+                    continue
+                stream.cancel()
+                print(f"\nKeeping {len(kept)} hook(s); refilling slots {', '.join(map(str, slots))}...")
+
+                # Refill from the same text the batch was generated from
+                refill_excerpt = get_chunked_refill_excerpt(transcript.text) if chunked else transcript_excerpt
+
+                def refill(cancel_event: threading.Event, kept=kept, slots=slots) -> Iterator[Hook]:
+                    try:
+                        new = refill_hooks(episode_title, refill_excerpt, kept, slots, llm_provider, cancel_event)
+                    except ProviderCancelled:
+                        raise
+                    except RuntimeError as e:
+                        print(f"  ⚠ Refill failed: {e}")
+                        new = []
+                    return iter(merge_hooks(kept, new))
+
+                stream = HookStream(refill)
+                stream.wait_first()
             else:
                 try:
                     num = int(choice)
-                    if 1 <= num <= len(hooks):
-                        selected_hook = hooks[num - 1]
+                    hooks = list(stream.hooks)
+                    matches = [hook for hook in hooks if hook.number == num]
+                    if matches:
+                        selected_hook = matches[0]
+                        # No need to wait for the rest of the batch
+                        stream.cancel()
+                        prefetcher.cancel()
                         print(f"\n✓ Selected: \"{selected_hook.text}\"")
+                    elif not stream.done.is_set():
+                        print(f"Hook {num} is still being generated - try again in a moment")
+                    elif hooks:
+                        print(f"Please enter one of: {', '.join(str(hook.number) for hook in hooks)}")
                     else:
-                        print(f"Please enter a number between 1 and {len(hooks)}")
+                        print(f"No hooks generated: {stream.error}. Try [r]egenerate or [q]uit.")
                 except ValueError:
-                    print("Invalid input. Enter a number, 'r', or 'q'.")
+                    print("Invalid input. Enter a number, 'k', 'r', or 'q'.")
 
         selected_quote = selected_hook.text
 
@@ -257,16 +489,13 @@ def run_workflow(args):
     print(f"Images will be saved to: {output_dir}")
     print()
 
-    # Generate images using Claude CLI + nano-banana MCP
+    # Generate images using Claude CLI + nano-banana MCP, in the background
+    image_batch = None
     generate = get_input("Generate images now? [y/n]", "y")
     if generate.lower() == 'y':
         print()
-        print("Generating images via Claude CLI (this may take a minute)...")
-        success = generate_images(image_prompt)
-        if success:
-            print("  Images generated successfully!")
-        else:
-            print("  Image generation failed. You can generate manually later.")
+        print("Generating images via Claude CLI in the background; carry on with the post...")
+        image_batch = submit_images(image_prompt)
     else:
         print()
         print("Skipping image generation.")
@@ -276,6 +505,7 @@ def run_workflow(args):
     print()
     proceed = get_input("Proceed to compose post? [y/n]", "y")
     if proceed.lower() != 'y':
+        leave_images(image_batch)
         print("Stopping here.")
         sys.exit(0)
 
@@ -306,6 +536,7 @@ def run_workflow(args):
     choice = get_input("Approve? [y]es, [e]dit hook, [q]uit", "y")
 
     if choice.lower() == 'q':
+        leave_images(image_batch)
         print("Cancelled.")
         sys.exit(0)
     elif choice.lower() == 'e':
@@ -323,18 +554,32 @@ def run_workflow(args):
     # Step 6: Finalize
     print_section("STEP 6: FINALIZE")
 
+    artifacts = wait_for_images(image_batch)
+    show_preview(artifacts)
+    exports = start_exports([Path(artifact.path) for artifact in artifacts])
+    selected_image = select_image(artifacts)
+    if exports is not None:
+        exports.join()
+    if selected_image is not None:
+        post = post._replace(image_path=selected_image.path)
+
     results = finalize_post(
         post=post,
-        selected_image_path=None,  # No image for now
+        selected_image_path=Path(selected_image.path) if selected_image else None,
         output_dir=output_dir,
         style_id=style.get("id", "unknown"),
         style_name=style.get("name", "Unknown"),
         image_prompt=image_prompt.prompt,
-        advance_rotation=True
+        advance_rotation=True,
+        image_batch_id=image_batch.batch_id if image_batch else None
     )
 
     print(format_success_message(results, output_dir))
 
+    cache_stats = format_cache_stats()
+    if cache_stats:
+        print(cache_stats)
+
     if results.get("errors"):
         print("\nWarnings:")
         for err in results["errors"]:
@@ -353,6 +598,7 @@ Examples:
   frcmed-post -s hopper                 # Use Edward Hopper style
   frcmed-post -q "Your quote"           # Skip quote generation
   frcmed-post -H                        # View post history
+  frcmed-post --stats                   # Latency percentiles per stage
         """
     )
 
@@ -405,10 +651,18 @@ Examples:
         help="Show post history"
     )
 
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Show latency percentiles (p50/p95/p99) per stage and provider"
+    )
+
     args = parser.parse_args()
 
     if args.history:
         show_history()
+    elif args.stats:
+        print(format_stats(load_spans()))
     else:
         run_workflow(args)
 
@@ -9,13 +9,23 @@ from pathlib import Path
 from . import __version__
 from .config import load_settings
 from .fetcher import fetch_transcript, get_transcript_excerpt
-from .comic_generator import generate_comic_concepts, format_comic_concepts_display
+from .comic_generator import (
+    build_comic_concept_prompt,
+    format_comic_concepts_display,
+    generate_comic_concepts,
+    get_panel_count,
+)
+from .artifacts import format_artifacts_display
 from .image_generator import (
     build_comic_prompt,
     ensure_output_directory,
     format_image_prompt_display,
     generate_images,
 )
+from .llm_cache import format_cache_stats
+from .prefetch import Prefetcher, get_prefetch_budget
+from .preview import show_preview
+from .tokens import estimate_tokens, get_prompt_budget
 
 
 def print_header():
@@ -71,7 +81,7 @@ def get_random_comic_style() -> dict:
 def run_workflow(args):
     """Run the comic generation workflow."""
     print_header()
-    print("Generate 4-panel comic strips from meditation transcripts.")
+    print(f"Generate {get_panel_count()}-panel comic strips from meditation transcripts.")
     print()
 
     settings = load_settings()
@@ -122,8 +132,14 @@ def run_workflow(args):
     # Step 3: Generate concepts
     print_section("STEP 3: COMIC CONCEPTS")
 
+    prompt_tokens = estimate_tokens(
+        build_comic_concept_prompt(themes, transcript_excerpt, style, llm_provider)
+    )
+    prompt_budget = get_prompt_budget(llm_provider, settings.get("llm", {}))
+
     try:
         print(f"Generating 4 comic strip concepts using {llm_provider}...")
+        print(f"  Estimated prompt size: ~{prompt_tokens} tokens (budget {prompt_budget})")
         concepts = generate_comic_concepts(themes, transcript_excerpt, style, llm_provider)
         print(f"Generated {len(concepts)} concepts")
         print()
@@ -133,6 +149,15 @@ def run_workflow(args):
         print("  You may need to configure the LLM CLI tool.")
         sys.exit(1)
 
+    # Generate the next batch while the user reads this one
+    prefetcher = Prefetcher(
+        lambda cancel_event: generate_comic_concepts(
+            themes, transcript_excerpt, style, llm_provider, use_cache=False, cancel_event=cancel_event
+        ),
+        get_prefetch_budget(settings.get("llm", {}))
+    )
+    prefetcher.start()
+
     # Step 4: User selection
     print()
     selected_concept = None
@@ -141,16 +166,21 @@ def run_workflow(args):
         choice = get_input("Enter concept number (1-4), [r]egenerate, or [q]uit")
 
         if choice.lower() == 'q':
+            prefetcher.cancel()
             print("Cancelled.")
             sys.exit(0)
         elif choice.lower() == 'r':
             print("\nRegenerating concepts...")
-            concepts = generate_comic_concepts(themes, transcript_excerpt, style, llm_provider)
+            concepts = prefetcher.take() or generate_comic_concepts(
+                themes, transcript_excerpt, style, llm_provider, use_cache=False
+            )
             print(format_comic_concepts_display(concepts))
+            prefetcher.start()
         else:
             try:
                 num = int(choice)
                 if 1 <= num <= len(concepts):
+                    prefetcher.cancel()
                     selected_concept = concepts[num - 1]
                     print(f"\nSelected: [{selected_concept.title}]")
                 else:
@@ -173,9 +203,11 @@ def run_workflow(args):
     if generate.lower() == 'y':
         print()
         print("Generating comic via Claude CLI (this may take a minute)...")
-        success = generate_images(image_prompt)
-        if success:
+        artifacts = generate_images(image_prompt)
+        if artifacts:
             print("  Comic generated successfully!")
+            print(format_artifacts_display(artifacts))
+            show_preview(artifacts)
         else:
             print("  Comic generation failed. You can generate manually later.")
     else:
@@ -184,6 +216,11 @@ def run_workflow(args):
         print("To generate later, copy the prompt above and run:")
         print(f"  claude -p \"Generate {image_prompt.n} images with: [prompt]\"")
 
+    cache_stats = format_cache_stats()
+    if cache_stats:
+        print()
+        print(cache_stats)
+
     print()
     print("Done!")
 
@@ -1,51 +1,143 @@
 """Comic strip concept generation using LLM providers (Gemini, Claude, Codex)."""
 
 import re
-import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
 from typing import NamedTuple
 
 from .config import load_prompt_template, load_settings
+from .llm_cache import cached_call, get_provider_model, list_cached_responses
+from .structured import (
+    OutputSchema,
+    apply_json_output,
+    call_structured,
+    complete_items,
+    json_output_enabled,
+    json_response_items,
+    looks_like_json,
+)
+from .telemetry import span
+from .tokens import fill_to_budget, get_prompt_budget
 
 
 class ComicConcept(NamedTuple):
-    """A generated 4-panel comic strip concept with dialogue."""
+    """A generated comic strip concept with dialogue (one entry per panel)."""
     number: int
     title: str
     arc: str
-    panel_1: str
-    dialogue_1: str
-    panel_2: str
-    dialogue_2: str
-    panel_3: str
-    dialogue_3: str
-    panel_4: str
-    dialogue_4: str
+    panels: tuple[str, ...]
+    dialogues: tuple[str, ...]
+
+
+DEFAULT_PANEL_COUNT = 4
+CONCEPT_COUNT = 4
+
+_DIALOGUE_DESCRIPTION = "text: SPEECH: \"...\", THOUGHT: \"...\" or CAPTION: \"...\""
+
+
+def get_panel_count(settings: dict | None = None) -> int:
+    """Panels per strip (comic_generation.panel_count)."""
+    if settings is None:
+        settings = load_settings()
+    return max(1, settings.get("comic_generation", {}).get("panel_count", DEFAULT_PANEL_COUNT))
+
+
+def describe_strip_layout(panel_count: int) -> str:
+    """How a strip is laid out, worded as build_comic_prompt will draw it."""
+    # Up to 4 panels fit one horizontal strip; longer strips use two rows
+    if panel_count <= 4:
+        return "horizontal strip (read left to right)"
+    return (f"strip laid out as a grid of two rows of {(panel_count + 1) // 2} "
+            f"(read left to right, top row first)")
+
+
+def comics_schema(panel_count: int = DEFAULT_PANEL_COUNT) -> OutputSchema:
+    """Item shape for llm.output_format = "json": panel_N/dialogue_N per panel."""
+    fields = {
+        "number": (int, f"Concept number, 1-{CONCEPT_COUNT}"),
+        "title": (str, "Short comic title"),
+        "arc": (str, "One sentence describing the narrative arc"),
+    }
+    for n in range(1, panel_count + 1):
+        fields[f"panel_{n}"] = (str, f"Panel {n} scene description")
+        fields[f"dialogue_{n}"] = (str, f"Panel {n} {_DIALOGUE_DESCRIPTION}")
+    return OutputSchema("comics", CONCEPT_COUNT, fields)
 
 
 def generate_comic_concepts(
     themes: list[str],
     transcript_excerpt: str,
     style: dict,
-    provider: str | None = None
+    provider: str | None = None,
+    use_cache: bool = True,
+    cancel_event: threading.Event | None = None
 ) -> list[ComicConcept]:
     """Generate 4 comic strip concepts using the configured LLM provider.
 
+    Each concept has comic_generation.panel_count panels (4 by default).
+
     Args:
         themes: List of themes extracted from transcript
         transcript_excerpt: Excerpt of the transcript text
         style: Comic style dict from comic_styles.json
         provider: LLM provider to use (gemini, claude, codex). If None, uses settings default.
+        use_cache: Serve a cached response for an identical prompt. Pass False
+            to force a fresh generation (e.g. on regenerate).
+        cancel_event: When set, the provider call is killed and
+            ProviderCancelled raised (used for background prefetches)
 
     Returns:
         List of 4 ComicConcept objects
     """
     settings = load_settings()
     llm_config = settings.get("llm", {})
+    panel_count = get_panel_count(settings)
 
     # Determine provider
     if provider is None:
         provider = llm_config.get("quote_generation", {}).get("provider", "gemini")
 
+    prompt = build_comic_concept_prompt(themes, transcript_excerpt, style, provider)
+
+    def is_valid(response: str) -> bool:
+        return len(_parse_comic_concepts(response, panel_count)) == CONCEPT_COUNT
+
+    answered_by, response = cached_call(
+        provider,
+        get_provider_model(provider, llm_config),
+        prompt,
+        lambda: call_structured(prompt, comics_schema(panel_count), llm_config, provider, is_valid,
+                                cancel_event=cancel_event),
+        bypass=not use_cache,
+        validate=is_valid
+    )
+
+    # Parse response into concepts
+    with span("parse.comics", provider=answered_by) as fields:
+        concepts = _parse_comic_concepts(response, panel_count, fields)
+
+    return concepts
+
+
+def build_comic_concept_prompt(
+    themes: list[str],
+    transcript_excerpt: str,
+    style: dict,
+    provider: str | None = None
+) -> str:
+    """Fill the comic generation template within the provider's token budget.
+
+    The transcript excerpt is trimmed at a word boundary if the filled
+    prompt would exceed llm.providers.<provider>.max_prompt_tokens.
+    """
+    settings = load_settings()
+    llm_config = settings.get("llm", {})
+    panel_count = get_panel_count(settings)
+    if provider is None:
+        provider = llm_config.get("quote_generation", {}).get("provider", "gemini")
+
     # Load prompt template
     prompt_template = load_prompt_template("comic_generation")
 
@@ -59,100 +151,60 @@ def generate_comic_concepts(
 
     # Fill in template
     prompt = prompt_template.replace("{themes}", themes_str)
-    prompt = prompt.replace("{transcript_excerpt}", transcript_excerpt[:2000])
     prompt = prompt.replace("{style_name}", style_name)
     prompt = prompt.replace("{style_description}", style_description)
-
-    # Generate based on provider
-    if provider == "gemini":
-        response = _call_gemini(prompt, llm_config)
-    elif provider == "claude":
-        response = _call_claude(prompt, llm_config)
-    elif provider == "codex":
-        response = _call_codex(prompt, llm_config)
-    else:
-        raise ValueError(f"Unknown LLM provider: {provider}")
-
-    # Parse response into concepts
-    concepts = _parse_comic_concepts(response)
-
-    return concepts
-
-
-def _call_gemini(prompt: str, config: dict) -> str:
-    """Call Gemini CLI for comic concept generation."""
-    provider_config = config.get("providers", {}).get("gemini", {})
-    command = provider_config.get("command", "gemini")
-    model_flag = provider_config.get("model_flag", "--model")
-    model = config.get("quote_generation", {}).get("model", "gemini-2.5-pro")
-
-    try:
-        result = subprocess.run(
-            [command, prompt, model_flag, model],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
-
-        if result.returncode != 0:
-            raise RuntimeError(f"Gemini CLI error: {result.stderr}")
-
-        return result.stdout
-
-    except FileNotFoundError:
-        raise RuntimeError("Gemini CLI not found. Install with: pip install google-generativeai")
-
-
-def _call_claude(prompt: str, config: dict) -> str:
-    """Call Claude Code CLI for comic concept generation."""
-    provider_config = config.get("providers", {}).get("claude", {})
-    command = provider_config.get("command", "claude")
-    prompt_flag = provider_config.get("prompt_flag", "-p")
-
-    try:
-        result = subprocess.run(
-            [command, prompt_flag, prompt],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
-
-        if result.returncode != 0:
-            raise RuntimeError(f"Claude CLI error: {result.stderr}")
-
-        return result.stdout
-
-    except FileNotFoundError:
-        raise RuntimeError("Claude CLI not found.")
-
-
-def _call_codex(prompt: str, config: dict) -> str:
-    """Call Codex CLI for comic concept generation."""
-    provider_config = config.get("providers", {}).get("codex", {})
-    command = provider_config.get("command", "codex")
-    subcommand = provider_config.get("subcommand", "exec")
-
-    try:
-        result = subprocess.run(
-            [command, subcommand, prompt],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
-
-        if result.returncode != 0:
-            raise RuntimeError(f"Codex CLI error: {result.stderr}")
-
-        return result.stdout
-
-    except FileNotFoundError:
-        raise RuntimeError("Codex CLI not found. Install with: npm install -g @openai/codex")
-
-
-def _parse_comic_concepts(response: str) -> list[ComicConcept]:
+    prompt = prompt.replace("{panel_count}", str(panel_count))
+    prompt = prompt.replace("{strip_layout}", describe_strip_layout(panel_count))
+    prompt = prompt.replace("{concept_format}", _format_concept_examples(panel_count))
+    if json_output_enabled(llm_config):
+        prompt = apply_json_output(prompt, comics_schema(panel_count))
+    return fill_to_budget(
+        prompt,
+        "{transcript_excerpt}",
+        transcript_excerpt,
+        get_prompt_budget(provider, llm_config)
+    )
+
+
+def _format_concept_examples(panel_count: int) -> str:
+    """The numbered example concepts shown in the text-mode output format."""
+    blocks = []
+    for number in range(1, CONCEPT_COUNT + 1):
+        lines = [f"{number}. [Comic Title]", "   Arc: [One sentence describing the narrative arc]"]
+        for n in range(1, panel_count + 1):
+            lines.append(f"   Panel {n}: [Scene description]")
+            if number == 1 and n == 1:
+                lines.append(f'   Dialogue {n}: [SPEECH: "dialogue" / THOUGHT: "thought" / CAPTION: "narration"]')
+            else:
+                lines.append(f"   Dialogue {n}: [Text type and content]")
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+# Every stripped line is a concept header ("1. [Title]" or "1. Title"), a
+# field ("Arc: ...", "Panel 3: ...", "Dialogue 3: ...", also
+# "- **Panel 3:** ...") or a continuation of the previous field. The
+# matching group names the kind of line, so one match classifies it.
+_LINE = re.compile(
+    r"(?P<number>\d+)\.\s*\[?(?P<title>[^\]\n]+)\]?$"
+    r"|[-*\s]*(?:(?P<arc>arc)|panel\s*(?P<panel>\d+)|dialogue\s*(?P<dialogue>\d+))\s*\**\s*:\s*\**\s*(?P<text>.*)"
+    r"|(?P<more>.+)",
+    re.IGNORECASE
+)
+
+# Markdown rule between concepts: ---, ***, ___ or ===
+_SEPARATOR = re.compile(r"(?:[-*_=]\s*){3,}$")
+
+
+def _parse_comic_concepts(
+    response: str,
+    panel_count: int = DEFAULT_PANEL_COUNT,
+    trace: dict | None = None,
+    json_mode: bool | None = None
+) -> list[ComicConcept]:
     """Parse LLM response into a list of ComicConcept objects.
 
-    Expected format:
+    Expected format (for any number of panels):
     1. [Comic Title]
        Arc: description
        Panel 1: description
@@ -160,106 +212,106 @@ def _parse_comic_concepts(response: str) -> list[ComicConcept]:
        Panel 2: description
        Dialogue 2: ...
        etc.
+
+    Lines that don't start a field continue the one before, so multi-line
+    scene descriptions and dialogue are kept whole. A blank line or a
+    separator (---) ends the field, so separators and any closing remark
+    after the last concept are dropped. If trace is given,
+    trace["parse_path"] is set to the parser that was used ("json",
+    "strict" or "lenient").
+
+    JSON found after a preamble is used when json_mode (default:
+    llm.output_format) is on; see json_response_items.
     """
-    concepts = []
+    trace = trace if trace is not None else {}
+    schema = comics_schema(panel_count)
+    items = json_response_items(response, schema.key, json_mode)
+    trace["parse_path"] = "json" if items is not None else "strict"
 
-    # Split by concept numbers
-    lines = response.strip().split("\n")
-    current_concept = None
-    current_data = {
-        "arc": "",
-        "panel_1": "", "dialogue_1": "",
-        "panel_2": "", "dialogue_2": "",
-        "panel_3": "", "dialogue_3": "",
-        "panel_4": "", "dialogue_4": ""
-    }
+    if items is not None:
+        return [_concept_from_item(item, panel_count) for item in complete_items(items, schema)]
+
+    concepts = []
+    header = None  # (number, title) of the concept being read
+    fields: dict[tuple[str, int], list[str]] = {}
+    field = None  # Key in fields that continuation lines are added to
 
-    for line in lines:
+    for line in response.split("\n"):
         line = line.strip()
-        if not line:
+        if not line or _SEPARATOR.match(line):
+            field = None
             continue
-
-        # Check for new concept header (e.g., "1. [Title]" or "1. Title")
-        header_match = re.match(r'^(\d+)\.\s*\[?([^\]\n]+)\]?$', line)
-        if header_match:
-            # Save previous concept if exists
-            if current_concept is not None:
-                concepts.append(ComicConcept(
-                    number=current_concept["number"],
-                    title=current_concept["title"],
-                    arc=current_data["arc"].strip(),
-                    panel_1=current_data["panel_1"].strip(),
-                    dialogue_1=current_data["dialogue_1"].strip(),
-                    panel_2=current_data["panel_2"].strip(),
-                    dialogue_2=current_data["dialogue_2"].strip(),
-                    panel_3=current_data["panel_3"].strip(),
-                    dialogue_3=current_data["dialogue_3"].strip(),
-                    panel_4=current_data["panel_4"].strip(),
-                    dialogue_4=current_data["dialogue_4"].strip()
-                ))
-
-            # Start new concept
-            current_concept = {
-                "number": int(header_match.group(1)),
-                "title": header_match.group(2).strip().strip("[]")
-            }
-            current_data = {
-                "arc": "",
-                "panel_1": "", "dialogue_1": "",
-                "panel_2": "", "dialogue_2": "",
-                "panel_3": "", "dialogue_3": "",
-                "panel_4": "", "dialogue_4": ""
-            }
+        number, title, arc, panel, dialogue, text, more = _LINE.match(line).groups()
+
+        if number is not None:
+            if header is not None:
+                concepts.append(_build_concept(header, fields, panel_count))
+            header = (int(number), title.strip().strip("[]"))
+            fields = {}
+            field = None
+        elif header is None:
             continue
+        elif more is not None:
+            if field is not None:
+                fields[field].append(more)
+        else:
+            if arc is not None:
+                field = ("arc", 0)
+            elif panel is not None:
+                field = ("panel", int(panel))
+            else:
+                field = ("dialogue", int(dialogue))
+            fields[field] = [text]
 
-        # Parse concept fields
-        if current_concept is not None:
-            line_lower = line.lower()
-            if line_lower.startswith("arc:"):
-                current_data["arc"] = line[4:].strip()
-            elif line_lower.startswith("panel 1:"):
-                current_data["panel_1"] = line[8:].strip()
-            elif line_lower.startswith("dialogue 1:"):
-                current_data["dialogue_1"] = line[11:].strip()
-            elif line_lower.startswith("panel 2:"):
-                current_data["panel_2"] = line[8:].strip()
-            elif line_lower.startswith("dialogue 2:"):
-                current_data["dialogue_2"] = line[11:].strip()
-            elif line_lower.startswith("panel 3:"):
-                current_data["panel_3"] = line[8:].strip()
-            elif line_lower.startswith("dialogue 3:"):
-                current_data["dialogue_3"] = line[11:].strip()
-            elif line_lower.startswith("panel 4:"):
-                current_data["panel_4"] = line[8:].strip()
-            elif line_lower.startswith("dialogue 4:"):
-                current_data["dialogue_4"] = line[11:].strip()
-
-    # Save last concept
-    if current_concept is not None:
-        concepts.append(ComicConcept(
-            number=current_concept["number"],
-            title=current_concept["title"],
-            arc=current_data["arc"].strip(),
-            panel_1=current_data["panel_1"].strip(),
-            dialogue_1=current_data["dialogue_1"].strip(),
-            panel_2=current_data["panel_2"].strip(),
-            dialogue_2=current_data["dialogue_2"].strip(),
-            panel_3=current_data["panel_3"].strip(),
-            dialogue_3=current_data["dialogue_3"].strip(),
-            panel_4=current_data["panel_4"].strip(),
-            dialogue_4=current_data["dialogue_4"].strip()
-        ))
+    if header is not None:
+        concepts.append(_build_concept(header, fields, panel_count))
 
     # Fallback if parsing failed
-    if len(concepts) < 4:
-        concepts = _parse_comic_concepts_lenient(response)
+    if len(concepts) < CONCEPT_COUNT:
+        concepts = _parse_comic_concepts_lenient(response, panel_count)
+        trace["parse_path"] = "lenient"
+
+    return concepts[:CONCEPT_COUNT]
+
+
+def _build_concept(header: tuple[int, str], fields: dict, panel_count: int) -> ComicConcept:
+    """Assemble a concept from its parsed fields; absent fields are empty."""
+    def text(kind: str, n: int) -> str:
+        return " ".join(fields.get((kind, n), [])).strip()
 
-    return concepts[:4]  # Ensure max 4
+    number, title = header
+    return ComicConcept(
+        number=number,
+        title=title,
+        arc=text("arc", 0),
+        panels=tuple(text("panel", n) for n in range(1, panel_count + 1)),
+        dialogues=tuple(text("dialogue", n) for n in range(1, panel_count + 1))
+    )
 
 
-def _parse_comic_concepts_lenient(response: str) -> list[ComicConcept]:
+def _concept_from_item(item: dict, panel_count: int) -> ComicConcept:
+    """Convert a validated JSON item (panel_N/dialogue_N keys) to a concept."""
+    return ComicConcept(
+        number=item["number"],
+        title=item["title"],
+        arc=item["arc"],
+        panels=tuple(item[f"panel_{n}"] for n in range(1, panel_count + 1)),
+        dialogues=tuple(item[f"dialogue_{n}"] for n in range(1, panel_count + 1))
+    )
+
+
+_LENIENT_PANEL = re.compile(r"panel\s*(\d+)\s*:\s*(.+?)(?=panel\s*\d+|dialogue|$)", re.IGNORECASE | re.DOTALL)
+_LENIENT_DIALOGUE = re.compile(
+    r"dialogue\s*(\d+)\s*:\s*(.+?)(?=panel\s*\d+|dialogue\s*\d+|$)", re.IGNORECASE | re.DOTALL
+)
+_LENIENT_ARC = re.compile(r"arc:\s*(.+?)(?=panel|$)", re.IGNORECASE | re.DOTALL)
+
+
+def _parse_comic_concepts_lenient(response: str, panel_count: int = DEFAULT_PANEL_COUNT) -> list[ComicConcept]:
     """More lenient parsing for concepts that don't follow strict format."""
     concepts = []
+    placeholders = ["Opening scene"] + ["Development"] * max(0, panel_count - 3) + ["The turn", "Resolution"]
+    placeholders = placeholders[-panel_count:]
 
     # Split by numbered items
     parts = re.split(r'\n(?=\d+\.)', response)
@@ -285,39 +337,29 @@ def _parse_comic_concepts_lenient(response: str) -> list[ComicConcept]:
             title = re.sub(r'^\d+\.\s*', '', first_line)[:50]
 
         # Extract panel descriptions
-        panels = ["", "", "", ""]
-        panel_pattern = r'panel\s*(\d+)\s*:\s*(.+?)(?=panel\s*\d+|dialogue|$)'
-        panel_matches = re.findall(panel_pattern, part, re.IGNORECASE | re.DOTALL)
-        for panel_num, panel_desc in panel_matches:
+        panels = [""] * panel_count
+        for panel_num, panel_desc in _LENIENT_PANEL.findall(part):
             idx = int(panel_num) - 1
-            if 0 <= idx < 4:
+            if 0 <= idx < panel_count:
                 panels[idx] = panel_desc.strip()[:200]
 
         # Extract dialogues
-        dialogues = ["", "", "", ""]
-        dialogue_pattern = r'dialogue\s*(\d+)\s*:\s*(.+?)(?=panel\s*\d+|dialogue\s*\d+|$)'
-        dialogue_matches = re.findall(dialogue_pattern, part, re.IGNORECASE | re.DOTALL)
-        for dial_num, dial_text in dialogue_matches:
+        dialogues = [""] * panel_count
+        for dial_num, dial_text in _LENIENT_DIALOGUE.findall(part):
             idx = int(dial_num) - 1
-            if 0 <= idx < 4:
+            if 0 <= idx < panel_count:
                 dialogues[idx] = dial_text.strip()[:200]
 
         # Extract arc if present
-        arc_match = re.search(r'arc:\s*(.+?)(?=panel|$)', part, re.IGNORECASE | re.DOTALL)
+        arc_match = _LENIENT_ARC.search(part)
         arc = arc_match.group(1).strip()[:150] if arc_match else "A contemplative journey"
 
         concepts.append(ComicConcept(
             number=number,
             title=title,
             arc=arc,
-            panel_1=panels[0] or "Opening scene",
-            dialogue_1=dialogues[0] or "CAPTION: \"...\"",
-            panel_2=panels[1] or "Development",
-            dialogue_2=dialogues[1] or "CAPTION: \"...\"",
-            panel_3=panels[2] or "The turn",
-            dialogue_3=dialogues[2] or "CAPTION: \"...\"",
-            panel_4=panels[3] or "Resolution",
-            dialogue_4=dialogues[3] or "CAPTION: \"...\""
+            panels=tuple(panel or placeholder for panel, placeholder in zip(panels, placeholders)),
+            dialogues=tuple(dialogue or "CAPTION: \"...\"" for dialogue in dialogues)
         ))
 
     return concepts
@@ -326,22 +368,61 @@ def _parse_comic_concepts_lenient(response: str) -> list[ComicConcept]:
 def format_comic_concepts_display(concepts: list[ComicConcept]) -> str:
     """Format comic concepts for display to user."""
     output = []
-    output.append("4-PANEL COMIC CONCEPTS:")
+    panel_count = len(concepts[0].panels) if concepts else DEFAULT_PANEL_COUNT
+    output.append(f"{panel_count}-PANEL COMIC CONCEPTS:")
     output.append("=" * 60)
 
     for concept in concepts:
         output.append(f"\n  {concept.number}. [{concept.title}]")
         output.append(f"     Arc: {concept.arc}")
-        output.append(f"     Panel 1: {concept.panel_1[:60]}...")
-        output.append(f"       -> {concept.dialogue_1[:60]}...")
-        output.append(f"     Panel 2: {concept.panel_2[:60]}...")
-        output.append(f"       -> {concept.dialogue_2[:60]}...")
-        output.append(f"     Panel 3: {concept.panel_3[:60]}...")
-        output.append(f"       -> {concept.dialogue_3[:60]}...")
-        output.append(f"     Panel 4: {concept.panel_4[:60]}...")
-        output.append(f"       -> {concept.dialogue_4[:60]}...")
+        for n, (panel, dialogue) in enumerate(zip(concept.panels, concept.dialogues), 1):
+            output.append(f"     Panel {n}: {panel[:60]}...")
+            output.append(f"       -> {dialogue[:60]}...")
 
     output.append("")
     output.append("=" * 60)
 
     return "\n".join(output)
+
+
+def benchmark_parser(responses: list[str], repeat: int = 20) -> str:
+    """Time the comic concept parser over recorded responses.
+
+    Each response is parsed with the panel count it actually uses. Returns
+    a printable report with the time per pass and how many concepts and
+    filled panels were recovered.
+    """
+    total_bytes = sum(len(response.encode("utf-8")) for response in responses)
+    panel_counts = [
+        max([int(n) for n in re.findall(r"(?im)^\W*panel\s*(\d+)\s*\**\s*:", response)]
+            or [DEFAULT_PANEL_COUNT])
+        for response in responses
+    ]
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parsed = [_parse_comic_concepts(response, n, json_mode=False)
+                  for response, n in zip(responses, panel_counts)]
+    elapsed = (time.perf_counter() - start) / repeat
+
+    concepts = [concept for batch in parsed for concept in batch]
+    panels = sum(len(concept.panels) for concept in concepts)
+    filled = sum(1 for concept in concepts for panel in concept.panels if panel)
+    return "\n".join([
+        f"Responses: {len(responses)} ({total_bytes / 1024:.0f} KiB), repeat={repeat}",
+        f"  {elapsed * 1000:8.2f} ms per pass ({elapsed * 1e6 / len(responses):.0f} us per response)",
+        f"  {len(concepts)} concept(s), {filled} of {panels} panel(s) filled",
+    ])
+
+
+if __name__ == "__main__":
+    # Usage: python -m frconor_post.comic_generator [response.txt ...]
+    # Defaults to the comic responses recorded in the LLM response cache.
+    responses = [Path(arg).read_text(encoding="utf-8") for arg in sys.argv[1:]]
+    if not responses:
+        responses = [r for r in list_cached_responses("Dialogue 1") if not looks_like_json(r)]
+    if not responses:
+        print("No recorded comic responses found.")
+        sys.exit(1)
+    print(benchmark_parser(responses))
+
@@ -1,10 +1,20 @@
 """Image concept generation using LLM providers (Gemini, Claude, Codex)."""
 
 import re
-import subprocess
+import threading
 from typing import NamedTuple
 
 from .config import load_prompt_template, load_settings
+from .llm_cache import cached_call, get_provider_model
+from .structured import (
+    OutputSchema,
+    apply_json_output,
+    call_structured,
+    complete_items,
+    json_output_enabled,
+    json_response_items,
+)
+from .telemetry import span
 
 
 class Concept(NamedTuple):
@@ -16,11 +26,23 @@ class Concept(NamedTuple):
     elements: str
 
 
+# Item shape for llm.output_format = "json"
+CONCEPTS_SCHEMA = OutputSchema("concepts", 3, {
+    "number": (int, "Concept number, 1-3"),
+    "setting": (str, "Short setting title"),
+    "scene": (str, "2-3 sentences describing the visual scene in detail"),
+    "mood": (str, "2-3 emotional tone words, comma-separated"),
+    "elements": (str, "Specific visual elements to include, comma-separated"),
+})
+
+
 def generate_concepts(
     quote: str,
     themes: list[str],
     style: dict,
-    provider: str | None = None
+    provider: str | None = None,
+    use_cache: bool = True,
+    cancel_event: threading.Event | None = None
 ) -> list[Concept]:
     """Generate 3 image concepts using the configured LLM provider.
 
@@ -29,6 +51,10 @@ def generate_concepts(
         themes: List of themes extracted from transcript (can be empty)
         style: Art style dict from art_styles.json
         provider: LLM provider to use (gemini, claude, codex). If None, uses settings default.
+        use_cache: Serve a cached response for an identical prompt. Pass False
+            to force a fresh generation (e.g. on regenerate).
+        cancel_event: When set, the provider call is killed and
+            ProviderCancelled raised (used for background prefetches)
 
     Returns:
         List of 3 Concept objects
@@ -40,6 +66,31 @@ def generate_concepts(
     if provider is None:
         provider = llm_config.get("quote_generation", {}).get("provider", "gemini")
 
+    prompt = build_concept_prompt(quote, themes, style)
+
+    answered_by, response = cached_call(
+        provider,
+        get_provider_model(provider, llm_config),
+        prompt,
+        lambda: call_structured(prompt, CONCEPTS_SCHEMA, llm_config, provider, _is_valid_response,
+                                cancel_event=cancel_event),
+        bypass=not use_cache,
+        validate=_is_valid_response
+    )
+
+    # Parse response into concepts
+    with span("parse.concepts", provider=answered_by) as fields:
+        concepts = _parse_concepts(response, fields)
+
+    return concepts
+
+
+def build_concept_prompt(quote: str, themes: list[str], style: dict) -> str:
+    """Fill the concept generation template.
+
+    Inputs are a single quote and a few themes, so there is nothing to trim
+    against the provider's token budget.
+    """
     # Load prompt template
     prompt_template = load_prompt_template("concept_generation")
 
@@ -61,93 +112,17 @@ def generate_concepts(
     prompt = prompt.replace("{color_palette}", color_palette)
     prompt = prompt.replace("{composition}", composition)
 
-    # Generate based on provider
-    if provider == "gemini":
-        response = _call_gemini(prompt, llm_config)
-    elif provider == "claude":
-        response = _call_claude(prompt, llm_config)
-    elif provider == "codex":
-        response = _call_codex(prompt, llm_config)
-    else:
-        raise ValueError(f"Unknown LLM provider: {provider}")
-
-    # Parse response into concepts
-    concepts = _parse_concepts(response)
-
-    return concepts
-
-
-def _call_gemini(prompt: str, config: dict) -> str:
-    """Call Gemini CLI for concept generation."""
-    provider_config = config.get("providers", {}).get("gemini", {})
-    command = provider_config.get("command", "gemini")
-    model_flag = provider_config.get("model_flag", "--model")
-    model = config.get("quote_generation", {}).get("model", "gemini-2.5-pro")
-
-    try:
-        result = subprocess.run(
-            [command, prompt, model_flag, model],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
+    if json_output_enabled(load_settings().get("llm", {})):
+        prompt = apply_json_output(prompt, CONCEPTS_SCHEMA)
+    return prompt
 
-        if result.returncode != 0:
-            raise RuntimeError(f"Gemini CLI error: {result.stderr}")
 
-        return result.stdout
+def _is_valid_response(response: str) -> bool:
+    """Check a response parses into the full set of concepts."""
+    return len(_parse_concepts(response)) == 3
 
-    except FileNotFoundError:
-        raise RuntimeError("Gemini CLI not found. Install with: pip install google-generativeai")
 
-
-def _call_claude(prompt: str, config: dict) -> str:
-    """Call Claude Code CLI for concept generation."""
-    provider_config = config.get("providers", {}).get("claude", {})
-    command = provider_config.get("command", "claude")
-    prompt_flag = provider_config.get("prompt_flag", "-p")
-
-    try:
-        result = subprocess.run(
-            [command, prompt_flag, prompt],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
-
-        if result.returncode != 0:
-            raise RuntimeError(f"Claude CLI error: {result.stderr}")
-
-        return result.stdout
-
-    except FileNotFoundError:
-        raise RuntimeError("Claude CLI not found.")
-
-
-def _call_codex(prompt: str, config: dict) -> str:
-    """Call Codex CLI for concept generation."""
-    provider_config = config.get("providers", {}).get("codex", {})
-    command = provider_config.get("command", "codex")
-    subcommand = provider_config.get("subcommand", "exec")
-
-    try:
-        result = subprocess.run(
-            [command, subcommand, prompt],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
-
-        if result.returncode != 0:
-            raise RuntimeError(f"Codex CLI error: {result.stderr}")
-
-        return result.stdout
-
-    except FileNotFoundError:
-        raise RuntimeError("Codex CLI not found. Install with: npm install -g @openai/codex")
-
-
-def _parse_concepts(response: str) -> list[Concept]:
+def _parse_concepts(response: str, trace: dict | None = None, json_mode: bool | None = None) -> list[Concept]:
     """Parse LLM response into a list of Concept objects.
 
     Expected format:
@@ -155,7 +130,20 @@ def _parse_concepts(response: str) -> list[Concept]:
        Scene: description
        Mood: words
        Elements: items
+
+    If trace is given, trace["parse_path"] is set to the parser that was
+    used ("json", "strict" or "lenient").
+
+    JSON found after a preamble is used when json_mode (default:
+    llm.output_format) is on; see json_response_items.
     """
+    trace = trace if trace is not None else {}
+    items = json_response_items(response, CONCEPTS_SCHEMA.key, json_mode)
+    trace["parse_path"] = "json" if items is not None else "strict"
+
+    if items is not None:
+        return [Concept(**item) for item in complete_items(items, CONCEPTS_SCHEMA)]
+
     concepts = []
 
     # Split by concept numbers
@@ -218,6 +206,7 @@ def _parse_concepts(response: str) -> list[Concept]:
     # Fallback if parsing failed
     if len(concepts) < 3:
         concepts = _parse_concepts_lenient(response)
+        trace["parse_path"] = "lenient"
 
     return concepts[:3]  # Ensure max 3
 
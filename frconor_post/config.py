@@ -35,6 +35,12 @@ def load_art_styles() -> dict[str, Any]:
     return load_json(styles_path)
 
 
+def load_theme_keywords() -> dict[str, Any]:
+    """Load theme keyword table from config/themes.json."""
+    themes_path = get_project_root() / "config" / "themes.json"
+    return load_json(themes_path)
+
+
 def load_prompt_template(name: str) -> str:
     """Load a prompt template from prompts/ directory."""
     prompt_path = get_project_root() / "prompts" / f"{name}.md"
@@ -42,14 +48,19 @@ def load_prompt_template(name: str) -> str:
         return f.read()
 
 
+def get_state_dir() -> Path:
+    """Get the runtime state directory."""
+    return get_project_root() / "state"
+
+
 def get_state_path() -> Path:
     """Get the path to state.json."""
-    return get_project_root() / "state" / "state.json"
+    return get_state_dir() / "state.json"
 
 
 def get_history_path() -> Path:
     """Get the path to post_history.json."""
-    return get_project_root() / "state" / "post_history.json"
+    return get_state_dir() / "post_history.json"
 
 
 def load_state() -> dict[str, Any]:
@@ -0,0 +1,153 @@
+"""Salience-ranked transcript excerpts.
+
+Scores every sentence of a transcript with TF-IDF (sentences as documents)
+and keeps the highest-scoring sentences that fit a word budget, in their
+original order. Scores are cached per transcript hash under
+cache/excerpt_scores/.
+"""
+
+import hashlib
+import math
+import re
+from collections import Counter
+from pathlib import Path
+
+from .config import get_cache_path, load_json, save_json
+
+
+SCORES_VERSION = 1
+
+# Sentence boundaries: end punctuation (optionally followed by a closing
+# quote or bracket) then whitespace, or a paragraph break
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])["\'”’)\]]*\s+|\n\s*\n')
+PARAGRAPH_PATTERN = re.compile(r'\n\s*\n')
+WORD_PATTERN = re.compile(r"[a-z']+")
+
+# Function words that carry no salience
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been
+before being below between both but by can could did do does doing down during
+each few for from further had has have having he her here hers herself him
+himself his how i if in into is it its itself just let me more most my myself
+no nor not now of off on once only or other our ours ourselves out over own
+same she should so some such than that the their theirs them themselves then
+there these they this those through to too under until up very was we were
+what when where which while who whom why will with would you your yours
+yourself yourselves one also us going get got say said know think really
+""".split())
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split transcript text into sentences."""
+    return [s.strip() for s in SENTENCE_PATTERN.split(text) if s and s.strip()]
+
+
+def paragraph_numbers(text: str, sentences: list[str]) -> list[int]:
+    """Index of the paragraph each of split_sentences(text) belongs to."""
+    numbers = [
+        n for n, paragraph in enumerate(PARAGRAPH_PATTERN.split(text))
+        for _ in split_sentences(paragraph)
+    ]
+    # Can only disagree on pathological input; treat it all as one paragraph
+    return numbers if len(numbers) == len(sentences) else [0] * len(sentences)
+
+
+def score_sentences(sentences: list[str]) -> list[float]:
+    """Score sentences by the TF-IDF weight of their content words.
+
+    A term's weight is its frequency across the whole transcript times its
+    inverse sentence frequency, so words the talk keeps returning to but
+    that are concentrated in particular passages count the most. Each
+    sentence scores the sum of its distinct terms' weights, normalised by
+    the square root of its length so long sentences don't win by default.
+    """
+    tokenized = [
+        [w for w in WORD_PATTERN.findall(sentence.lower()) if w not in STOPWORDS and len(w) > 2]
+        for sentence in sentences
+    ]
+
+    term_frequency = Counter(w for tokens in tokenized for w in tokens)
+    sentence_frequency = Counter(w for tokens in tokenized for w in set(tokens))
+    n = len(sentences)
+
+    weights = {
+        term: count * (math.log((1 + n) / (1 + sentence_frequency[term])) + 1.0)
+        for term, count in term_frequency.items()
+    }
+
+    scores = []
+    for tokens in tokenized:
+        if not tokens:
+            scores.append(0.0)
+            continue
+        total = sum(weights[term] for term in set(tokens))
+        scores.append(total / math.sqrt(len(tokens)))
+    return scores
+
+
+def _scores_cache_path(text_hash: str) -> Path:
+    return get_cache_path() / "excerpt_scores" / f"{text_hash}.json"
+
+
+def get_sentence_scores(text: str, use_cache: bool = True) -> tuple[list[str], list[float]]:
+    """Split a transcript into sentences and score them, using the cache."""
+    sentences = split_sentences(text)
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    cache_path = _scores_cache_path(text_hash)
+
+    if use_cache and cache_path.exists():
+        try:
+            data = load_json(cache_path)
+            if data.get("version") == SCORES_VERSION and len(data["scores"]) == len(sentences):
+                return sentences, data["scores"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    scores = score_sentences(sentences)
+
+    if use_cache:
+        try:
+            save_json(cache_path, {"version": SCORES_VERSION, "scores": scores})
+        except OSError:
+            pass
+
+    return sentences, scores
+
+
+def select_salient_excerpt(text: str, max_words: int) -> str:
+    """Pick the highest-scoring sentences within a word budget.
+
+    Sentences are kept in document order. Adjacent sentences keep the
+    transcript's paragraph breaks; gaps between non-adjacent sentences
+    are marked with [...] on a line of its own, as in head_tail excerpts.
+    """
+    sentences, scores = get_sentence_scores(text)
+    paragraphs = paragraph_numbers(text, sentences)
+    lengths = [len(sentence.split()) for sentence in sentences]
+
+    ranked = sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True)
+    chosen = []
+    budget = max_words
+
+    for i in ranked:
+        if lengths[i] <= budget:
+            chosen.append(i)
+            budget -= lengths[i]
+        if budget <= 0:
+            break
+
+    chosen.sort()
+    parts = []
+    previous = None
+    for i in chosen:
+        if previous is not None:
+            if i != previous + 1:
+                parts.append("\n\n[...]\n\n")
+            elif paragraphs[i] != paragraphs[previous]:
+                parts.append("\n\n")
+            else:
+                parts.append(" ")
+        parts.append(sentences[i])
+        previous = i
+
+    return "".join(parts)
@@ -0,0 +1,292 @@
+"""WhatsApp-sized export of generated images.
+
+Generated variations are multi-megabyte PNGs; WhatsApp recompresses
+anything larger than about 1600px anyway, and big uploads are slow on
+the phone side. Exporting downscales an image to output.export
+max_dimension, drops its metadata and encodes it as JPEG or WebP at the
+highest quality that fits output.export target_kb (binary search
+between min_quality and max_quality).
+
+Encodes run in a process pool, one process per image, and their outputs
+are cached under cache/exports by the source file's content hash and the
+export settings, so exporting every variation up front makes exporting
+the chosen one free. Needs Pillow (`pip install 'frconor-post[preview]'`).
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from .artifacts import file_digest, format_size
+from .config import get_cache_path, load_settings
+from .preview import downscale, pillow_available
+
+
+# Background for flattening transparent images (JPEG has no alpha)
+FLATTEN_BACKGROUND = (255, 255, 255)
+
+EXPORT_EXTENSIONS = {"jpeg": ".jpg", "webp": ".webp"}
+
+
+class ExportResult(NamedTuple):
+    """One exported image."""
+    source: str
+    path: str  # The cached export
+    format: str  # "jpeg" or "webp"
+    quality: int
+    width: int
+    height: int
+    source_bytes: int
+    bytes: int
+    seconds: float  # Encode time (0 when served from cache)
+    cached: bool
+    over_budget: bool  # Even min_quality didn't fit target_kb
+
+
+def get_export_config() -> dict:
+    """The output.export settings, with defaults."""
+    return {
+        "enabled": True,
+        "format": "jpeg",
+        "max_dimension": 1600,
+        "target_kb": 350,
+        "min_quality": 50,
+        "max_quality": 90,
+        **load_settings().get("output", {}).get("export", {}),
+    }
+
+
+def get_export_dir() -> Path:
+    """Get the export cache directory."""
+    return get_cache_path() / "exports"
+
+
+def _encode(image, fmt: str, quality: int, final: bool = False) -> bytes:
+    """Encode to bytes. Search probes skip JPEG's extra optimisation passes,
+    which only ever make the file smaller."""
+    buffer = io.BytesIO()
+    if fmt == "webp":
+        image.save(buffer, "WEBP", quality=quality, method=4)
+    else:
+        image.save(buffer, "JPEG", quality=quality, optimize=final, progressive=final)
+    return buffer.getvalue()
+
+
+def encode_for_whatsapp(source: str, dest: str, config: dict) -> tuple[int, int, int, bool, float]:
+    """Downscale, strip and encode one image at the best quality within budget.
+
+    Runs in a worker process.
+
+    Args:
+        source: Image to export
+        dest: Where to write the encoded file
+        config: Export settings (see get_export_config)
+
+    Returns:
+        (quality, width, height, over_budget, seconds)
+    """
+    from PIL import Image
+
+    start = time.perf_counter()
+    with Image.open(source) as opened:
+        image = downscale(opened, config["max_dimension"])
+        if image.mode in ("RGBA", "LA"):
+            flat = Image.new("RGB", image.size, FLATTEN_BACKGROUND)
+            flat.paste(image, mask=image.getchannel("A"))
+            image = flat
+        else:
+            image = image.convert("RGB")
+        image.info = {}  # No EXIF, ICC profile or text chunks in the export
+
+    fmt = config["format"]
+    budget = config["target_kb"] * 1024
+    low, high = config["min_quality"], config["max_quality"]
+
+    # Highest quality whose encode fits the budget; most images already
+    # fit at max_quality, which takes a single probe
+    if len(_encode(image, fmt, high)) <= budget:
+        quality = high
+    else:
+        quality = None
+        high -= 1
+        while low <= high:
+            mid = (low + high) // 2
+            if len(_encode(image, fmt, mid)) <= budget:
+                quality, low = mid, mid + 1
+            else:
+                high = mid - 1
+
+    over_budget = quality is None
+    if over_budget:
+        quality = config["min_quality"]
+    data = _encode(image, fmt, quality, final=True)
+
+    tmp = f"{dest}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, dest)
+    return quality, image.width, image.height, over_budget, time.perf_counter() - start
+
+
+def _cache_name(digest: str, config: dict) -> str:
+    settings_key = json.dumps(
+        {key: config[key] for key in ("format", "max_dimension", "target_kb", "min_quality", "max_quality")},
+        sort_keys=True
+    )
+    settings_hash = hashlib.sha256(settings_key.encode("utf-8")).hexdigest()[:8]
+    return f"{digest[:20]}-{settings_hash}{EXPORT_EXTENSIONS[config['format']]}"
+
+
+def export_images(paths: list[Path], config: dict | None = None) -> list[ExportResult]:
+    """Export images for WhatsApp, from cache where possible.
+
+    Images not in the cache are encoded in a process pool, one process
+    per image.
+
+    Args:
+        paths: Source images
+        config: Export settings (default: output.export)
+
+    Returns:
+        One ExportResult per path, in order
+    """
+    config = config or get_export_config()
+    if config["format"] not in EXPORT_EXTENSIONS:
+        raise ValueError(f"Unknown export format: {config['format']} (use jpeg or webp)")
+
+    export_dir = get_export_dir()
+    export_dir.mkdir(parents=True, exist_ok=True)
+    dests = [export_dir / _cache_name(file_digest(path), config) for path in paths]
+    meta_paths = [dest.with_name(dest.name + ".json") for dest in dests]
+
+    missing = [n for n, dest in enumerate(dests) if not (dest.exists() and meta_paths[n].exists())]
+    encoded = {}
+    if len(missing) == 1:
+        n = missing[0]
+        encoded[n] = encode_for_whatsapp(str(paths[n]), str(dests[n]), config)
+    elif missing:
+        with ProcessPoolExecutor(max_workers=min(len(missing), os.cpu_count() or 1)) as pool:
+            outcomes = pool.map(
+                encode_for_whatsapp,
+                [str(paths[n]) for n in missing],
+                [str(dests[n]) for n in missing],
+                [config] * len(missing)
+            )
+            encoded = dict(zip(missing, outcomes))
+
+    results = []
+    for n, (path, dest, meta_path) in enumerate(zip(paths, dests, meta_paths)):
+        if n in encoded:
+            quality, width, height, over_budget, seconds = encoded[n]
+            meta_path.write_text(json.dumps({
+                "quality": quality, "width": width, "height": height, "over_budget": over_budget
+            }))
+            cached = False
+        else:
+            meta = json.loads(meta_path.read_text())
+            quality, width, height, over_budget = (
+                meta["quality"], meta["width"], meta["height"], meta["over_budget"]
+            )
+            seconds, cached = 0.0, True
+
+        results.append(ExportResult(
+            source=str(path),
+            path=str(dest),
+            format=config["format"],
+            quality=quality,
+            width=width,
+            height=height,
+            source_bytes=path.stat().st_size,
+            bytes=dest.stat().st_size,
+            seconds=round(seconds, 3),
+            cached=cached,
+            over_budget=over_budget,
+        ))
+    return results
+
+
+def export_image(path: Path) -> ExportResult | None:
+    """Export one image with the configured settings.
+
+    Returns:
+        The export, or None if exporting is disabled or Pillow isn't installed
+    """
+    config = get_export_config()
+    if not config["enabled"] or not pillow_available():
+        return None
+    return export_images([path], config)[0]
+
+
+def start_exports(paths: list[Path]) -> threading.Thread | None:
+    """Export all variations on a background thread while one is being picked.
+
+    Exporting the chosen one afterwards is then a cache hit. Errors are
+    ignored here; export_image reports them for the image that matters.
+
+    Returns:
+        The thread (join it before exporting), or None if exporting is off
+    """
+    config = get_export_config()
+    if not paths or not config["enabled"] or not pillow_available():
+        return None
+
+    def run():
+        try:
+            export_images(paths, config)
+        except Exception:
+            pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def format_export_summary(result: ExportResult) -> str:
+    """One-line description of an export, e.g. for the success message."""
+    saved = 1 - result.bytes / result.source_bytes if result.source_bytes else 0
+    line = (
+        f"{result.format.upper()} q{result.quality}, {result.width}x{result.height}, "
+        f"{format_size(result.source_bytes)} -> {format_size(result.bytes)}, {saved:.0%} smaller"
+    )
+    if result.over_budget:
+        line += " - over target size even at min_quality"
+    return line
+
+
+if __name__ == "__main__":
+    # Benchmark: python -m frconor_post.export IMAGE [IMAGE ...]
+    sources = [Path(arg) for arg in sys.argv[1:]]
+    if not sources:
+        sys.exit("usage: python -m frconor_post.export IMAGE [IMAGE ...]")
+
+    export_config = get_export_config()
+    shutil.rmtree(get_export_dir(), ignore_errors=True)  # Time a cold cache first
+
+    start = time.perf_counter()
+    exports = export_images(sources, export_config)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    export_images(sources, export_config)
+    cached = time.perf_counter() - start
+
+    print(f"Target {export_config['target_kb']} KB, max {export_config['max_dimension']}px, "
+          f"{export_config['format']}")
+    for export in exports:
+        print(f"  {Path(export.source).name:24} {format_export_summary(export)}  "
+              f"encode {export.seconds * 1000:.0f} ms")
+
+    source_total = sum(export.source_bytes for export in exports)
+    export_total = sum(export.bytes for export in exports)
+    print(f"  total: {format_size(source_total)} -> {format_size(export_total)}, "
+          f"{format_size(source_total - export_total)} saved")
+    print(f"  wall time: cold {cold * 1000:.0f} ms, cached {cached * 1000:.0f} ms "
+          f"(serial encode sum {sum(export.seconds for export in exports) * 1000:.0f} ms)")
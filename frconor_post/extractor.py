@@ -0,0 +1,269 @@
+"""Paragraph extraction backends for transcript HTML.
+
+The default "stream" backend walks the HTML once with the stdlib HTMLParser
+and emits paragraph text as each <p> closes, without building a tree. The
+"bs4" backend is the original BeautifulSoup implementation, kept for parity
+checks.
+"""
+
+import sys
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from html.parser import HTMLParser
+from pathlib import Path
+
+
+# Closing prayer that is dropped from transcripts
+CLOSING_PRAYER_PREFIX = "I thank you, my God"
+
+# Elements that never have children (mirrors BeautifulSoup's html.parser builder)
+VOID_ELEMENTS = {
+    "area", "base", "basefont", "bgsound", "br", "col", "command", "embed",
+    "frame", "hr", "image", "img", "input", "isindex", "keygen", "link",
+    "menuitem", "meta", "nextid", "param", "source", "spacer", "track", "wbr",
+}
+
+# Elements whose text is not part of the visible page text
+NON_TEXT_ELEMENTS = {"script", "style", "template"}
+
+# Content containers in order of preference
+CONTAINERS = ("article", "main", "body")
+
+
+def _keep_paragraph(text: str) -> bool:
+    """Filter applied to every extracted paragraph."""
+    # Skip closing prayer (often starts with "I thank you, my God")
+    return bool(text) and not text.startswith(CLOSING_PRAYER_PREFIX)
+
+
+class ParagraphExtractor(HTMLParser):
+    """Single-pass paragraph extractor.
+
+    Tracks only a stack of open tag names. Paragraphs are collected
+    separately for the first <article>, <main> and <body>, so the preferred
+    container can be chosen at the end without a second pass.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack: list[str] = []
+        # Stack depth at which each container's first occurrence was opened
+        self.container_depth: dict[str, int | None] = {name: None for name in CONTAINERS}
+        self.container_closed: dict[str, bool] = {name: False for name in CONTAINERS}
+        self.paragraphs: dict[str, list[str]] = {name: [] for name in CONTAINERS}
+        # Each paragraph is a [containers, text fragments, closed] slot.
+        # Nested paragraphs are open at the same time and all receive text.
+        self.open_paragraphs: list[list] = []
+        # Paragraphs are emitted in start-tag order, like find_all("p")
+        self.pending: deque[list] = deque()
+        self.data: list[str] = []
+        self.non_text_depth = 0
+        # Void elements written as <br>; a later </br> is swallowed silently
+        self.closed_void: list[str] = []
+
+    def _active_containers(self) -> list[str]:
+        return [
+            name for name in CONTAINERS
+            if self.container_depth[name] is not None and not self.container_closed[name]
+        ]
+
+    def _flush_data(self) -> None:
+        """Hand buffered text to every open paragraph (one string per text node)."""
+        if not self.data:
+            return
+        text = "".join(self.data).strip()
+        self.data = []
+        if text and not self.non_text_depth:
+            for _, fragments, _ in self.open_paragraphs:
+                fragments.append(text)
+
+    def _emit_ready(self) -> None:
+        """Emit finished paragraphs that no earlier open paragraph precedes."""
+        while self.pending and self.pending[0][2]:
+            containers, fragments, _ = self.pending.popleft()
+            text = "".join(fragments)
+            if _keep_paragraph(text):
+                for name in containers:
+                    self.paragraphs[name].append(text)
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_data()
+        if tag in VOID_ELEMENTS:
+            self.closed_void.append(tag)
+            return
+        self._open(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._flush_data()
+        if tag not in VOID_ELEMENTS:
+            self._open(tag)
+            self._close(tag)
+
+    def _open(self, tag: str) -> None:
+        self.stack.append(tag)
+        depth = len(self.stack)
+
+        if tag in self.container_depth and self.container_depth[tag] is None:
+            self.container_depth[tag] = depth
+        if tag in NON_TEXT_ELEMENTS:
+            self.non_text_depth += 1
+        if tag == "p":
+            slot = [self._active_containers(), [], False]
+            self.pending.append(slot)
+            self.open_paragraphs.append(slot)
+
+    def handle_endtag(self, tag):
+        if tag in self.closed_void:
+            self.closed_void.remove(tag)
+            return
+        self._flush_data()
+        self._close(tag)
+
+    def _close(self, tag: str) -> None:
+        if tag not in self.stack:
+            return  # Stray end tag, ignored like BeautifulSoup does
+
+        # Pop up to and including the most recent matching tag
+        while self.stack:
+            name = self.stack.pop()
+            depth = len(self.stack) + 1
+
+            if name in NON_TEXT_ELEMENTS:
+                self.non_text_depth -= 1
+            if name == "p":
+                self.open_paragraphs.pop()[2] = True
+            if name in self.container_depth and self.container_depth[name] == depth:
+                self.container_closed[name] = True
+            if name == tag:
+                break
+
+        self._emit_ready()
+
+    def handle_comment(self, data):
+        self._flush_data()
+
+    def handle_decl(self, decl):
+        self._flush_data()
+
+    def handle_pi(self, data):
+        self._flush_data()
+
+    def unknown_decl(self, data):
+        self._flush_data()
+
+    def handle_data(self, data):
+        self.data.append(data)
+
+    def finish(self) -> list[str] | None:
+        """Close the document and return paragraphs of the preferred container."""
+        self.close()
+        self._flush_data()
+        # Unclosed paragraphs end with the document
+        for slot in self.open_paragraphs:
+            slot[2] = True
+        self.open_paragraphs = []
+        self._emit_ready()
+
+        for name in CONTAINERS:
+            if self.container_depth[name] is not None:
+                return self.paragraphs[name]
+        return None
+
+
+def extract_paragraphs_stream(html: str | Iterable[str]) -> list[str] | None:
+    """Extract filtered paragraph text in a single streaming pass.
+
+    Args:
+        html: The page HTML, either whole or as an iterable of chunks
+
+    Returns:
+        List of paragraph strings, or None if the page has no
+        <article>, <main> or <body> element
+    """
+    parser = ParagraphExtractor()
+    if isinstance(html, str):
+        parser.feed(html)
+    else:
+        for chunk in html:
+            parser.feed(chunk)
+    return parser.finish()
+
+
+def extract_paragraphs_bs4(html: str | Iterable[str]) -> list[str] | None:
+    """Extract filtered paragraph text with BeautifulSoup (full DOM parse)."""
+    from bs4 import BeautifulSoup
+
+    if not isinstance(html, str):
+        html = "".join(html)
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Extract main content - try article tag first, then main, then body
+    content = soup.find("article") or soup.find("main") or soup.find("body")
+    if not content:
+        return None
+
+    paragraphs = (p.get_text(strip=True) for p in content.find_all("p"))
+    return [text for text in paragraphs if _keep_paragraph(text)]
+
+
+EXTRACTION_BACKENDS: dict[str, Callable[[str | Iterable[str]], list[str] | None]] = {
+    "stream": extract_paragraphs_stream,
+    "bs4": extract_paragraphs_bs4,
+}
+
+
+def extract_paragraphs(html: str | Iterable[str], backend: str = "stream") -> list[str] | None:
+    """Extract filtered paragraph text using the named backend."""
+    try:
+        extract = EXTRACTION_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown extraction backend: {backend}")
+    return extract(html)
+
+
+def benchmark_backends(paths: list[Path], repeat: int = 5) -> str:
+    """Compare extraction backends on saved pages for parity and speed.
+
+    Returns a printable report with per-backend timings and any pages
+    where the backends disagree.
+    """
+    pages = [(path, path.read_text(encoding="utf-8")) for path in paths]
+    total_bytes = sum(len(html.encode("utf-8")) for _, html in pages)
+
+    lines = [f"Pages: {len(pages)} ({total_bytes / 1024:.0f} KiB), repeat={repeat}"]
+    outputs: dict[str, list] = {}
+
+    for name, extract in EXTRACTION_BACKENDS.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            outputs[name] = [extract(html) for _, html in pages]
+        elapsed = (time.perf_counter() - start) / repeat
+        lines.append(f"  {name:8} {elapsed * 1000:8.1f} ms per pass")
+
+    mismatches = [
+        path for i, (path, _) in enumerate(pages)
+        if outputs["stream"][i] != outputs["bs4"][i]
+    ]
+    if mismatches:
+        lines.append(f"Parity: {len(mismatches)} page(s) differ")
+        lines.extend(f"  {path}" for path in mismatches)
+    else:
+        lines.append("Parity: all pages match")
+
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    # Usage: python -m frconor_post.extractor [page.html ...]
+    # Defaults to the raw pages saved in cache/transcripts/.
+    from .config import get_cache_path
+
+    paths = [Path(arg) for arg in sys.argv[1:]]
+    if not paths:
+        paths = sorted((get_cache_path() / "transcripts").glob("*.html"))
+    if not paths:
+        print("No saved transcript pages found.")
+        sys.exit(1)
+    print(benchmark_backends(paths))
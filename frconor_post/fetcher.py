@@ -1,14 +1,36 @@
 """Transcript fetching and parsing module."""
 
+import hashlib
+import math
+import re
+import threading
 import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
 from typing import NamedTuple
+from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
+from .config import get_cache_path, load_json, load_settings, load_theme_keywords, save_json
+from .excerpt import select_salient_excerpt
+from .extractor import extract_paragraphs
+from .telemetry import span
+from .theme_index import get_theme_index, update_theme_index
 from .utils import validate_transcript_url
 
 
+# Version of the parsed transcripts in cache/transcripts. Bump it whenever
+# extraction or theme ranking changes: older parses are then rebuilt from
+# the cached HTML instead of being served as they are.
+TRANSCRIPT_CACHE_VERSION = 2
+
+
 class TranscriptResult(NamedTuple):
     """Result of transcript fetching."""
     text: str
@@ -16,60 +38,200 @@ class TranscriptResult(NamedTuple):
     themes: list[str]
 
 
-def fetch_transcript(url: str, max_retries: int = 3, timeout: int = 30) -> TranscriptResult:
+class FetchOutcome(NamedTuple):
+    """Result of one fetch in a bulk transcript fetch."""
+    url: str
+    result: TranscriptResult | None
+    error: Exception | None
+
+
+# Shared keep-alive session so repeated fetches reuse pooled connections
+_session: requests.Session | None = None
+_session_pool_size = 0
+_session_lock = threading.Lock()
+
+
+def get_session(pool_size: int = 10) -> requests.Session:
+    """Get the shared, connection-pooled HTTP session.
+
+    Args:
+        pool_size: Connections to keep per host. A larger size than the
+            session has remounts its adapter; a smaller one keeps the pool.
+
+    Returns:
+        The shared session
+    """
+    global _session, _session_pool_size
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+        if pool_size > _session_pool_size:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            _session_pool_size = pool_size
+        return _session
+
+
+def fetch_transcript(
+    url: str,
+    max_retries: int = 3,
+    timeout: int = 30,
+    use_cache: bool = True
+) -> TranscriptResult:
     """Fetch and parse transcript from a URL.
 
+    Parsed transcripts are cached under cache/transcripts/. When a cached copy
+    exists the request is revalidated with ETag/If-Modified-Since; a 304 (or a
+    network failure) returns the cached result without re-parsing.
+
     Args:
         url: The transcript URL (frconor-ebook.github.io)
         max_retries: Maximum number of retry attempts
         timeout: Request timeout in seconds
+        use_cache: Whether to use the on-disk transcript cache
 
     Returns:
         TranscriptResult with text, word count, and extracted themes
 
     Raises:
         ValueError: If URL is invalid
-        requests.RequestException: If all retries fail
+        requests.RequestException: If all retries fail and nothing is cached
     """
     if not validate_transcript_url(url):
         raise ValueError(f"Invalid transcript URL: {url}")
 
+    transcript_config = load_settings().get("transcripts", {})
+    if use_cache:
+        use_cache = transcript_config.get("cache_enabled", True)
+
+    backend = transcript_config.get("extraction_backend", "stream")
+    entry = _load_cache_entry(url) if use_cache else None
+    cached = _load_cached_result(entry["content_hash"], url, backend) if entry else None
+
+    headers = {}
+    if cached is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        with span("fetch", provider=urlparse(url).netloc) as fields:
+            response = _get_with_retries(url, headers, max_retries, timeout)
+            fields.update(exit_code=response.status_code, output_bytes=len(response.content))
+    except requests.RequestException:
+        # Offline or server down - serve the cached copy if we have one
+        if cached is not None:
+            return _with_corpus_themes(cached, entry["content_hash"], transcript_config, use_cache)
+        raise
+
+    if response.status_code == 304 and cached is not None:
+        return _with_corpus_themes(cached, entry["content_hash"], transcript_config, use_cache)
+
+    html = response.text
+    content_hash = hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+    if cached is not None and entry["content_hash"] == content_hash:
+        result = cached
+    else:
+        with span("extract", provider=backend, prompt_bytes=len(response.content)) as fields:
+            result = _parse_transcript(html, url, backend)
+            fields["output_bytes"] = len(result.text.encode("utf-8"))
+
+    if use_cache:
+        _save_cache_entry(url, response, html, content_hash, result)
+
+    return _with_corpus_themes(result, content_hash, transcript_config, use_cache)
+
+
+def fetch_transcripts_many(
+    urls: Iterable[str],
+    concurrency: int = 4,
+    per_host_limit: int = 2,
+    max_retries: int = 3,
+    timeout: int = 30,
+    use_cache: bool = True
+) -> Iterator[FetchOutcome]:
+    """Fetch many transcripts concurrently, yielding each as it completes.
+
+    All fetches share the pooled session from get_session(). At most
+    per_host_limit requests are in flight against any single host. Failures
+    are reported in FetchOutcome.error rather than raised, so one bad URL
+    does not abort the batch.
+
+    Args:
+        urls: Transcript URLs to fetch (duplicates are fetched once)
+        concurrency: Maximum number of fetches in flight overall
+        per_host_limit: Maximum number of fetches in flight per host
+        max_retries: Maximum number of retry attempts per URL
+        timeout: Request timeout in seconds
+        use_cache: Whether to use the on-disk transcript cache
+
+    Yields:
+        FetchOutcome for each URL, in completion order
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return
+
+    concurrency = max(1, concurrency)
+    get_session(pool_size=max(concurrency, 10))
+
+    host_limits: dict[str, threading.Semaphore] = {}
+    host_limits_lock = threading.Lock()
+
+    def fetch_one(url: str) -> TranscriptResult:
+        host = urlparse(url).netloc.lower()
+        with host_limits_lock:
+            limit = host_limits.setdefault(host, threading.Semaphore(max(1, per_host_limit)))
+        with limit:
+            return fetch_transcript(url, max_retries=max_retries, timeout=timeout, use_cache=use_cache)
+
+    executor = ThreadPoolExecutor(max_workers=min(concurrency, len(unique_urls)))
+    try:
+        futures = {executor.submit(fetch_one, url): url for url in unique_urls}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                yield FetchOutcome(url=url, result=future.result(), error=None)
+            except Exception as e:
+                yield FetchOutcome(url=url, result=None, error=e)
+    finally:
+        # Stop queued fetches if the caller abandons the iterator early
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _get_with_retries(
+    url: str,
+    headers: dict[str, str],
+    max_retries: int,
+    timeout: int
+) -> requests.Response:
+    """GET a URL with exponential backoff between failed attempts."""
     last_error = None
 
     for attempt in range(max_retries):
         try:
-            response = requests.get(url, timeout=timeout)
+            response = get_session().get(url, headers=headers, timeout=timeout)
             response.raise_for_status()
-            html = response.text
-            break
+            return response
         except requests.RequestException as e:
             last_error = e
             if attempt < max_retries - 1:
                 time.sleep(2 ** attempt)  # Exponential backoff
             continue
-    else:
-        raise last_error or requests.RequestException(f"Failed to fetch {url}")
 
-    # Parse HTML
-    soup = BeautifulSoup(html, "html.parser")
+    raise last_error or requests.RequestException(f"Failed to fetch {url}")
 
-    # Extract main content - try article tag first, then main, then body
-    content = soup.find("article") or soup.find("main") or soup.find("body")
-
-    if not content:
-        raise ValueError(f"Could not find main content in {url}")
 
-    # Extract text from paragraphs
-    paragraphs = content.find_all("p")
-    text_parts = []
+def _parse_transcript(html: str, url: str, backend: str = "stream") -> TranscriptResult:
+    """Parse transcript HTML into a TranscriptResult."""
+    # Paragraphs from article, main, or body (closing prayer already dropped)
+    text_parts = extract_paragraphs(html, backend)
 
-    for p in paragraphs:
-        text = p.get_text(strip=True)
-        # Skip closing prayer (often starts with "I thank you, my God")
-        if text.startswith("I thank you, my God"):
-            continue
-        if text:
-            text_parts.append(text)
+    if text_parts is None:
+        raise ValueError(f"Could not find main content in {url}")
 
     full_text = "\n\n".join(text_parts)
     word_count = len(full_text.split())
@@ -84,57 +246,246 @@ def fetch_transcript(url: str, max_retries: int = 3, timeout: int = 30) -> Trans
     )
 
 
-def extract_themes(text: str) -> list[str]:
+def _with_corpus_themes(
+    result: TranscriptResult,
+    content_hash: str,
+    transcript_config: dict,
+    use_cache: bool = True
+) -> TranscriptResult:
+    """Index the transcript and re-rank its themes by corpus TF-IDF.
+
+    Falls back to the plain frequency themes until the index holds at
+    least tfidf_min_documents transcripts. With use_cache off the themes
+    are ranked against the existing index, which is left unchanged.
+    """
+    if not transcript_config.get("tfidf_themes", True):
+        return result
+
+    counts = count_theme_keywords(result.text)
+    index = update_theme_index(content_hash, counts) if use_cache else get_theme_index()
+    if len(index) < transcript_config.get("tfidf_min_documents", 5):
+        return result
+
+    return result._replace(themes=rank_themes(counts, index.idf))
+
+
+def get_transcript_cache_dir() -> Path:
+    """Get the transcript cache directory (cache/transcripts)."""
+    return get_cache_path() / "transcripts"
+
+
+def _cache_entry_path(url: str) -> Path:
+    """Get the path of the per-URL cache entry (validators + content hash)."""
+    url_hash = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return get_transcript_cache_dir() / "urls" / f"{url_hash}.json"
+
+
+def _load_cache_entry(url: str) -> dict | None:
+    """Load the cache entry for a URL, if one exists."""
+    entry_path = _cache_entry_path(url)
+    if not entry_path.exists():
+        return None
+    try:
+        entry = load_json(entry_path)
+    except (OSError, ValueError):
+        return None
+    if entry.get("url") != url or not entry.get("content_hash"):
+        return None
+    return entry
+
+
+def _load_cached_result(
+    content_hash: str,
+    url: str,
+    backend: str = "stream"
+) -> TranscriptResult | None:
+    """Load a parsed transcript by the hash of its raw HTML.
+
+    A parse from an older TRANSCRIPT_CACHE_VERSION is rebuilt from the
+    cached HTML (and saved back), so no request is needed.
+    """
+    cache_dir = get_transcript_cache_dir()
+    result_path = cache_dir / f"{content_hash}.json"
+    if not result_path.exists():
+        return None
+    try:
+        data = load_json(result_path)
+        if data.get("version") == TRANSCRIPT_CACHE_VERSION:
+            return TranscriptResult(
+                text=data["text"],
+                word_count=data["word_count"],
+                themes=data["themes"]
+            )
+
+        html = (cache_dir / f"{content_hash}.html").read_text(encoding="utf-8")
+        result = _parse_transcript(html, url, backend)
+        _save_cached_result(result_path, result)
+        return result
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _save_cached_result(result_path: Path, result: TranscriptResult) -> None:
+    """Store a parsed transcript, stamped with TRANSCRIPT_CACHE_VERSION."""
+    save_json(result_path, {"version": TRANSCRIPT_CACHE_VERSION, **result._asdict()})
+
+
+def _save_cache_entry(
+    url: str,
+    response: requests.Response,
+    html: str,
+    content_hash: str,
+    result: TranscriptResult
+) -> None:
+    """Store raw HTML, parsed result, and revalidation headers for a URL."""
+    cache_dir = get_transcript_cache_dir()
+    html_path = cache_dir / f"{content_hash}.html"
+    result_path = cache_dir / f"{content_hash}.json"
+    try:
+        if not result_path.exists():
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            html_path.write_text(html, encoding="utf-8")
+            _save_cached_result(result_path, result)
+
+        save_json(_cache_entry_path(url), {
+            "url": url,
+            "content_hash": content_hash,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": datetime.now().isoformat()
+        })
+    except OSError:
+        # Caching is best-effort; a read-only cache dir must not break fetching
+        pass
+
+
+class ThemeMatcher(NamedTuple):
+    """Compiled theme keyword table."""
+    pattern: re.Pattern
+    keyword_themes: dict[str, str]
+    weights: dict[str, float]
+    max_themes: int
+    fallback: list[str]
+
+
+@lru_cache(maxsize=1)
+def get_theme_matcher() -> ThemeMatcher:
+    """Compile config/themes.json into a single word-boundary regex.
+
+    Compiled once per process. Keywords match whole words, optionally
+    followed by a plural/past-tense suffix, so "home" matches "homes"
+    but not "homework". Multi-word keywords match across any whitespace.
+    """
+    config = load_theme_keywords()
+    keyword_themes = {}
+    weights = {}
+
+    for theme, entry in config.get("themes", {}).items():
+        weights[theme] = float(entry.get("weight", 1.0))
+        for keyword in entry.get("keywords", []):
+            keyword_themes.setdefault(" ".join(keyword.lower().split()), theme)
+
+    # Longest first so "letting go" wins over any shorter overlapping keyword
+    alternatives = [
+        r"\s+".join(re.escape(word) for word in keyword.split())
+        for keyword in sorted(keyword_themes, key=len, reverse=True)
+    ]
+    pattern = re.compile(
+        r"\b(" + "|".join(alternatives) + r")(?:s|es|d|ed)?\b",
+        re.IGNORECASE
+    )
+
+    return ThemeMatcher(
+        pattern=pattern,
+        keyword_themes=keyword_themes,
+        weights=weights,
+        max_themes=config.get("max_themes", 5),
+        fallback=config.get("fallback", ["reflection", "meditation"])
+    )
+
+
+def count_theme_keywords(text: str) -> Counter[str]:
+    """Count occurrences of every theme keyword in a single pass."""
+    matcher = get_theme_matcher()
+    return Counter(
+        " ".join(match.group(1).lower().split())
+        for match in matcher.pattern.finditer(text)
+    )
+
+
+def extract_themes(text: str, idf: Callable[[str], float] | None = None) -> list[str]:
     """Extract key themes from transcript text.
 
-    Uses simple keyword frequency analysis to identify main themes.
+    Counts every theme keyword occurrence and ranks themes by weighted
+    frequency. Ties keep the order of config/themes.json.
+
+    Args:
+        text: Transcript text
+        idf: Optional keyword -> inverse document frequency lookup (see
+            theme_index). When given, themes are ranked by TF-IDF so words
+            common to every meditation stop dominating.
     """
-    # Common spiritual/meditation themes to look for
-    theme_keywords = {
-        "love": ["love", "loving", "beloved"],
-        "peace": ["peace", "peaceful", "calm", "tranquil"],
-        "trust": ["trust", "trusting", "faith", "faithful"],
-        "guidance": ["guide", "guidance", "lead", "leading", "path"],
-        "forgiveness": ["forgive", "forgiveness", "mercy", "merciful"],
-        "hope": ["hope", "hopeful", "promise"],
-        "prayer": ["pray", "prayer", "praying"],
-        "grace": ["grace", "gracious", "blessing"],
-        "suffering": ["suffer", "suffering", "pain", "struggle"],
-        "healing": ["heal", "healing", "restore", "restoration"],
-        "joy": ["joy", "joyful", "happiness", "happy"],
-        "silence": ["silence", "silent", "quiet", "stillness"],
-        "surrender": ["surrender", "letting go", "release"],
-        "belonging": ["belong", "belonging", "home"],
-        "protection": ["protect", "protection", "shepherd", "safe"],
-        "presence": ["presence", "present", "aware", "awareness"],
-        "gratitude": ["grateful", "gratitude", "thankful", "thanks"],
-        "humility": ["humble", "humility", "meek"],
-    }
-
-    text_lower = text.lower()
-    found_themes = []
-
-    for theme, keywords in theme_keywords.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                found_themes.append(theme)
-                break
-
-    # Return top themes (max 5)
-    return found_themes[:5] if found_themes else ["reflection", "meditation"]
-
-
-def get_transcript_excerpt(text: str, max_words: int = 2000) -> str:
+    return rank_themes(count_theme_keywords(text), idf)
+
+
+def rank_themes(
+    counts: dict[str, int],
+    idf: Callable[[str], float] | None = None
+) -> list[str]:
+    """Rank themes from per-keyword counts (see extract_themes)."""
+    matcher = get_theme_matcher()
+    scores: dict[str, float] = {}
+
+    for keyword, count in counts.items():
+        theme = matcher.keyword_themes[keyword]
+        if idf is None:
+            score = count
+        else:
+            # Sublinear term frequency so one repeated word can't swamp the rest
+            score = (1.0 + math.log(count)) * idf(keyword)
+        scores[theme] = scores.get(theme, 0.0) + score * matcher.weights[theme]
+
+    if not scores:
+        return list(matcher.fallback)
+
+    # Return top themes (max 5 by default); sorted() is stable for ties
+    ranked = sorted(scores, key=lambda theme: scores[theme], reverse=True)
+    return ranked[:matcher.max_themes]
+
+
+def get_transcript_excerpt(
+    text: str,
+    max_words: int | None = None,
+    mode: str | None = None
+) -> str:
     """Get an excerpt from the transcript for quote generation.
 
     Tries to include the most meaningful parts of the transcript.
+
+    Args:
+        text: Full transcript text
+        max_words: Word budget (default: transcripts.excerpt_max_words, 2000)
+        mode: "salience" to keep the highest-ranked sentences in document
+            order, or "head_tail" to keep the opening and closing words
+            (default: transcripts.excerpt_mode)
     """
+    transcript_config = load_settings().get("transcripts", {})
+    if max_words is None:
+        max_words = transcript_config.get("excerpt_max_words", 2000)
+    if mode is None:
+        mode = transcript_config.get("excerpt_mode", "head_tail")
+
     words = text.split()
 
     if len(words) <= max_words:
         return text
 
-    # Take roughly the first 60% and last 20% to capture intro and conclusion
+    if mode == "salience":
+        return select_salient_excerpt(text, max_words)
+    if mode != "head_tail":
+        raise ValueError(f"Unknown excerpt mode: {mode}")
+
+    # Take roughly the first 70% and last 30% to capture intro and conclusion
     first_portion = int(max_words * 0.7)
     last_portion = max_words - first_portion
 
@@ -0,0 +1,185 @@
+"""Hedged provider calls using llm.quote_generation.fallback_provider.
+
+The primary provider is started first. If it has not produced a valid
+response within a latency percentile of its own recent calls (or fails
+outright), the fallback provider is started too. The first valid response
+wins and the other process is killed. The result names the provider that
+answered, and every hedged call (one where the fallback was started) is
+recorded as a "hedge" telemetry span under the winner's name.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import NamedTuple
+
+from .config import get_state_dir, load_json, save_json
+from .providers import ProviderCall, ProviderCancelled, call_provider, submit
+from .telemetry import record_span
+
+
+# Number of recent latencies kept per provider
+LATENCY_WINDOW = 50
+
+# How often a hedged call checks its cancel_event
+CANCEL_POLL_SECONDS = 0.2
+
+_latency_lock = threading.Lock()
+
+
+class HedgedResponse(NamedTuple):
+    """A response and the provider that produced it."""
+    provider: str
+    text: str
+
+
+def _get_latency_path() -> Path:
+    return get_state_dir() / "provider_latency.json"
+
+
+def load_latencies() -> dict[str, list[float]]:
+    """Load recent successful call latencies per provider."""
+    path = _get_latency_path()
+    if not path.exists():
+        return {}
+    try:
+        return load_json(path)
+    except (OSError, ValueError):
+        return {}
+
+
+def record_latency(provider: str, seconds: float) -> None:
+    """Record the latency of a successful provider call."""
+    with _latency_lock:
+        latencies = load_latencies()
+        history = latencies.get(provider, [])
+        history.append(round(seconds, 3))
+        latencies[provider] = history[-LATENCY_WINDOW:]
+        try:
+            save_json(_get_latency_path(), latencies)
+        except OSError:
+            pass
+
+
+def get_hedge_delay(provider: str, hedging_config: dict) -> float:
+    """Seconds to wait on a provider before also starting the fallback.
+
+    Uses the configured percentile of the provider's recent latencies, or
+    default_delay_seconds until min_samples calls have been recorded.
+    """
+    default = hedging_config.get("default_delay_seconds", 45)
+    samples = sorted(load_latencies().get(provider, []))
+    if len(samples) < hedging_config.get("min_samples", 5):
+        return default
+
+    percentile = hedging_config.get("latency_percentile", 90)
+    rank = min(len(samples) - 1, max(0, round(percentile / 100 * len(samples)) - 1))
+    return samples[rank]
+
+
+def call_with_fallback(
+    prompt: str,
+    config: dict,
+    provider: str,
+    validate: Callable[[str], bool],
+    cancel_event: threading.Event | None = None
+) -> HedgedResponse:
+    """Call a provider, hedging with the configured fallback provider.
+
+    Args:
+        prompt: Filled prompt
+        config: The "llm" section of settings.json
+        provider: Primary provider
+        validate: Returns True if a response parses well enough to use
+        cancel_event: When set, every launched call is killed and
+            ProviderCancelled raised
+
+    Returns:
+        The first valid response and the provider that gave it. If no
+        response is valid, the primary's (or failing that, the
+        fallback's) response is returned as-is.
+
+    Raises:
+        RuntimeError: If every launched provider failed
+        ProviderCancelled: If cancel_event was set
+    """
+    hedging_config = config.get("hedging", {})
+    fallback = config.get("quote_generation", {}).get("fallback_provider")
+
+    if not hedging_config.get("enabled", True) or not fallback or fallback == provider:
+        start = time.monotonic()
+        response = call_provider(provider, prompt, config, cancel_event=cancel_event)
+        record_latency(provider, time.monotonic() - start)
+        return HedgedResponse(provider, response)
+
+    calls: dict[str, ProviderCall] = {}
+    started: dict[str, float] = {}
+
+    def launch(name: str) -> None:
+        started[name] = time.monotonic()
+        calls[name] = submit(name, prompt, config)
+
+    def hedged(name: str, response: str) -> HedgedResponse:
+        if fallback in calls:
+            record_span("hedge", time.monotonic() - started[provider], provider=name,
+                        output_bytes=len(response.encode("utf-8")))
+        return HedgedResponse(name, response)
+
+    launch(provider)
+    hedge_at = time.monotonic() + get_hedge_delay(provider, hedging_config)
+    errors: dict[str, Exception] = {}
+    invalid: dict[str, str] = {}
+    pending = {calls[provider].future: provider}
+
+    while True:
+        if fallback in calls:
+            wait_for = None
+        else:
+            wait_for = max(0.0, hedge_at - time.monotonic())
+
+        # Wake up periodically to notice cancellation
+        if cancel_event is not None:
+            wait_for = CANCEL_POLL_SECONDS if wait_for is None else min(wait_for, CANCEL_POLL_SECONDS)
+
+        done, _ = wait(list(pending), timeout=wait_for, return_when=FIRST_COMPLETED)
+        if cancel_event is not None and cancel_event.is_set():
+            for call in calls.values():
+                call.cancel()
+            raise ProviderCancelled(provider, "cancelled", f"{provider} CLI call cancelled")
+        if not done and (fallback in calls or time.monotonic() < hedge_at):
+            continue
+        if not done:
+            launch(fallback)
+            pending[calls[fallback].future] = fallback
+            continue
+
+        for future in done:
+            name = pending.pop(future)
+            try:
+                response = calls[name].result()
+            except Exception as e:
+                errors[name] = e
+                continue
+
+            record_latency(name, time.monotonic() - started[name])
+            if validate(response):
+                # Kill the loser and wait for it, so no orphaned CLI outlives us
+                for other, call in calls.items():
+                    if other != name:
+                        call.cancel()
+                return hedged(name, response)
+            invalid[name] = response
+
+        if fallback not in calls:
+            launch(fallback)
+            pending[calls[fallback].future] = fallback
+            continue
+
+        if not pending:
+            # Nothing valid - fall back to the lenient parsers on whatever we have
+            for name in (provider, fallback):
+                if name in invalid:
+                    return hedged(name, invalid[name])
+            raise errors[provider]
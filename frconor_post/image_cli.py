@@ -11,13 +11,25 @@ from .config import (
     load_settings,
 )
 from .fetcher import fetch_transcript
-from .concept_generator import generate_concepts, format_concepts_display
+from .concept_generator import build_concept_prompt, generate_concepts, format_concepts_display
+from .artifacts import format_artifacts_display
 from .image_generator import (
     build_image_prompt_from_concept,
     ensure_output_directory,
     format_image_prompt_display,
     generate_images,
 )
+from .image_jobs import (
+    count_pending_jobs,
+    ensure_worker,
+    format_jobs_display,
+    list_jobs,
+    recover_stale_jobs,
+)
+from .llm_cache import format_cache_stats
+from .prefetch import Prefetcher, get_prefetch_budget
+from .preview import show_preview
+from .tokens import estimate_tokens, get_prompt_budget
 
 
 def print_header():
@@ -112,8 +124,12 @@ def run_workflow(args):
     # Step 4: Generate concepts
     print_section("STEP 3: IMAGE CONCEPTS")
 
+    prompt_tokens = estimate_tokens(build_concept_prompt(quote, themes, style))
+    prompt_budget = get_prompt_budget(llm_provider, settings.get("llm", {}))
+
     try:
         print(f"Generating 3 concepts using {llm_provider}...")
+        print(f"  Estimated prompt size: ~{prompt_tokens} tokens (budget {prompt_budget})")
         concepts = generate_concepts(quote, themes, style, llm_provider)
         print(f"Generated {len(concepts)} concepts")
         print()
@@ -123,6 +139,15 @@ def run_workflow(args):
         print("  You may need to configure the LLM CLI tool.")
         sys.exit(1)
 
+    # Generate the next batch while the user reads this one
+    prefetcher = Prefetcher(
+        lambda cancel_event: generate_concepts(
+            quote, themes, style, llm_provider, use_cache=False, cancel_event=cancel_event
+        ),
+        get_prefetch_budget(settings.get("llm", {}))
+    )
+    prefetcher.start()
+
     # Step 5: User selection
     print()
     selected_concept = None
@@ -131,16 +156,21 @@ def run_workflow(args):
         choice = get_input("Enter concept number (1-3), [r]egenerate, or [q]uit")
 
         if choice.lower() == 'q':
+            prefetcher.cancel()
             print("Cancelled.")
             sys.exit(0)
         elif choice.lower() == 'r':
             print("\nRegenerating concepts...")
-            concepts = generate_concepts(quote, themes, style, llm_provider)
+            concepts = prefetcher.take() or generate_concepts(
+                quote, themes, style, llm_provider, use_cache=False
+            )
             print(format_concepts_display(concepts))
+            prefetcher.start()
         else:
             try:
                 num = int(choice)
                 if 1 <= num <= len(concepts):
+                    prefetcher.cancel()
                     selected_concept = concepts[num - 1]
                     print(f"\nSelected: [{selected_concept.setting}]")
                 else:
@@ -163,9 +193,11 @@ def run_workflow(args):
     if generate.lower() == 'y':
         print()
         print("Generating images via Claude CLI (this may take a minute)...")
-        success = generate_images(image_prompt)
-        if success:
+        artifacts = generate_images(image_prompt)
+        if artifacts:
             print("  Images generated successfully!")
+            print(format_artifacts_display(artifacts))
+            show_preview(artifacts)
         else:
             print("  Image generation failed. You can generate manually later.")
     else:
@@ -174,10 +206,40 @@ def run_workflow(args):
         print("To generate later, copy the prompt above and run:")
         print(f"  claude -p \"Generate {image_prompt.n} images with: [prompt]\"")
 
+    cache_stats = format_cache_stats()
+    if cache_stats:
+        print()
+        print(cache_stats)
+
     print()
     print("Done!")
 
 
+def show_jobs():
+    """List recent image jobs and offer to resume pending ones."""
+    print_header()
+    recovered = recover_stale_jobs()
+    if recovered:
+        print(f"Requeued {recovered} interrupted job(s).")
+        print()
+
+    print(format_jobs_display(list_jobs()))
+
+    pending = count_pending_jobs()
+    if not pending:
+        return
+
+    print()
+    resume = get_input(f"Resume {pending} pending job(s)? [y/n]", "y")
+    if resume.lower() != 'y':
+        return
+
+    print()
+    ensure_worker().join()
+    print()
+    print(format_jobs_display(list_jobs()))
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -189,6 +251,7 @@ Examples:
   frcmed-image -q "..." -t https://...
   frcmed-image -q "..." -s hopper
   frcmed-image -q "..." -l claude
+  frcmed-image --jobs                  # Show or resume queued image jobs
         """
     )
 
@@ -201,8 +264,7 @@ Examples:
     parser.add_argument(
         "-q", "--quote",
         metavar="TEXT",
-        required=True,
-        help="Quote to visualize (required)"
+        help="Quote to visualize (required unless --jobs)"
     )
 
     parser.add_argument(
@@ -224,8 +286,20 @@ Examples:
         help="LLM provider for concept generation"
     )
 
+    parser.add_argument(
+        "--jobs",
+        action="store_true",
+        help="Show queued image jobs and resume any that are pending"
+    )
+
     args = parser.parse_args()
-    run_workflow(args)
+
+    if args.jobs:
+        show_jobs()
+    elif not args.quote:
+        parser.error("the following arguments are required: -q/--quote")
+    else:
+        run_workflow(args)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,5 @@
 """Image generation module - constructs prompts for nano-banana MCP."""
 
-import subprocess
 from pathlib import Path
 from typing import NamedTuple
 
@@ -10,6 +9,8 @@ from .config import (
     load_settings,
     get_art_style_by_id,
 )
+from .artifacts import ImageArtifact
+from .image_jobs import format_batch_summary, submit_images
 
 
 class ImagePrompt(NamedTuple):
@@ -155,7 +156,7 @@ def build_comic_prompt(
     concept,  # ComicConcept from comic_generator
     style: dict
 ) -> ImagePrompt:
-    """Build a 4-panel comic strip image prompt from a concept and style.
+    """Build a comic strip image prompt from a concept and style.
 
     Args:
         concept: The selected ComicConcept object (from comic_generator)
@@ -175,31 +176,37 @@ def build_comic_prompt(
     composition = prompt_elements.get("composition", "")
     technique = prompt_elements.get("technique", "")
 
-    # Build the prompt for 4-panel comic with dialogue
+    # Up to 4 panels fit one horizontal strip; longer strips use two rows
+    panel_count = len(concept.panels)
+    if panel_count <= 4:
+        strip = "horizontal comic strip"
+        layout = "single horizontal strip layout"
+        reading_order = "left to right"
+        aspect_ratio = "21:9"  # Wide aspect ratio for a one-row strip
+    else:
+        strip = "comic strip"
+        layout = f"grid of two rows of {(panel_count + 1) // 2}"
+        reading_order = "left to right, top row first"
+        aspect_ratio = "16:9"
+
+    # Build the prompt for the comic with dialogue
     prompt_parts = [
-        f"Create a 4-panel horizontal comic strip {style_desc}.",
+        f"Create a {panel_count}-panel {strip} {style_desc}.",
         "",
         f"Comic Title: {concept.title}",
         f"Narrative Arc: {concept.arc}",
         "",
-        "Panel Layout (left to right) with DIALOGUE:",
-        "",
-        f"PANEL 1:",
-        f"  Scene: {concept.panel_1}",
-        f"  Text: {concept.dialogue_1}",
-        "",
-        f"PANEL 2:",
-        f"  Scene: {concept.panel_2}",
-        f"  Text: {concept.dialogue_2}",
-        "",
-        f"PANEL 3:",
-        f"  Scene: {concept.panel_3}",
-        f"  Text: {concept.dialogue_3}",
-        "",
-        f"PANEL 4:",
-        f"  Scene: {concept.panel_4}",
-        f"  Text: {concept.dialogue_4}",
+        f"Panel Layout ({reading_order}) with DIALOGUE:",
         "",
+    ]
+    for n, (panel, dialogue) in enumerate(zip(concept.panels, concept.dialogues), 1):
+        prompt_parts.extend([
+            f"PANEL {n}:",
+            f"  Scene: {panel}",
+            f"  Text: {dialogue}",
+            "",
+        ])
+    prompt_parts += [
         "Comic Text Elements:",
         "- SPEECH balloons: oval with tail pointing to speaker",
         "- THOUGHT balloons: cloud-like with bubble trail",
@@ -219,7 +226,7 @@ def build_comic_prompt(
         "- Characters grounded in their environment, not floating in empty space",
         "",
         "Technical Requirements:",
-        "- 4 panels in a single horizontal strip layout",
+        f"- {panel_count} panels in a {layout}",
         "- Clear panel borders/gutters between panels",
         "- Consistent character design across all panels",
         "- 1-3 human figures as subjects",
@@ -235,7 +242,7 @@ def build_comic_prompt(
         style_name=style.get("name", "Unknown"),
         model_tier=image_config.get("model_tier", "pro"),
         resolution=image_config.get("resolution", "high"),
-        aspect_ratio="21:9",  # Wide aspect ratio for 4-panel strip
+        aspect_ratio=aspect_ratio,
         n=image_config.get("variations_count", 3)
     )
 
@@ -276,46 +283,29 @@ Prompt:
 """
 
 
-def generate_images(image_prompt: ImagePrompt) -> bool:
-    """Generate images using Claude CLI with nano-banana MCP.
+def generate_images(image_prompt: ImagePrompt) -> list[ImageArtifact]:
+    """Generate images using Claude CLI with nano-banana MCP, and wait for them.
+
+    The request goes through the persistent job queue (see image_jobs), so
+    failed calls are retried with backoff and interrupted ones can be
+    resumed with `frcmed-image --jobs`. With image_generation.fan_out,
+    each variation is its own job and up to
+    image_generation.max_concurrency run at once.
 
     Args:
         image_prompt: The ImagePrompt containing prompt and generation settings
 
     Returns:
-        True if generation succeeded, False otherwise
+        The generated image files, by variation (empty if generation failed
+        or no new files appeared in the output directory)
     """
-    # Build the Claude prompt that will invoke nano-banana
-    claude_prompt = f"""Generate {image_prompt.n} images with these settings:
-- Aspect ratio: {image_prompt.aspect_ratio}
-- Model tier: {image_prompt.model_tier}
-- Resolution: {image_prompt.resolution}
-
-Prompt:
-{image_prompt.prompt}"""
-
-    try:
-        # Call claude -p with the prompt
-        # Use longer timeout for image generation (5 minutes)
-        result = subprocess.run(
-            ["claude", "-p", claude_prompt],
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
-
-        if result.returncode != 0:
-            print(f"  Error: {result.stderr}")
-            return False
-
-        return True
-
-    except FileNotFoundError:
-        print("  Error: Claude CLI not found. Make sure 'claude' is in your PATH.")
-        return False
-    except subprocess.TimeoutExpired:
-        print("  Error: Image generation timed out (5 min limit).")
-        return False
-    except Exception as e:
-        print(f"  Error: {e}")
-        return False
+    batch = submit_images(image_prompt)
+    jobs = batch.wait()
+    summary = format_batch_summary(jobs)
+    if summary:
+        print(summary)
+
+    artifacts = batch.artifacts()
+    if not artifacts and any(job.status == "done" for job in jobs):
+        print(f"  No new images found in {get_output_dir()}")
+    return artifacts
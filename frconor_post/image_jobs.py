@@ -0,0 +1,543 @@
+"""Persistent image generation job queue.
+
+Image generation requests are stored as jobs in state/image_jobs.sqlite3
+(prompt, style, aspect ratio, status, attempts), then run by a background
+worker: up to image_generation.max_concurrency Claude calls at once, with
+failed jobs retried image_generation.retry_attempts times after an
+exponential backoff. A run's worker only runs the batches that run
+queued. Because the queue is on disk, jobs interrupted by a timeout,
+Ctrl-C or a crash are not lost: `frcmed-image --jobs` lists them and
+resumes whatever is still pending. The files a finished job wrote are
+recorded in the artifact index (see artifacts).
+"""
+
+import os
+import secrets
+import sqlite3
+import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import closing
+from pathlib import Path
+from typing import NamedTuple
+
+from .artifacts import (
+    ImageArtifact,
+    OutputWatcher,
+    list_artifacts,
+    record_artifacts,
+    variation_from_name,
+)
+from .cassette import record_interaction
+from .config import get_state_dir, load_settings
+from .telemetry import span
+
+
+# Seconds a single Claude image call may take
+IMAGE_TIMEOUT = 300
+
+# Longest the worker sleeps before looking at the queue again
+POLL_SECONDS = 1.0
+
+JOB_COLUMNS = (
+    "id", "batch_id", "variation", "prompt", "style_id", "style_name", "aspect_ratio",
+    "model_tier", "resolution", "status", "attempts", "max_attempts", "next_attempt_at",
+    "error", "seconds", "created_at", "updated_at",
+)
+
+
+class ImageJob(NamedTuple):
+    """One queued image generation call."""
+    id: int
+    batch_id: str  # Jobs enqueued together (one image prompt)
+    variation: int  # Variation number (0: all variations in one call)
+    prompt: str  # The Claude prompt
+    style_id: str
+    style_name: str
+    aspect_ratio: str
+    model_tier: str
+    resolution: str
+    status: str  # "pending", "running", "done" or "failed"
+    attempts: int
+    max_attempts: int
+    next_attempt_at: float
+    error: str
+    seconds: float | None
+    created_at: float
+    updated_at: float
+
+
+class JobResult(NamedTuple):
+    """Outcome of one attempt at a job."""
+    ok: bool
+    seconds: float
+    error: str
+
+
+def get_jobs_db_path() -> Path:
+    """Get the path to the image job queue database."""
+    return get_state_dir() / "image_jobs.sqlite3"
+
+
+def _connect() -> sqlite3.Connection:
+    path = get_jobs_db_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            batch_id TEXT NOT NULL,
+            variation INTEGER NOT NULL,
+            prompt TEXT NOT NULL,
+            style_id TEXT NOT NULL,
+            style_name TEXT NOT NULL,
+            aspect_ratio TEXT NOT NULL,
+            model_tier TEXT NOT NULL,
+            resolution TEXT NOT NULL,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL,
+            next_attempt_at REAL NOT NULL,
+            error TEXT NOT NULL DEFAULT '',
+            seconds REAL,
+            worker_pid INTEGER,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, next_attempt_at)")
+    return conn
+
+
+def build_claude_image_prompt(image_prompt, variation: int = 0) -> str:
+    """The Claude prompt that invokes nano-banana: all variations, or just one.
+
+    Args:
+        image_prompt: ImagePrompt from image_generator
+        variation: Variation number, or 0 to ask for all image_prompt.n images
+    """
+    if variation:
+        header = f"Generate 1 image (variation {variation} of {image_prompt.n}) with these settings:"
+        filename = f"\n- File name: {variation_filename(variation)}"
+    else:
+        header = f"Generate {image_prompt.n} images with these settings:"
+        filename = ""
+
+    return f"""{header}
+- Aspect ratio: {image_prompt.aspect_ratio}
+- Model tier: {image_prompt.model_tier}
+- Resolution: {image_prompt.resolution}{filename}
+
+Prompt:
+{image_prompt.prompt}"""
+
+
+def variation_filename(variation: int) -> str:
+    """File name a single-variation job asks the generator to use."""
+    return f"variation_{variation}.png"
+
+
+def get_image_command(settings: dict) -> str:
+    """CLI that runs image jobs: image_generation.command, else the Claude provider's command.
+
+    Either can point at a stand-in (frcmed-image-standin, frcmed-replay).
+    """
+    command = settings.get("image_generation", {}).get("command")
+    if command:
+        return command
+    return settings.get("llm", {}).get("providers", {}).get("claude", {}).get("command", "claude")
+
+
+def run_image_job(job: ImageJob, settings: dict) -> JobResult:
+    """Run one attempt at a job (one Claude call); errors are returned, not raised."""
+    llm_config = settings.get("llm", {})
+    command = get_image_command(settings)
+    start = time.monotonic()
+
+    def failed(error: str) -> JobResult:
+        return JobResult(False, time.monotonic() - start, error)
+
+    try:
+        with span("image", provider="claude", model=job.model_tier,
+                  prompt_bytes=len(job.prompt.encode("utf-8"))) as fields:
+            result = subprocess.run(
+                [command, "-p", job.prompt],
+                capture_output=True,
+                text=True,
+                timeout=IMAGE_TIMEOUT
+            )
+            fields.update(exit_code=result.returncode, output_bytes=len(result.stdout.encode("utf-8")))
+        seconds = time.monotonic() - start
+        record_interaction(llm_config, "claude-image", job.prompt,
+                           [(seconds, result.stdout)] if result.stdout else [],
+                           result.stderr, result.returncode, seconds)
+
+        if result.returncode != 0:
+            return failed(result.stderr.strip() or f"exit status {result.returncode}")
+
+        return JobResult(True, seconds, "")
+
+    except FileNotFoundError:
+        return failed(f"{command} not found. Make sure 'claude' is in your PATH.")
+    except subprocess.TimeoutExpired:
+        return failed(f"Image generation timed out ({IMAGE_TIMEOUT // 60} min limit).")
+    except Exception as e:
+        return failed(str(e))
+
+
+def enqueue_images(image_prompt, settings: dict | None = None) -> str:
+    """Add the jobs for one image prompt to the queue.
+
+    With image_generation.fan_out, each variation is its own job;
+    otherwise one job asks for all of them.
+
+    Args:
+        image_prompt: ImagePrompt from image_generator
+
+    Returns:
+        The batch ID shared by the new jobs
+    """
+    if settings is None:
+        settings = load_settings()
+    image_config = settings.get("image_generation", {})
+
+    if image_config.get("fan_out", False) and image_prompt.n > 1:
+        variations = list(range(1, image_prompt.n + 1))
+    else:
+        variations = [0]
+
+    batch_id = time.strftime("%Y%m%d-%H%M%S-") + secrets.token_hex(2)
+    max_attempts = 1 + max(0, image_config.get("retry_attempts", 2))
+    now = time.time()
+
+    with closing(_connect()) as conn, conn:
+        conn.executemany(
+            "INSERT INTO jobs (batch_id, variation, prompt, style_id, style_name, aspect_ratio, "
+            "model_tier, resolution, status, max_attempts, next_attempt_at, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'pending', ?, ?, ?, ?)",
+            [
+                (batch_id, variation, build_claude_image_prompt(image_prompt, variation),
+                 image_prompt.style_id, image_prompt.style_name, image_prompt.aspect_ratio,
+                 image_prompt.model_tier, image_prompt.resolution, max_attempts, now, now, now)
+                for variation in variations
+            ]
+        )
+    return batch_id
+
+
+def list_jobs(batch_id: str | None = None, limit: int = 30) -> list[ImageJob]:
+    """Jobs of one batch, or the most recent jobs, oldest first."""
+    query = f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs"
+    params: tuple = ()
+    if batch_id is not None:
+        query += " WHERE batch_id = ?"
+        params = (batch_id,)
+    query += " ORDER BY id DESC LIMIT ?"
+    with closing(_connect()) as conn:
+        rows = conn.execute(query, params + (limit,)).fetchall()
+    return [ImageJob(*row) for row in reversed(rows)]
+
+
+def _batch_filter(batch_ids: frozenset[str] | None) -> tuple[str, tuple]:
+    """SQL condition (prefixed with AND) limiting a query to some batches; none for all."""
+    if batch_ids is None:
+        return "", ()
+    return f" AND batch_id IN ({', '.join('?' * len(batch_ids))})", tuple(batch_ids)
+
+
+def count_pending_jobs() -> int:
+    """Number of jobs still waiting to run (including retries in backoff)."""
+    with closing(_connect()) as conn:
+        return conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'pending'").fetchone()[0]
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def recover_stale_jobs() -> int:
+    """Requeue jobs left "running" by a process that no longer exists.
+
+    Happens when a run is interrupted (Ctrl-C, crash) mid-job. The
+    interrupted attempt is not counted.
+
+    Returns:
+        Number of jobs requeued
+    """
+    with closing(_connect()) as conn, conn:
+        rows = conn.execute("SELECT id, worker_pid FROM jobs WHERE status = 'running'").fetchall()
+        stale = [(job_id,) for job_id, pid in rows if pid is None or not _pid_alive(pid)]
+        conn.executemany(
+            "UPDATE jobs SET status = 'pending', attempts = MAX(attempts - 1, 0), "
+            "worker_pid = NULL, next_attempt_at = 0 WHERE id = ?",
+            stale
+        )
+    return len(stale)
+
+
+def _claim_job(batch_ids: frozenset[str] | None = None) -> ImageJob | None:
+    """Mark the next due pending job (of the given batches, or any) as running and return it."""
+    now = time.time()
+    condition, params = _batch_filter(batch_ids)
+    with closing(_connect()) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            "SELECT id FROM jobs WHERE status = 'pending' AND next_attempt_at <= ?" + condition +
+            " ORDER BY next_attempt_at, id LIMIT 1",
+            (now,) + params
+        ).fetchone()
+        if row is None:
+            conn.rollback()
+            return None
+        conn.execute(
+            "UPDATE jobs SET status = 'running', attempts = attempts + 1, worker_pid = ?, "
+            "updated_at = ? WHERE id = ?",
+            (os.getpid(), now, row[0])
+        )
+        job = conn.execute(
+            f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = ?", (row[0],)
+        ).fetchone()
+        conn.commit()
+    return ImageJob(*job)
+
+
+def _seconds_until_next_job(batch_ids: frozenset[str] | None = None) -> float | None:
+    """Seconds until a pending job is due (0 if one is due now), or None if none are pending."""
+    condition, params = _batch_filter(batch_ids)
+    with closing(_connect()) as conn:
+        row = conn.execute(
+            "SELECT MIN(next_attempt_at) FROM jobs WHERE status = 'pending'" + condition, params
+        ).fetchone()
+    if row[0] is None:
+        return None
+    return max(0.0, row[0] - time.time())
+
+
+def _finish_job(job: ImageJob, result: JobResult, backoff_seconds: float) -> str:
+    """Record an attempt's outcome; schedules a retry with backoff if attempts remain.
+
+    Returns:
+        The job's new status
+    """
+    now = time.time()
+    if result.ok:
+        status, next_attempt_at = "done", job.next_attempt_at
+    elif job.attempts < job.max_attempts:
+        status = "pending"
+        next_attempt_at = now + backoff_seconds * 2 ** (job.attempts - 1)
+    else:
+        status, next_attempt_at = "failed", job.next_attempt_at
+
+    with closing(_connect()) as conn, conn:
+        conn.execute(
+            "UPDATE jobs SET status = ?, next_attempt_at = ?, error = ?, seconds = ?, "
+            "worker_pid = NULL, updated_at = ? WHERE id = ?",
+            (status, next_attempt_at, result.error, result.seconds, now, job.id)
+        )
+    return status
+
+
+def _record_job_files(job: ImageJob, watcher: OutputWatcher, seconds: float) -> list[ImageArtifact]:
+    """Index the files a finished job wrote to the output directory. Never raises."""
+    expected = variation_filename(job.variation) if job.variation else None
+    paths = watcher.new_files(expected)
+    if job.variation:
+        # Jobs of the same batch run side by side: leave their files to them
+        paths = [path for path in paths if variation_from_name(path) in (None, job.variation)]
+    try:
+        return record_artifacts(paths, job.id, job.batch_id, job.variation, seconds)
+    except sqlite3.Error:
+        return []
+
+
+def _job_label(job: ImageJob, total: int) -> str:
+    if job.variation:
+        return f"Variation {job.variation}/{total}"
+    return "Images"
+
+
+class ImageWorker:
+    """Runs queued jobs on a background thread until none are left, then stops.
+
+    Only runs jobs of the batches it was given (batch_ids), so jobs left
+    over from earlier runs wait for `frcmed-image --jobs`; a worker with
+    batch_ids None runs every pending job. Runs up to max_concurrency jobs
+    at once, and keeps waiting while retries are in backoff. Progress is
+    printed as each attempt finishes.
+    """
+
+    def __init__(self, settings: dict, batch_ids: frozenset[str] | None = None):
+        image_config = settings.get("image_generation", {})
+        self._settings = settings
+        self._max_concurrency = max(1, image_config.get("max_concurrency", 3))
+        self._backoff_seconds = image_config.get("retry_backoff_seconds", 5)
+        self._print_lock = threading.Lock()
+        self._stopping = False
+        # Replaced (never mutated) under _worker_lock, so the worker thread can read it any time
+        self.batch_ids = batch_ids
+        # Notified whenever a job attempt finishes
+        self.progress = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive() and not self._stopping
+
+    def join(self, timeout: float | None = None) -> None:
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        running: set[Future] = set()
+
+        with ThreadPoolExecutor(max_workers=self._max_concurrency) as executor:
+            while True:
+                while len(running) < self._max_concurrency:
+                    job = _claim_job(self.batch_ids)
+                    if job is None:
+                        break
+                    running.add(executor.submit(self._attempt, job))
+
+                if running:
+                    _, running = wait(running, timeout=POLL_SECONDS, return_when=FIRST_COMPLETED)
+                    continue
+
+                # Decided under the lock so submit_images never hands jobs
+                # to a worker that is about to stop
+                with _worker_lock:
+                    delay = _seconds_until_next_job(self.batch_ids)
+                    if delay is None:
+                        self._stopping = True
+                        with self.progress:
+                            self.progress.notify_all()
+                        return
+                time.sleep(min(delay, POLL_SECONDS))
+
+    def _attempt(self, job: ImageJob) -> None:
+        watcher = OutputWatcher()
+        result = run_image_job(job, self._settings)
+        # Files are indexed before the job is marked done, so a batch seen
+        # as finished always has its artifacts
+        artifacts = _record_job_files(job, watcher, result.seconds) if result.ok else []
+        status = _finish_job(job, result, self._backoff_seconds)
+        total = len(list_jobs(job.batch_id)) if job.variation else 1
+
+        with self._print_lock:
+            label = _job_label(job, total)
+            if status == "done":
+                files = ", ".join(Path(artifact.path).name for artifact in artifacts)
+                print(f"  {label} done ({result.seconds:.0f}s){': ' + files if files else ''}")
+            elif status == "pending":
+                delay = self._backoff_seconds * 2 ** (job.attempts - 1)
+                print(f"  {label} failed (attempt {job.attempts}/{job.max_attempts}), "
+                      f"retrying in {delay:.0f}s: {result.error}")
+            else:
+                print(f"  {label} failed after {job.attempts} attempt(s): {result.error}")
+
+        with self.progress:
+            self.progress.notify_all()
+
+
+_worker_lock = threading.Lock()
+_worker: ImageWorker | None = None
+
+
+def ensure_worker(settings: dict | None = None, batch_id: str | None = None) -> ImageWorker:
+    """The running background worker, starting one if needed.
+
+    Args:
+        settings: Settings for a new worker (default: settings.json)
+        batch_id: Batch the worker should run. If None, the worker runs
+            every pending job (resuming earlier runs' jobs).
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = ImageWorker(
+                settings if settings is not None else load_settings(),
+                None if batch_id is None else frozenset([batch_id])
+            )
+            _worker.start()
+        elif batch_id is None:
+            _worker.batch_ids = None
+        elif _worker.batch_ids is not None:
+            _worker.batch_ids = _worker.batch_ids | {batch_id}
+        return _worker
+
+
+class ImageBatch(NamedTuple):
+    """Handle on the jobs for one image prompt."""
+    batch_id: str
+    worker: ImageWorker
+
+    def wait(self) -> list[ImageJob]:
+        """Wait until every job of this batch is done or failed, and return them.
+
+        Jobs of other batches may still be running afterwards.
+        """
+        with self.worker.progress:
+            while True:
+                jobs = list_jobs(self.batch_id)
+                if all(job.status in ("done", "failed") for job in jobs) or not self.worker.is_alive():
+                    return jobs
+                self.worker.progress.wait(POLL_SECONDS)
+
+    def jobs(self) -> list[ImageJob]:
+        """This batch's jobs as they are now."""
+        return list_jobs(self.batch_id)
+
+    def artifacts(self) -> list[ImageArtifact]:
+        """Image files this batch's finished jobs produced, by variation."""
+        return list_artifacts(self.batch_id)
+
+
+def submit_images(image_prompt, settings: dict | None = None) -> ImageBatch:
+    """Queue an image prompt's jobs and make sure a worker is running them.
+
+    Args:
+        image_prompt: ImagePrompt from image_generator
+
+    Returns:
+        An ImageBatch to check on or wait for
+    """
+    if settings is None:
+        settings = load_settings()
+    batch_id = enqueue_images(image_prompt, settings)
+    return ImageBatch(batch_id, ensure_worker(settings, batch_id))
+
+
+def format_batch_summary(jobs: list[ImageJob]) -> str:
+    """How many of a fan-out batch's variations were generated ("" for a single job)."""
+    if len(jobs) <= 1:
+        return ""
+    done = sum(1 for job in jobs if job.status == "done")
+    return f"  {done} of {len(jobs)} variations generated"
+
+
+def format_jobs_display(jobs: list[ImageJob]) -> str:
+    """Format queued jobs for display (frcmed-image --jobs)."""
+    if not jobs:
+        return "No image jobs yet."
+
+    lines = [
+        f"{'ID':>5}  {'Batch':20} {'Var':>3}  {'Style':18} {'Status':8} {'Tries':>5}  Error",
+        "─" * 80,
+    ]
+    for job in jobs:
+        tries = f"{job.attempts}/{job.max_attempts}"
+        error = job.error.splitlines()[0][:40] if job.error and job.status != "done" else ""
+        lines.append(
+            f"{job.id:>5}  {job.batch_id:20} {job.variation or '-':>3}  {job.style_name[:18]:18} "
+            f"{job.status:8} {tries:>5}  {error}"
+        )
+    return "\n".join(lines)
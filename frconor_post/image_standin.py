@@ -0,0 +1,88 @@
+"""Stand-in for the Claude + nano-banana image CLI, for local testing.
+
+frcmed-image-standin takes the same `-p PROMPT` as `claude -p`, waits
+like a real generation would, and writes solid-colour PNGs to the output
+directory (output.image_directory): the file named in the prompt
+("File name: variation_2.png"), or variation_1..N for a prompt asking for
+N images. Point image_generation.command at it to exercise the job queue
+without generating real images.
+
+Environment:
+    FRCMED_STANDIN_SECONDS: Seconds per call (default 2)
+    FRCMED_STANDIN_FAIL_RATE: Chance (0-1) that a call fails, to exercise retries
+    FRCMED_STANDIN_OUTPUT: Directory to write to instead of the output directory
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import re
+import struct
+import sys
+import time
+import zlib
+from pathlib import Path
+
+from .config import get_output_dir
+
+
+# Width of the generated images; height follows the prompt's aspect ratio
+IMAGE_WIDTH = 320
+
+
+def write_png(path: Path, width: int, height: int, rgb: tuple[int, int, int]) -> None:
+    """Write a solid-colour RGB PNG."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    row = b"\x00" + bytes(rgb) * width
+    png = (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(row * height))
+        + chunk(b"IEND", b"")
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(png)
+
+
+def plan_images(prompt: str) -> tuple[list[str], int, int]:
+    """File names and size of the images a prompt asks for."""
+    named = re.search(r"File name:\s*(\S+)", prompt)
+    if named:
+        filenames = [named.group(1)]
+    else:
+        count = re.search(r"Generate (\d+) images?", prompt)
+        filenames = [f"variation_{n}.png" for n in range(1, int(count.group(1) if count else 1) + 1)]
+
+    ratio = re.search(r"Aspect ratio:\s*(\d+):(\d+)", prompt)
+    width = IMAGE_WIDTH
+    height = round(width * int(ratio.group(2)) / int(ratio.group(1))) if ratio else width
+    return filenames, width, max(1, height)
+
+
+def main() -> None:
+    """Entry point for frcmed-image-standin."""
+    parser = argparse.ArgumentParser(description="Stand-in image generation CLI for testing")
+    parser.add_argument("-p", "--prompt", required=True, help="Image generation prompt")
+    args, _ = parser.parse_known_args()
+
+    time.sleep(float(os.environ.get("FRCMED_STANDIN_SECONDS", "2")))
+    if random.random() < float(os.environ.get("FRCMED_STANDIN_FAIL_RATE", "0")):
+        sys.stderr.write("stand-in: simulated generation failure\n")
+        sys.exit(1)
+
+    output_dir = Path(os.environ.get("FRCMED_STANDIN_OUTPUT") or get_output_dir()).expanduser()
+    filenames, width, height = plan_images(args.prompt)
+    digest = hashlib.sha256(args.prompt.encode("utf-8")).digest()
+
+    for i, filename in enumerate(filenames):
+        path = output_dir / filename
+        write_png(path, width, height, (digest[3 * i % 30], digest[3 * i % 30 + 1], digest[3 * i % 30 + 2]))
+        print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Content-addressed cache of LLM provider responses.
+
+Responses are keyed by hash(provider, model, filled prompt) and stored in
+SQLite at cache/llm_responses.sqlite3. Entries expire after a TTL and the
+store is kept within an entry/byte limit by evicting the least recently
+used entries.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from contextlib import closing
+from pathlib import Path
+from typing import NamedTuple
+
+from .config import get_cache_path, load_settings
+
+
+class CacheStats(NamedTuple):
+    """Response cache counters for this process."""
+    hits: int
+    misses: int
+    bypassed: int
+
+
+_stats = {"hits": 0, "misses": 0, "bypassed": 0}
+_stats_lock = threading.Lock()
+
+
+def get_llm_cache_path() -> Path:
+    """Get the path to the response cache database."""
+    return get_cache_path() / "llm_responses.sqlite3"
+
+
+def get_provider_model(provider: str, llm_config: dict) -> str | None:
+    """Get the model a provider call will use (None for the CLI default)."""
+    if provider == "gemini":
+        return llm_config.get("quote_generation", {}).get("model", "gemini-2.5-pro")
+    return llm_config.get("providers", {}).get(provider, {}).get("default_model")
+
+
+def cache_key(provider: str, model: str | None, prompt: str) -> str:
+    """Content address of a provider call."""
+    material = f"{provider}\0{model or ''}\0{prompt}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _get_cache_config() -> dict:
+    return load_settings().get("llm", {}).get("response_cache", {})
+
+
+def _connect() -> sqlite3.Connection:
+    path = get_llm_cache_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            provider TEXT NOT NULL,
+            model TEXT,
+            response TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            last_access REAL NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+    return conn
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def get_cached_response(provider: str, model: str | None, prompt: str) -> str | None:
+    """Look up a cached response, or None on a miss or expired entry.
+
+    Counts towards the hit/miss counters.
+    """
+    config = _get_cache_config()
+    if not config.get("enabled", True):
+        return None
+
+    key = cache_key(provider, model, prompt)
+    now = time.time()
+    ttl = config.get("ttl_hours", 168) * 3600
+
+    response = None
+    try:
+        with closing(_connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                if now - row[1] > ttl:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                else:
+                    conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                    response = row[0]
+    except sqlite3.Error:
+        pass
+
+    _count("hits" if response is not None else "misses")
+    return response
+
+
+def store_response(provider: str, model: str | None, prompt: str, response: str) -> None:
+    """Store a response and evict expired / least recently used entries."""
+    config = _get_cache_config()
+    if not config.get("enabled", True):
+        return
+
+    key = cache_key(provider, model, prompt)
+    now = time.time()
+    ttl = config.get("ttl_hours", 168) * 3600
+    max_entries = config.get("max_entries", 500)
+    max_bytes = config.get("max_bytes", 20_000_000)
+
+    try:
+        with closing(_connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, provider, model, response, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, model, response, len(response.encode("utf-8")), now, now)
+            )
+            conn.execute("DELETE FROM responses WHERE created_at < ?", (now - ttl,))
+
+            # LRU eviction down to the entry and byte limits
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            if count > max_entries or total > max_bytes:
+                rows = conn.execute(
+                    "SELECT key, size FROM responses ORDER BY last_access ASC"
+                ).fetchall()
+                evict = []
+                for old_key, size in rows:
+                    if count <= max_entries and total <= max_bytes:
+                        break
+                    if old_key == key:
+                        continue
+                    evict.append((old_key,))
+                    count -= 1
+                    total -= size
+                conn.executemany("DELETE FROM responses WHERE key = ?", evict)
+    except sqlite3.Error:
+        pass  # The cache is an optimisation; never fail a generation over it
+
+
+def list_cached_responses(containing: str | None = None) -> list[str]:
+    """All cached responses (optionally only those containing some text).
+
+    Used to replay recorded responses, e.g. for parser benchmarks.
+    """
+    query = "SELECT response FROM responses"
+    params: tuple = ()
+    if containing is not None:
+        query += " WHERE instr(response, ?) > 0"
+        params = (containing,)
+    query += " ORDER BY created_at"
+    try:
+        with closing(_connect()) as conn:
+            return [row[0] for row in conn.execute(query, params)]
+    except sqlite3.Error:
+        return []
+
+
+def cached_call(
+    provider: str,
+    model: str | None,
+    prompt: str,
+    call: Callable[[], tuple[str, str]],
+    bypass: bool = False,
+    validate: Callable[[str], bool] | None = None
+) -> tuple[str, str]:
+    """Return a cached response for this prompt, or make the call and cache it.
+
+    Args:
+        provider: Provider name (part of the cache key)
+        model: Model name (part of the cache key)
+        prompt: Filled prompt (part of the cache key)
+        call: Makes the real provider call; returns (provider that
+            answered, response). A response from another provider (a
+            hedging fallback) is stored under both its own key and the
+            requested one, so the same request is a hit next time.
+        bypass: Skip the lookup (e.g. on regenerate); the fresh response
+            still replaces the cached one
+        validate: Returns True if a response is good enough to keep. Fresh
+            responses that fail it are returned but not cached, and cached
+            ones that fail it are treated as a miss.
+
+    Returns:
+        (provider that answered, response)
+    """
+    if bypass:
+        _count("bypassed")
+    else:
+        response = get_cached_response(provider, model, prompt)
+        if response is not None and (validate is None or validate(response)):
+            return provider, response
+
+    answered_by, response = call()
+    if validate is None or validate(response):
+        store_response(provider, model, prompt, response)
+        if answered_by != provider:
+            answered_model = get_provider_model(answered_by, load_settings().get("llm", {}))
+            store_response(answered_by, answered_model, prompt, response)
+    return answered_by, response
+
+
+def get_cache_stats() -> CacheStats:
+    """Get this process's cache hit/miss counters."""
+    with _stats_lock:
+        return CacheStats(**_stats)
+
+
+def format_cache_stats() -> str:
+    """Format cache counters for display (empty if the cache was unused)."""
+    stats = get_cache_stats()
+    if not any(stats):
+        return ""
+    return (f"LLM response cache: {stats.hits} hit(s), {stats.misses} miss(es), "
+            f"{stats.bypassed} bypassed")
@@ -5,6 +5,7 @@ import subprocess
 from datetime import datetime
 from pathlib import Path
 
+from .artifacts import assign_post
 from .composer import Post, format_post_text
 from .config import (
     advance_art_style_rotation,
@@ -14,6 +15,7 @@ from .config import (
     save_history,
     save_state,
 )
+from .export import export_image, format_export_summary
 
 
 def copy_to_clipboard(text: str) -> bool:
@@ -49,10 +51,10 @@ def copy_to_clipboard(text: str) -> bool:
 
 
 def save_final_image(source_path: str | Path, output_dir: Path) -> Path:
-    """Copy the selected image to final_post.png in output directory.
+    """Copy the selected image to final_post.<ext> in output directory.
 
     Args:
-        source_path: Path to the selected variation image
+        source_path: Path to the selected variation image (or its WhatsApp export)
         output_dir: Output directory for today's images
 
     Returns:
@@ -63,7 +65,7 @@ def save_final_image(source_path: str | Path, output_dir: Path) -> Path:
         raise FileNotFoundError(f"Source image not found: {source}")
 
     output_dir.mkdir(parents=True, exist_ok=True)
-    dest = output_dir / "final_post.png"
+    dest = output_dir / f"final_post{source.suffix or '.png'}"
 
     shutil.copy2(source, dest)
     return dest
@@ -153,7 +155,8 @@ def finalize_post(
     style_id: str,
     style_name: str,
     image_prompt: str | None = None,
-    advance_rotation: bool = True
+    advance_rotation: bool = True,
+    image_batch_id: str | None = None
 ) -> dict:
     """Finalize a post - save image, copy to clipboard, log to history.
 
@@ -165,6 +168,8 @@ def finalize_post(
         style_name: Art style name
         image_prompt: The image generation prompt
         advance_rotation: Whether to advance the art style rotation
+        image_batch_id: Image job batch generated for the post; its files
+            are indexed under the new post ID
 
     Returns:
         Dict with finalization results
@@ -173,16 +178,25 @@ def finalize_post(
     results = {
         "success": True,
         "image_saved": None,
+        "image_export": None,
         "clipboard_copied": False,
         "history_logged": None,
         "finder_opened": False,
         "errors": []
     }
 
-    # Save final image
+    # Save final image, exported at WhatsApp size when output.export allows
     if selected_image_path:
+        export = None
         try:
-            final_path = save_final_image(selected_image_path, output_dir)
+            export = export_image(Path(selected_image_path))
+        except Exception as e:
+            results["errors"].append(f"Failed to export image for WhatsApp: {e}")
+        if export is not None:
+            results["image_export"] = format_export_summary(export)
+
+        try:
+            final_path = save_final_image(export.path if export else selected_image_path, output_dir)
             results["image_saved"] = str(final_path)
         except Exception as e:
             results["errors"].append(f"Failed to save image: {e}")
@@ -202,6 +216,13 @@ def finalize_post(
     except Exception as e:
         results["errors"].append(f"Failed to log to history: {e}")
 
+    # Index the generated images under the post
+    if image_batch_id and results["history_logged"]:
+        try:
+            assign_post(image_batch_id, results["history_logged"])
+        except Exception as e:
+            results["errors"].append(f"Failed to index images: {e}")
+
     # Open in Finder
     if settings.get("output", {}).get("open_finder_after_generation", True):
         if output_dir.exists():
@@ -232,6 +253,8 @@ def format_success_message(results: dict, output_dir: Path) -> str:
 
     if results.get("image_saved"):
         lines.append(f"✓ Image saved: {results['image_saved']}")
+        if results.get("image_export"):
+            lines.append(f"  ({results['image_export']})")
 
     if results.get("clipboard_copied"):
         lines.append("✓ Post text copied to clipboard")
@@ -0,0 +1,82 @@
+"""Background pre-generation of the next regenerate batch.
+
+While the user reads a batch of hooks or concepts, the next batch is
+generated speculatively so that [r]egenerate can show it at once. The
+number of speculative batches per session is capped by
+llm.prefetch.max_batches, since each one is a full provider call.
+"""
+
+import threading
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+
+T = TypeVar("T")
+
+
+def get_prefetch_budget(llm_config: dict) -> int:
+    """Number of speculative batches allowed per session (0 if disabled)."""
+    prefetch_config = llm_config.get("prefetch", {})
+    if not prefetch_config.get("enabled", True):
+        return 0
+    return max(0, prefetch_config.get("max_batches", 2))
+
+
+class Prefetcher(Generic[T]):
+    """Runs at most one speculative generation at a time on a background thread.
+
+    Args:
+        generate: Produces a batch; must stop (raising or returning) soon
+            after the cancel event it is given is set
+        budget: Maximum number of generations to start
+    """
+
+    def __init__(self, generate: Callable[[threading.Event], T], budget: int):
+        self._generate = generate
+        self.remaining = budget
+        self._thread: threading.Thread | None = None
+        self._cancel_event = threading.Event()
+        self._outcome: dict = {}
+
+    def start(self) -> bool:
+        """Start generating the next batch, unless one is running or the budget is spent."""
+        if self._thread is not None or self.remaining <= 0:
+            return False
+
+        self.remaining -= 1
+        self._cancel_event = threading.Event()
+        self._outcome = outcome = {}
+
+        def run(cancel_event: threading.Event):
+            try:
+                outcome["result"] = self._generate(cancel_event)
+            except Exception as e:
+                outcome["error"] = e
+
+        self._thread = threading.Thread(target=run, args=(self._cancel_event,), daemon=True)
+        self._thread.start()
+        return True
+
+    def ready(self) -> bool:
+        """Whether a finished batch is waiting to be taken."""
+        return self._thread is not None and not self._thread.is_alive()
+
+    def take(self) -> T | None:
+        """Return the prefetched batch, waiting for it if still in progress.
+
+        Returns None if nothing was prefetched or the generation failed, in
+        which case the caller should generate as usual.
+        """
+        if self._thread is None:
+            return None
+        self._thread.join()
+        self._thread = None
+        return self._outcome.get("result")
+
+    def cancel(self) -> None:
+        """Stop any in-progress generation and discard its batch."""
+        if self._thread is None:
+            return
+        self._cancel_event.set()
+        self._thread.join(timeout=5)
+        self._thread = None
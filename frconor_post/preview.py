@@ -0,0 +1,272 @@
+"""Contact sheet preview of generated image variations.
+
+Downscales each variation to a thumbnail (in a process pool, decoding at
+reduced size where the format allows) and tiles them into one numbered
+contact sheet, so variations can be compared without opening Finder.
+Thumbnails and sheets are cached under cache/previews by the source
+files' content hashes, so showing the same variations again is instant.
+
+The sheet is drawn inline in terminals with an image protocol (iTerm2,
+WezTerm, kitty); elsewhere its path is printed. Needs Pillow
+(`pip install 'frconor-post[preview]'`); without it the preview is
+skipped.
+"""
+
+import base64
+import hashlib
+import importlib.util
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .artifacts import ImageArtifact, file_digest
+from .config import get_cache_path, load_settings
+
+
+# Gap between thumbnails and around the sheet, in pixels
+SHEET_MARGIN = 12
+
+SHEET_BACKGROUND = (32, 32, 32)
+
+# Terminals known to draw images with the iTerm2 inline image protocol
+ITERM_TERMINALS = ("iTerm.app", "WezTerm")
+
+# Kitty graphics protocol payloads are sent in chunks of this many bytes
+KITTY_CHUNK = 4096
+
+
+def get_preview_config() -> dict:
+    """The preview settings, with defaults."""
+    return {
+        "enabled": True,
+        "thumbnail_size": 480,
+        "columns": 3,
+        "inline": "auto",  # "auto", "iterm", "kitty" or "off"
+        **load_settings().get("preview", {}),
+    }
+
+
+def get_preview_dir() -> Path:
+    """Get the preview cache directory."""
+    return get_cache_path() / "previews"
+
+
+def pillow_available() -> bool:
+    """Whether Pillow (the optional preview dependency) is installed."""
+    return importlib.util.find_spec("PIL") is not None
+
+
+def downscale(image, size: int):
+    """Shrink an opened Pillow image to fit in size x size (never enlarges).
+
+    JPEG sources are decoded straight at reduced scale (draft mode); others
+    are shrunk by an integer factor with reduce() before the final
+    resample, which is much cheaper than resampling the full image.
+    """
+    image.draft("RGB", (size, size))
+    if image.mode not in ("RGB", "RGBA", "L"):
+        image = image.convert("RGBA")  # Palette images can't be reduced or resampled smoothly
+    factor = min(image.width // size, image.height // size)
+    if factor > 1:
+        image = image.reduce(factor)
+    image.thumbnail((size, size))
+    return image
+
+
+def make_thumbnail(source: str, dest: str, size: int) -> str:
+    """Downscale an image to fit in size x size and save it as JPEG (runs in a worker process).
+
+    Returns:
+        dest
+    """
+    from PIL import Image
+
+    with Image.open(source) as image:
+        image = downscale(image, size).convert("RGB")
+        tmp = f"{dest}.{os.getpid()}.tmp"
+        image.save(tmp, "JPEG", quality=85)
+    os.replace(tmp, dest)
+    return dest
+
+
+def build_thumbnails(paths: list[Path], size: int) -> list[Path]:
+    """Thumbnails for the given images, from cache where possible.
+
+    Missing thumbnails are made in a process pool, one process per image.
+
+    Args:
+        paths: Source images
+        size: Longest side of a thumbnail, in pixels
+
+    Returns:
+        Thumbnail paths, in the order of paths
+    """
+    preview_dir = get_preview_dir()
+    preview_dir.mkdir(parents=True, exist_ok=True)
+    thumbnails = [preview_dir / f"{file_digest(path)[:20]}-{size}.jpg" for path in paths]
+
+    missing = [(str(path), str(thumb)) for path, thumb in zip(paths, thumbnails) if not thumb.exists()]
+    if len(missing) == 1:
+        make_thumbnail(*missing[0], size)
+    elif missing:
+        with ProcessPoolExecutor(max_workers=min(len(missing), os.cpu_count() or 1)) as pool:
+            list(pool.map(make_thumbnail, *zip(*missing), [size] * len(missing)))
+    return thumbnails
+
+
+def build_contact_sheet(
+    paths: list[Path],
+    labels: list[str] | None = None,
+    config: dict | None = None
+) -> Path:
+    """Tile thumbnails of the given images into one labelled contact sheet.
+
+    Args:
+        paths: Source images
+        labels: Caption drawn on each tile (default: 1, 2, 3, ...)
+        config: Preview settings (default: from settings.json)
+
+    Returns:
+        Path to the cached contact sheet (JPEG)
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    config = config or get_preview_config()
+    size = config["thumbnail_size"]
+    columns = max(1, min(config["columns"], len(paths)))
+    labels = labels or [str(n) for n in range(1, len(paths) + 1)]
+
+    thumbnails = build_thumbnails(paths, size)
+    key = hashlib.sha256(
+        "|".join(f"{thumb.name}:{label}" for thumb, label in zip(thumbnails, labels)).encode("utf-8")
+        + f"|{columns}".encode("utf-8")
+    ).hexdigest()
+    sheet_path = get_preview_dir() / f"sheet-{key[:20]}.jpg"
+    if sheet_path.exists():
+        return sheet_path
+
+    tiles = [Image.open(thumb) for thumb in thumbnails]
+    cell_w = max(tile.width for tile in tiles)
+    cell_h = max(tile.height for tile in tiles)
+    rows = -(-len(tiles) // columns)
+    sheet = Image.new(
+        "RGB",
+        (columns * (cell_w + SHEET_MARGIN) + SHEET_MARGIN, rows * (cell_h + SHEET_MARGIN) + SHEET_MARGIN),
+        SHEET_BACKGROUND
+    )
+    draw = ImageDraw.Draw(sheet)
+    font = ImageFont.load_default()
+
+    for n, (tile, label) in enumerate(zip(tiles, labels)):
+        x = SHEET_MARGIN + (n % columns) * (cell_w + SHEET_MARGIN) + (cell_w - tile.width) // 2
+        y = SHEET_MARGIN + (n // columns) * (cell_h + SHEET_MARGIN) + (cell_h - tile.height) // 2
+        sheet.paste(tile, (x, y))
+        tile.close()
+
+        left, top, right, bottom = draw.textbbox((x + 8, y + 6), label, font=font)
+        draw.rectangle((left - 6, top - 4, right + 6, bottom + 4), fill=(0, 0, 0))
+        draw.text((x + 8, y + 6), label, fill=(255, 255, 255), font=font)
+
+    tmp = sheet_path.with_name(f"{sheet_path.name}.{os.getpid()}.tmp")
+    sheet.save(tmp, "JPEG", quality=85)
+    os.replace(tmp, sheet_path)
+    return sheet_path
+
+
+def detect_inline_protocol(mode: str = "auto") -> str | None:
+    """The terminal image protocol to use: "iterm", "kitty" or None."""
+    if mode in ("iterm", "kitty"):
+        return mode
+    if mode != "auto" or not sys.stdout.isatty():
+        return None
+    if os.environ.get("TERM_PROGRAM") in ITERM_TERMINALS or os.environ.get("LC_TERMINAL") == "iTerm2":
+        return "iterm"
+    if os.environ.get("KITTY_WINDOW_ID") or os.environ.get("TERM") == "xterm-kitty":
+        return "kitty"
+    return None
+
+
+def render_inline(path: Path, protocol: str) -> None:
+    """Draw an image in the terminal with the iTerm2 or kitty protocol."""
+    if protocol == "iterm":
+        data = path.read_bytes()
+        payload = base64.b64encode(data).decode("ascii")
+        sys.stdout.write(f"\033]1337;File=inline=1;size={len(data)};preserveAspectRatio=1:{payload}\a\n")
+    else:
+        # kitty only decodes PNG, so the sheet is re-encoded
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        with Image.open(path) as image:
+            image.save(buffer, "PNG")
+        payload = base64.b64encode(buffer.getvalue()).decode("ascii")
+        chunks = [payload[i:i + KITTY_CHUNK] for i in range(0, len(payload), KITTY_CHUNK)]
+        for n, chunk in enumerate(chunks):
+            more = 1 if n < len(chunks) - 1 else 0
+            control = f"a=T,f=100,m={more}" if n == 0 else f"m={more}"
+            sys.stdout.write(f"\033_G{control};{chunk}\033\\")
+        sys.stdout.write("\n")
+    sys.stdout.flush()
+
+
+def show_preview(artifacts: list[ImageArtifact]) -> Path | None:
+    """Build a contact sheet of the variations and show it (inline or as a path).
+
+    Never raises: a missing Pillow, unreadable image or full disk just
+    means no preview.
+
+    Returns:
+        Path to the contact sheet, or None if none was made
+    """
+    if len(artifacts) < 2:
+        return None
+    config = get_preview_config()
+    if not config["enabled"]:
+        return None
+    if not pillow_available():
+        print("  (Install Pillow for a contact sheet preview: pip install 'frconor-post[preview]')")
+        return None
+
+    try:
+        sheet = build_contact_sheet(
+            [Path(artifact.path) for artifact in artifacts],
+            [str(n) for n in range(1, len(artifacts) + 1)],
+            config
+        )
+    except Exception as e:
+        print(f"  (Preview unavailable: {e})")
+        return None
+
+    protocol = detect_inline_protocol(config["inline"])
+    if protocol:
+        render_inline(sheet, protocol)
+    print(f"  Preview: {sheet}")
+    return sheet
+
+
+if __name__ == "__main__":
+    # Benchmark: python -m frconor_post.preview IMAGE [IMAGE ...]
+    import shutil
+
+    sources = [Path(arg) for arg in sys.argv[1:]]
+    if not sources:
+        sys.exit("usage: python -m frconor_post.preview IMAGE [IMAGE ...]")
+
+    preview_config = get_preview_config()
+    shutil.rmtree(get_preview_dir(), ignore_errors=True)  # Time a cold cache first
+
+    start = time.perf_counter()
+    sheet_path = build_contact_sheet(sources, config=preview_config)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    build_contact_sheet(sources, config=preview_config)
+    cached = time.perf_counter() - start
+
+    print(f"{len(sources)} image(s), thumbnails {preview_config['thumbnail_size']}px")
+    print(f"  cold:   {cold * 1000:8.1f} ms")
+    print(f"  cached: {cached * 1000:8.1f} ms")
+    print(f"  sheet:  {sheet_path}")
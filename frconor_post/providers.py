@@ -0,0 +1,698 @@
+"""LLM provider runtime (Gemini, Claude, Codex).
+
+Shared by quote, concept, and comic generation. Provider CLIs run as
+asyncio subprocesses on one background event loop, so calls can run
+concurrently, stream their stdout line by line, and be cancelled from any
+thread. The synchronous functions below (call_provider, stream_provider,
+submit) are the facade the generators use.
+
+Backends are registered by name. settings.json's llm.providers section
+configures them, and an entry may set "backend" to run a registered
+backend under another name (e.g. a second Claude entry with other flags).
+"""
+
+import asyncio
+import atexit
+import json
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import CancelledError, Future
+from typing import NamedTuple
+
+from .cassette import record_interaction
+from .llm_cache import get_provider_model
+from .telemetry import record_span
+
+
+# Seconds to wait for a provider CLI before giving up
+DEFAULT_TIMEOUT = 120
+
+# Longest stdout line a provider may produce (asyncio's default is 64 KiB)
+LINE_LIMIT = 1024 * 1024
+
+
+class ProviderError(RuntimeError):
+    """A provider call failed.
+
+    Attributes:
+        provider: Provider name the call was made with
+        kind: "not_found", "launch", "timeout", "exit" or "cancelled"
+        returncode: CLI exit status, if it exited
+        stderr: CLI error output, if any
+    """
+
+    def __init__(self, provider: str, kind: str, message: str,
+                 returncode: int | None = None, stderr: str = ""):
+        super().__init__(message)
+        self.provider = provider
+        self.kind = kind
+        self.returncode = returncode
+        self.stderr = stderr
+
+
+class ProviderCancelled(ProviderError):
+    """Raised when a provider call is cancelled before it finishes."""
+
+
+class SessionProtocol(NamedTuple):
+    """How to talk to a long-lived provider process (see ProviderSession)."""
+    # (provider settings, llm settings) -> argv
+    build_args: Callable[[dict, dict], list[str]]
+    # prompt -> one request, written to the process's stdin
+    encode: Callable[[str], bytes]
+    # stdout JSON event -> (response text, request finished, error message)
+    decode: Callable[[dict], tuple[str, bool, str | None]]
+
+
+class Backend(NamedTuple):
+    """How to run one kind of provider CLI."""
+    name: str
+    display_name: str
+    install_hint: str
+    # (prompt, provider settings, llm settings) -> argv
+    build_args: Callable[[str, dict, dict], list[str]]
+    # Persistent worker mode, if the CLI supports one
+    session: SessionProtocol | None = None
+
+
+class CallRecord(NamedTuple):
+    """Outcome of one provider call, passed to call observers."""
+    provider: str
+    seconds: float
+    prompt_chars: int
+    response_chars: int
+    error: str | None  # ProviderError.kind, or None on success
+
+
+def prompt_via_stdin(provider_config: dict) -> bool:
+    """Whether a provider takes its prompt on stdin ("prompt_via": "stdin").
+
+    Large prompts passed as an argument can hit the OS argument size limit
+    and are visible in `ps`; stdin has neither problem.
+    """
+    return provider_config.get("prompt_via", "argv") == "stdin"
+
+
+def _gemini_args(prompt: str, provider_config: dict, config: dict) -> list[str]:
+    command = provider_config.get("command", "gemini")
+    model_flag = provider_config.get("model_flag", "--model")
+    model = config.get("quote_generation", {}).get("model", "gemini-2.5-pro")
+    if prompt_via_stdin(provider_config):
+        # Non-interactive gemini reads the prompt from piped stdin
+        return [command, model_flag, model]
+    return [command, prompt, model_flag, model]
+
+
+def _claude_args(prompt: str, provider_config: dict, config: dict) -> list[str]:
+    command = provider_config.get("command", "claude")
+    prompt_flag = provider_config.get("prompt_flag", "-p")
+    if prompt_via_stdin(provider_config):
+        # `claude -p` with no prompt argument reads it from stdin
+        return [command, prompt_flag]
+    return [command, prompt_flag, prompt]
+
+
+def _claude_session_args(provider_config: dict, config: dict) -> list[str]:
+    command = provider_config.get("command", "claude")
+    prompt_flag = provider_config.get("prompt_flag", "-p")
+    return [command, prompt_flag, "--input-format", "stream-json",
+            "--output-format", "stream-json", "--verbose"]
+
+
+def _claude_session_encode(prompt: str) -> bytes:
+    message = {"type": "user", "message": {"role": "user", "content": prompt}}
+    return (json.dumps(message) + "\n").encode("utf-8")
+
+
+def _claude_session_decode(event: dict) -> tuple[str, bool, str | None]:
+    if event.get("type") == "assistant":
+        content = event.get("message", {}).get("content", [])
+        text = "".join(block.get("text", "") for block in content if block.get("type") == "text")
+        return text, False, None
+    if event.get("type") == "result":
+        error = (event.get("result") or event.get("subtype")) if event.get("is_error") else None
+        return "", True, error
+    return "", False, None
+
+
+def _codex_args(prompt: str, provider_config: dict, config: dict) -> list[str]:
+    command = provider_config.get("command", "codex")
+    subcommand = provider_config.get("subcommand", "exec")
+    if prompt_via_stdin(provider_config):
+        # `codex exec -` reads the instructions from stdin
+        return [command, subcommand, "-"]
+    return [command, subcommand, prompt]
+
+
+BACKENDS: dict[str, Backend] = {}
+
+_observers: list[Callable[[CallRecord], None]] = []
+
+
+def register_backend(backend: Backend) -> None:
+    """Register (or replace) a provider backend."""
+    BACKENDS[backend.name] = backend
+
+
+register_backend(Backend("gemini", "Gemini", " Install with: pip install google-generativeai", _gemini_args))
+register_backend(Backend(
+    "claude", "Claude", "", _claude_args,
+    session=SessionProtocol(_claude_session_args, _claude_session_encode, _claude_session_decode)
+))
+register_backend(Backend("codex", "Codex", " Install with: npm install -g @openai/codex", _codex_args))
+
+
+def add_call_observer(observer: Callable[[CallRecord], None]) -> None:
+    """Call observer(record) after every provider call (e.g. for telemetry)."""
+    _observers.append(observer)
+
+
+def get_backend(provider: str, config: dict) -> tuple[Backend, dict]:
+    """Resolve a provider name to its backend and provider settings.
+
+    Raises:
+        ValueError: If the provider is unknown
+    """
+    provider_config = config.get("providers", {}).get(provider, {})
+    backend = BACKENDS.get(provider_config.get("backend", provider))
+    if backend is None:
+        raise ValueError(f"Unknown LLM provider: {provider}")
+    return backend, provider_config
+
+
+def build_command(provider: str, prompt: str, config: dict) -> list[str]:
+    """Build the CLI command line for a provider.
+
+    Args:
+        provider: Provider name (gemini, claude, codex, or a settings entry)
+        prompt: Filled prompt
+        config: The "llm" section of settings.json
+    """
+    backend, provider_config = get_backend(provider, config)
+    return backend.build_args(prompt, provider_config, config)
+
+
+async def run_provider(
+    provider: str,
+    prompt: str,
+    config: dict,
+    timeout: float = DEFAULT_TIMEOUT,
+    on_line: Callable[[str], None] | None = None
+) -> str:
+    """Run a provider CLI on the current event loop and return its stdout.
+
+    Cancelling the task kills the process.
+
+    Args:
+        provider: Provider name
+        prompt: Filled prompt
+        config: The "llm" section of settings.json
+        timeout: Seconds before the process is killed
+        on_line: Called with each stdout line (newline kept) as it arrives
+
+    Raises:
+        ValueError: If the provider is unknown
+        ProviderError: If the CLI is missing, fails, or times out
+    """
+    backend, provider_config = get_backend(provider, config)
+    session_config = provider_config.get("session", {})
+    use_session = backend.session is not None and session_config.get("enabled", False)
+    start = time.monotonic()
+    chunks: list[str] = []
+    offsets: list[float] = []
+    error = None
+    returncode, stderr = 0, ""
+
+    def emit(line: str) -> None:
+        chunks.append(line)
+        offsets.append(time.monotonic() - start)
+        if on_line is not None:
+            on_line(line)
+
+    try:
+        if use_session:
+            session = _get_session(provider, backend, provider_config, config)
+            try:
+                await asyncio.wait_for(session.request(prompt, emit), timeout)
+            except asyncio.TimeoutError:
+                raise ProviderError(provider, "timeout",
+                                    f"{backend.display_name} CLI timed out after {timeout:.0f}s")
+        else:
+            await _run_process(provider, backend, provider_config, config, prompt, timeout, emit)
+    except ProviderError as e:
+        error = e.kind
+        returncode, stderr = e.returncode, e.stderr
+        raise
+    except asyncio.CancelledError:
+        error = "cancelled"
+        raise
+    finally:
+        seconds = time.monotonic() - start
+        if error is None or error == "exit":
+            # Only calls that ran to completion can be replayed
+            record_interaction(config, provider, prompt, list(zip(offsets, chunks)),
+                               stderr, returncode, seconds)
+        record_span("provider", seconds, provider=provider,
+                    model=get_provider_model(provider, config),
+                    prompt_bytes=len(prompt.encode("utf-8")),
+                    output_bytes=sum(len(chunk.encode("utf-8")) for chunk in chunks),
+                    exit_code=returncode if error in (None, "exit") else None, error=error)
+        record = CallRecord(provider, seconds, len(prompt),
+                            sum(len(chunk) for chunk in chunks), error)
+        for observer in _observers:
+            try:
+                observer(record)
+            except Exception:
+                pass  # Observers must never break a call
+
+    return "".join(chunks)
+
+
+async def _run_process(
+    provider: str,
+    backend: Backend,
+    provider_config: dict,
+    config: dict,
+    prompt: str,
+    timeout: float,
+    emit: Callable[[str], None]
+) -> None:
+    """Run one provider CLI process for one prompt, emitting stdout lines."""
+    name = backend.display_name
+    args = backend.build_args(prompt, provider_config, config)
+    via_stdin = prompt_via_stdin(provider_config)
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            # Never let a provider CLI read the user's terminal
+            stdin=asyncio.subprocess.PIPE if via_stdin else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=LINE_LIMIT
+        )
+    except FileNotFoundError:
+        raise ProviderError(provider, "not_found", f"{name} CLI not found.{backend.install_hint}")
+    except OSError as e:
+        # e.g. E2BIG when an argv prompt exceeds the OS argument limit
+        raise ProviderError(provider, "launch", f"{name} CLI could not be started: {e}")
+
+    async def write_prompt() -> None:
+        try:
+            process.stdin.write(prompt.encode("utf-8"))
+            await process.stdin.drain()
+            process.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The CLI exited early; its exit status says why
+
+    async def communicate() -> tuple[int, bytes]:
+        stderr_task = asyncio.ensure_future(process.stderr.read())
+        # Written concurrently with reading stdout, so a CLI that starts
+        # answering before it has read the whole prompt cannot deadlock
+        stdin_task = asyncio.ensure_future(write_prompt()) if via_stdin else None
+        try:
+            async for raw in process.stdout:
+                emit(raw.decode("utf-8", errors="replace"))
+            if stdin_task is not None:
+                await stdin_task
+            return await process.wait(), await stderr_task
+        finally:
+            stderr_task.cancel()
+            if stdin_task is not None:
+                stdin_task.cancel()
+
+    try:
+        returncode, stderr = await asyncio.wait_for(communicate(), timeout)
+    except asyncio.TimeoutError:
+        raise ProviderError(provider, "timeout", f"{name} CLI timed out after {timeout:.0f}s")
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+
+    if returncode != 0:
+        stderr_text = stderr.decode("utf-8", errors="replace")
+        raise ProviderError(provider, "exit", f"{name} CLI error: {stderr_text}",
+                            returncode=returncode, stderr=stderr_text)
+
+
+class _SessionDied(Exception):
+    """The session process exited or broke protocol mid-request."""
+
+
+class ProviderSession:
+    """A warm provider CLI process, ready for the next request.
+
+    Avoids paying CLI startup and authentication on every call. Each
+    process answers exactly one request, so no request sees an earlier
+    one's conversation (responses are cached by prompt alone): once a
+    request finishes, the process is replaced in the background by a
+    fresh one that starts up while the caller works on the response. The
+    process is restarted if it dies and shut down after idle_ttl_seconds
+    without a request. Only used from the runtime's event loop.
+    """
+
+    def __init__(self, provider: str, backend: Backend, provider_config: dict, config: dict):
+        self.provider = provider
+        self.backend = backend
+        self.provider_config = provider_config
+        self.config = config
+        self.process: asyncio.subprocess.Process | None = None
+        self.requests = 0
+        self._lock = asyncio.Lock()
+        self._stderr: deque[str] = deque(maxlen=20)
+        self._stderr_task: asyncio.Task | None = None
+        self._idle_handle: asyncio.TimerHandle | None = None
+        self._recycle_task: asyncio.Task | None = None
+
+    @property
+    def _session_config(self) -> dict:
+        return self.provider_config.get("session", {})
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def _start(self) -> None:
+        name = self.backend.display_name
+        args = self.backend.session.build_args(self.provider_config, self.config)
+        try:
+            self.process = await asyncio.create_subprocess_exec(
+                *args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=LINE_LIMIT
+            )
+        except FileNotFoundError:
+            raise ProviderError(self.provider, "not_found", f"{name} CLI not found.{self.backend.install_hint}")
+        except OSError as e:
+            raise ProviderError(self.provider, "launch", f"{name} CLI could not be started: {e}")
+        self.requests = 0
+        self._stderr.clear()
+        self._stderr_task = asyncio.ensure_future(self._drain_stderr(self.process))
+
+    async def _drain_stderr(self, process: asyncio.subprocess.Process) -> None:
+        # Keep the pipe from filling up; the tail goes into error messages
+        async for raw in process.stderr:
+            self._stderr.append(raw.decode("utf-8", errors="replace"))
+
+    async def close(self) -> None:
+        """Stop the process (politely first: closing stdin ends the session)."""
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        process, self.process = self.process, None
+        if process is None:
+            return
+        if process.returncode is None:
+            try:
+                process.stdin.close()
+                await asyncio.wait_for(process.wait(), 2)
+            except (asyncio.TimeoutError, OSError):
+                process.kill()
+                await process.wait()
+        if self._stderr_task is not None:
+            self._stderr_task.cancel()
+
+    def _schedule_idle_close(self) -> None:
+        ttl = self._session_config.get("idle_ttl_seconds", 300)
+        loop = asyncio.get_running_loop()
+        self._idle_handle = loop.call_later(ttl, lambda: asyncio.ensure_future(self._close_if_idle()))
+
+    async def _close_if_idle(self) -> None:
+        if not self._lock.locked():
+            await self.close()
+
+    async def _recycle(self) -> None:
+        """Replace a used process with a fresh one for the next request."""
+        async with self._lock:
+            if self.requests == 0 and self.alive():
+                return
+            await self.close()
+            try:
+                await self._start()
+            except ProviderError:
+                return  # The next request starts it again and reports the error
+            self._schedule_idle_close()
+
+    async def shutdown(self) -> None:
+        """Stop the process and any pending recycle."""
+        if self._recycle_task is not None:
+            self._recycle_task.cancel()
+            self._recycle_task = None
+        await self.close()
+
+    async def request(self, prompt: str, emit: Callable[[str], None]) -> None:
+        """Send one prompt and emit the response line by line.
+
+        A request that finds the process dead before any output is retried
+        once on a fresh process. Cancellation (including timeouts) kills
+        the process, since it is left mid-answer.
+        """
+        async with self._lock:
+            if self._idle_handle is not None:
+                self._idle_handle.cancel()
+                self._idle_handle = None
+            try:
+                for attempt in range(2):
+                    if not self.alive() or self.requests > 0:
+                        await self.close()
+                        await self._start()
+                    self.requests += 1
+                    emitted = []
+
+                    def track(line: str) -> None:
+                        emitted.append(line)
+                        emit(line)
+
+                    try:
+                        await self._exchange(prompt, track)
+                        return
+                    except _SessionDied as e:
+                        await self.close()
+                        if emitted or attempt:
+                            raise ProviderError(self.provider, "exit",
+                                                f"{self.backend.display_name} CLI error: {e}")
+            except BaseException as e:
+                if not isinstance(e, ProviderError) or e.kind != "exit":
+                    await self.close()
+                raise
+            finally:
+                if self.alive():
+                    self._recycle_task = asyncio.ensure_future(self._recycle())
+
+    async def _exchange(self, prompt: str, emit: Callable[[str], None]) -> None:
+        protocol = self.backend.session
+        process = self.process
+        try:
+            process.stdin.write(protocol.encode(prompt))
+            await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            raise _SessionDied("".join(self._stderr) or "session process exited")
+
+        pending = ""
+        while True:
+            raw = await process.stdout.readline()
+            if not raw:
+                await process.wait()
+                raise _SessionDied("".join(self._stderr) or f"session process exited ({process.returncode})")
+            try:
+                event = json.loads(raw)
+            except ValueError:
+                continue
+            text, finished, error = protocol.decode(event)
+
+            pending += text
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                emit(line + "\n")
+
+            if finished:
+                if pending:
+                    emit(pending)
+                if error is not None:
+                    raise ProviderError(self.provider, "exit",
+                                        f"{self.backend.display_name} CLI error: {error}")
+                return
+
+
+_sessions: dict[str, ProviderSession] = {}
+
+
+def _get_session(provider: str, backend: Backend, provider_config: dict, config: dict) -> ProviderSession:
+    session = _sessions.get(provider)
+    if session is None:
+        session = _sessions[provider] = ProviderSession(provider, backend, provider_config, config)
+    else:
+        # Settings may have been reloaded; the next restart picks them up
+        session.provider_config = provider_config
+        session.config = config
+    return session
+
+
+async def _close_sessions() -> None:
+    for session in list(_sessions.values()):
+        await session.shutdown()
+
+
+class _Runtime:
+    """Background thread running the event loop that provider calls share."""
+
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="provider-runtime", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+
+_runtime = _Runtime()
+
+
+def shutdown_sessions(timeout: float = 5.0) -> None:
+    """Close any persistent provider sessions (registered with atexit)."""
+    loop = _runtime._loop
+    if loop is None or not _sessions:
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_close_sessions(), loop).result(timeout)
+    except Exception:
+        pass
+
+
+atexit.register(shutdown_sessions)
+
+
+class ProviderCall:
+    """Handle on a provider call running on the shared runtime."""
+
+    def __init__(self, provider: str, future: Future, loop: asyncio.AbstractEventLoop,
+                 started: threading.Event, finished: threading.Event):
+        self.provider = provider
+        self.future = future
+        self._loop = loop
+        self._started = started
+        self._finished = finished
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: float | None = None) -> str:
+        """Wait for the response.
+
+        Raises:
+            ProviderError: If the call failed
+            ProviderCancelled: If the call was cancelled
+        """
+        try:
+            return self.future.result(timeout)
+        except CancelledError:
+            raise ProviderCancelled(self.provider, "cancelled", f"{self.provider} CLI call cancelled")
+
+    def cancel(self, wait: float = 5.0) -> None:
+        """Cancel the call, waiting up to `wait` seconds for the process to exit."""
+        if not self.future.cancel():
+            return
+
+        # Once the loop has processed the cancellation, the call has either
+        # started (and will kill its process) or will never start
+        barrier = threading.Event()
+        self._loop.call_soon_threadsafe(barrier.set)
+        barrier.wait(wait)
+        if self._started.is_set():
+            self._finished.wait(wait)
+
+
+def submit(
+    provider: str,
+    prompt: str,
+    config: dict,
+    timeout: float = DEFAULT_TIMEOUT,
+    on_line: Callable[[str], None] | None = None
+) -> ProviderCall:
+    """Start a provider call in the background and return a handle to it.
+
+    on_line is called from the runtime thread.
+    """
+    # Resolve the backend now so unknown providers fail in the caller
+    get_backend(provider, config)
+    loop = _runtime.get_loop()
+    started = threading.Event()
+    finished = threading.Event()
+
+    async def run() -> str:
+        started.set()
+        try:
+            return await run_provider(provider, prompt, config, timeout, on_line)
+        finally:
+            finished.set()
+
+    future = asyncio.run_coroutine_threadsafe(run(), loop)
+    return ProviderCall(provider, future, loop, started, finished)
+
+
+def call_provider(
+    provider: str,
+    prompt: str,
+    config: dict,
+    timeout: float = DEFAULT_TIMEOUT,
+    cancel_event: threading.Event | None = None
+) -> str:
+    """Run a provider CLI and return its stdout.
+
+    Args:
+        provider: Provider name (gemini, claude, codex)
+        prompt: Filled prompt
+        config: The "llm" section of settings.json
+        timeout: Seconds before the process is killed
+        cancel_event: When set, the process is killed and ProviderCancelled raised
+
+    Raises:
+        ValueError: If the provider is unknown
+        ProviderError: If the CLI is missing, fails, or times out
+        ProviderCancelled: If cancel_event was set
+    """
+    return "".join(stream_provider(provider, prompt, config, timeout, cancel_event))
+
+
+def stream_provider(
+    provider: str,
+    prompt: str,
+    config: dict,
+    timeout: float = DEFAULT_TIMEOUT,
+    cancel_event: threading.Event | None = None
+) -> Iterator[str]:
+    """Run a provider CLI, yielding stdout line by line as it is produced.
+
+    Lines keep their trailing newline. Closing the iterator early kills the
+    process. Errors are raised after the last line, as for call_provider.
+    """
+    lines: queue.Queue = queue.Queue()
+    call = submit(provider, prompt, config, timeout, on_line=lines.put)
+    call.future.add_done_callback(lambda _: lines.put(None))
+
+    try:
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                call.cancel()
+                raise ProviderCancelled(provider, "cancelled", f"{provider} CLI call cancelled")
+            try:
+                line = lines.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if line is None:
+                break
+            yield line
+        call.result()
+    finally:
+        if not call.done():
+            call.cancel()
+
@@ -1,10 +1,67 @@
 """Quote generation using LLM providers (Gemini, Claude, Codex)."""
 
 import re
-import subprocess
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import NamedTuple
 
 from .config import load_prompt_template, load_settings
+from .excerpt import select_salient_excerpt
+from .hedging import call_with_fallback
+from .llm_cache import cached_call, get_cached_response, get_provider_model, store_response
+from .providers import ProviderCancelled, call_provider, stream_provider
+from .structured import (
+    OutputSchema,
+    apply_json_output,
+    call_structured,
+    iter_json_items,
+    json_output_enabled,
+    json_response_items,
+    repair_json_response,
+)
+from .telemetry import span
+from .tokens import fill_lines_to_budget, fill_to_budget, get_prompt_budget
+
+
+# Pattern to match numbered hooks with optional style labels
+# Matches: 1. [Label]: "text" or 1. "text" or 1. text
+HOOK_PATTERN = re.compile(r'(\d+)\.\s*(?:\[([^\]]+)\]:\s*)?["\']?(.+?)["\']?\s*$')
+
+
+class HookSlot(NamedTuple):
+    """One of the 15 numbered positions the quote prompt asks for."""
+    style: str
+    brief: str
+
+
+# Mirrors the sections of prompts/quote_generation.md
+POIGNANT_BRIEF = "Touch on pain, loss, longing or deep human struggle while pointing toward hope"
+HOOK_SLOTS = {
+    1: HookSlot("Provocative Question", "Open with a question highlighting tension or surprising truth (Antithesis or Paradox)"),
+    2: HookSlot("Minimalist Moment", "Short, impactful anchor for a busy person (Scesis Onomaton or Diacope)"),
+    3: HookSlot("Witty Reframe", "Playful metaphor or startling observation (Catachresis or Paradox)"),
+    4: HookSlot("Direct Invitation", "Warm, balanced invitation (Isocolon or Alliteration)"),
+    5: HookSlot("Profound Tease", "Hint at a deep insight that promises transformation (Chiasmus or Fourteenth Rule)"),
+    6: HookSlot("Poignant", POIGNANT_BRIEF),
+    7: HookSlot("Poignant", POIGNANT_BRIEF),
+    8: HookSlot("Poignant", POIGNANT_BRIEF),
+    9: HookSlot("Poignant", POIGNANT_BRIEF),
+    10: HookSlot("Poignant", POIGNANT_BRIEF),
+    11: HookSlot("Varied", "Gentle encouragement"),
+    12: HookSlot("Varied", "Bold declaration"),
+    13: HookSlot("Varied", "Quiet observation"),
+    14: HookSlot("Varied", "Unexpected angle"),
+    15: HookSlot("Varied", "Simple truth"),
+}
+
+
+# Item shape for llm.output_format = "json" (count varies by prompt)
+HOOKS_SCHEMA = OutputSchema("hooks", 15, {
+    "number": (int, "Hook number"),
+    "style": (str, "Style label, e.g. Provocative Question, Poignant (use Varied for 11-15)"),
+    "text": (str, "The hook itself"),
+})
 
 
 class Hook(NamedTuple):
@@ -17,7 +74,9 @@ class Hook(NamedTuple):
 def generate_quotes(
     episode_title: str,
     transcript_excerpt: str,
-    provider: str | None = None
+    provider: str | None = None,
+    use_cache: bool = True,
+    cancel_event: threading.Event | None = None
 ) -> list[Hook]:
     """Generate 15 hooks using the configured LLM provider.
 
@@ -25,6 +84,10 @@ def generate_quotes(
         episode_title: Title of the meditation episode
         transcript_excerpt: Excerpt of the transcript text
         provider: LLM provider to use (gemini, claude, codex). If None, uses settings default.
+        use_cache: Serve a cached response for an identical prompt. Pass False
+            to force a fresh generation (e.g. on regenerate).
+        cancel_event: When set, the provider call is killed and
+            ProviderCancelled raised (used for background prefetches)
 
     Returns:
         List of 15 Hook objects
@@ -36,131 +99,534 @@ def generate_quotes(
     if provider is None:
         provider = llm_config.get("quote_generation", {}).get("provider", "gemini")
 
-    # Load prompt template
-    prompt_template = load_prompt_template("quote_generation")
+    prompt = build_quote_prompt(episode_title, transcript_excerpt, provider)
 
-    # Fill in template
-    prompt = prompt_template.replace("{episode_title}", episode_title)
-    prompt = prompt.replace("{transcript_excerpt}", transcript_excerpt)
-
-    # Generate based on provider
-    if provider == "gemini":
-        response = _call_gemini(prompt, llm_config)
-    elif provider == "claude":
-        response = _call_claude(prompt, llm_config)
-    elif provider == "codex":
-        response = _call_codex(prompt, llm_config)
-    else:
-        raise ValueError(f"Unknown LLM provider: {provider}")
+    answered_by, response = cached_call(
+        provider,
+        get_provider_model(provider, llm_config),
+        prompt,
+        lambda: call_structured(prompt, HOOKS_SCHEMA, llm_config, provider, _is_valid_hooks_response,
+                                check_count=False, cancel_event=cancel_event),
+        bypass=not use_cache,
+        validate=_is_valid_hooks_response
+    )
 
     # Parse response into hooks
-    hooks = _parse_hooks(response)
+    with span("parse.hooks", provider=answered_by) as fields:
+        hooks = _parse_hooks(response, fields)
+
+    refill = _refill_missing(episode_title, transcript_excerpt, hooks, provider, cancel_event,
+                             fields.get("parse_path"))
+    if refill:
+        hooks = merge_hooks(hooks, refill)
 
     return hooks
 
 
-def _call_gemini(prompt: str, config: dict) -> str:
-    """Call Gemini CLI for quote generation."""
-    provider_config = config.get("providers", {}).get("gemini", {})
-    command = provider_config.get("command", "gemini")
-    model_flag = provider_config.get("model_flag", "--model")
-    model = config.get("quote_generation", {}).get("model", "gemini-2.5-pro")
+def generate_quotes_stream(
+    episode_title: str,
+    transcript_excerpt: str,
+    provider: str | None = None,
+    use_cache: bool = True,
+    cancel_event: threading.Event | None = None
+) -> Iterator[Hook]:
+    """Generate hooks, yielding each one as soon as its line has streamed in.
 
-    try:
-        result = subprocess.run(
-            [command, prompt, model_flag, model],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
+    Same prompt and caching as generate_quotes. If the primary provider
+    fails before producing any hook, the configured fallback provider is
+    used instead (without streaming).
 
-        if result.returncode != 0:
-            raise RuntimeError(f"Gemini CLI error: {result.stderr}")
+    Args:
+        episode_title: Title of the meditation episode
+        transcript_excerpt: Excerpt of the transcript text
+        provider: LLM provider to use (gemini, claude, codex). If None, uses settings default.
+        use_cache: Serve a cached response for an identical prompt
+        cancel_event: When set, the provider process is killed and the
+            iterator stops
 
-        return result.stdout
+    Yields:
+        Hook objects in response order
+    """
+    settings = load_settings()
+    llm_config = settings.get("llm", {})
 
-    except FileNotFoundError:
-        raise RuntimeError("Gemini CLI not found. Install with: pip install google-generativeai")
+    # Determine provider
+    if provider is None:
+        provider = llm_config.get("quote_generation", {}).get("provider", "gemini")
 
+    prompt = build_quote_prompt(episode_title, transcript_excerpt, provider)
+    model = get_provider_model(provider, llm_config)
+
+    yielded: list[Hook] = []
+
+    if use_cache:
+        cached = get_cached_response(provider, model, prompt)
+        if cached is not None:
+            with span("parse.hooks", provider=provider) as fields:
+                hooks = _parse_hooks(cached, fields)
+            for hook in hooks:
+                yielded.append(hook)
+                yield hook
+            try:
+                for hook in _refill_missing(episode_title, transcript_excerpt, yielded, provider,
+                                            cancel_event, fields.get("parse_path")):
+                    yield hook
+            except ProviderCancelled:
+                pass
+            return
+
+    lines: list[str] = []
+
+    def collect(stream: Iterator[str]) -> Iterator[str]:
+        for line in stream:
+            lines.append(line)
+            yield line
+
+    json_mode = json_output_enabled(llm_config)
+    parse_incrementally = iter_json_hooks if json_mode else iter_hooks
 
-def _call_claude(prompt: str, config: dict) -> str:
-    """Call Claude Code CLI for quote generation."""
-    provider_config = config.get("providers", {}).get("claude", {})
-    command = provider_config.get("command", "claude")
-    prompt_flag = provider_config.get("prompt_flag", "-p")
+    try:
+        stream = stream_provider(provider, prompt, llm_config, cancel_event=cancel_event)
+        for hook in parse_incrementally(collect(stream)):
+            yielded.append(hook)
+            yield hook
+        response = "".join(lines)
+    except ProviderCancelled:
+        return
+    except RuntimeError:
+        fallback = llm_config.get("quote_generation", {}).get("fallback_provider")
+        if yielded or not fallback or fallback == provider:
+            raise
+        print(f"  {provider} failed; trying {fallback}...")
+        provider, response = call_with_fallback(prompt, llm_config, fallback, _is_valid_hooks_response,
+                                                 cancel_event)
+        model = get_provider_model(provider, llm_config)
+
+    if json_mode:
+        response = repair_json_response(response, HOOKS_SCHEMA, provider, llm_config,
+                                        check_count=False, cancel_event=cancel_event)
+    if _is_valid_hooks_response(response):
+        store_response(provider, model, prompt, response)
+
+    # Whatever the strict line parser missed (lenient format or fallback)
+    yielded_numbers = {hook.number for hook in yielded}
+    with span("parse.hooks", provider=provider) as fields:
+        hooks = _parse_hooks(response, fields)
+    for hook in hooks:
+        if hook.number not in yielded_numbers:
+            yielded.append(hook)
+            yield hook
 
+    # Slots the model skipped altogether
     try:
-        result = subprocess.run(
-            [command, prompt_flag, prompt],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
+        for hook in _refill_missing(episode_title, transcript_excerpt, yielded, provider,
+                                    cancel_event, fields.get("parse_path")):
+            yield hook
+    except ProviderCancelled:
+        return
 
-        if result.returncode != 0:
-            raise RuntimeError(f"Claude CLI error: {result.stderr}")
 
-        return result.stdout
+def generate_quotes_chunked(
+    episode_title: str,
+    transcript_text: str,
+    provider: str | None = None,
+    use_cache: bool = True,
+    cancel_event: threading.Event | None = None
+) -> list[Hook]:
+    """Generate 15 hooks from a long transcript with map-reduce.
 
-    except FileNotFoundError:
-        raise RuntimeError("Claude CLI not found.")
+    The full transcript is split into overlapping chunks, candidate hooks
+    are generated for every chunk in parallel (map), then deduplicated and
+    narrowed to the final 15 with a single reduce call. Chunk responses are
+    always served from the response cache when present, so regenerating
+    only re-runs the reduce step.
 
+    Candidates are interleaved across chunks before the reduce prompt is
+    fitted to the provider's token budget, so if some must be dropped,
+    every part of the transcript stays represented. Slots the reduce step
+    skips are refilled from a salience excerpt of the whole transcript.
 
-def _call_codex(prompt: str, config: dict) -> str:
-    """Call Codex CLI for quote generation."""
-    provider_config = config.get("providers", {}).get("codex", {})
-    command = provider_config.get("command", "codex")
-    subcommand = provider_config.get("subcommand", "exec")
+    Args:
+        episode_title: Title of the meditation episode
+        transcript_text: Full transcript text
+        provider: LLM provider to use (gemini, claude, codex). If None, uses settings default.
+        use_cache: Serve a cached reduce response. Pass False on regenerate.
+        cancel_event: When set, outstanding provider calls are killed and
+            ProviderCancelled raised
 
-    try:
-        result = subprocess.run(
-            [command, subcommand, prompt],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
+    Returns:
+        List of 15 Hook objects
+    """
+    settings = load_settings()
+    llm_config = settings.get("llm", {})
+    quote_config = llm_config.get("quote_generation", {})
+
+    if provider is None:
+        provider = quote_config.get("provider", "gemini")
+
+    chunks = split_into_chunks(
+        transcript_text,
+        quote_config.get("chunk_words", 1500),
+        quote_config.get("chunk_overlap_words", 200)
+    )
+    budget = get_prompt_budget(provider, llm_config)
+    chunk_template = load_prompt_template("quote_chunk")
+    if json_output_enabled(llm_config):
+        chunk_template = apply_json_output(chunk_template, HOOKS_SCHEMA._replace(count=8))
+
+    chunk_prompts = []
+    for i, chunk in enumerate(chunks, 1):
+        prompt = chunk_template.replace("{episode_title}", episode_title)
+        prompt = prompt.replace("{chunk_number}", str(i))
+        prompt = prompt.replace("{chunk_count}", str(len(chunks)))
+        chunk_prompts.append(fill_to_budget(prompt, "{transcript_excerpt}", chunk, budget))
+
+    model = get_provider_model(provider, llm_config)
+
+    # Map: candidate hooks per chunk, in parallel provider processes
+    max_workers = max(1, min(quote_config.get("chunk_concurrency", 3), len(chunk_prompts)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        responses = [response for _, response in executor.map(
+            lambda prompt: cached_call(
+                provider, model, prompt,
+                lambda: (provider, call_provider(provider, prompt, llm_config, cancel_event=cancel_event)),
+                validate=lambda response: bool(_parse_hooks(response))
+            ),
+            chunk_prompts
+        )]
+
+    per_chunk = [_parse_hooks(response) for response in responses]
+    candidates = _dedupe_hooks([
+        hook
+        for rank in range(max((len(hooks) for hooks in per_chunk), default=0))
+        for hooks in per_chunk if rank < len(hooks)
+        for hook in [hooks[rank]]
+    ])
+
+    # Reduce: pick the final 15 from as many candidates as the budget allows
+    prompt = load_prompt_template("quote_reduce").replace("{episode_title}", episode_title)
+    if json_output_enabled(llm_config):
+        prompt = apply_json_output(prompt, HOOKS_SCHEMA)
+    prompt = fill_lines_to_budget(
+        prompt,
+        "{candidates}",
+        [f"- [{hook.style}]: \"{hook.text}\"" for hook in candidates],
+        budget
+    )
+
+    answered_by, response = cached_call(
+        provider, model, prompt,
+        lambda: call_structured(prompt, HOOKS_SCHEMA, llm_config, provider, _is_valid_hooks_response,
+                                check_count=False, cancel_event=cancel_event),
+        bypass=not use_cache,
+        validate=_is_valid_hooks_response
+    )
+    with span("parse.hooks", provider=answered_by) as fields:
+        hooks = _parse_hooks(response, fields)
+
+    excerpt = get_chunked_refill_excerpt(transcript_text)
+    refill = _refill_missing(episode_title, excerpt, hooks, provider, cancel_event, fields.get("parse_path"))
+    if refill:
+        hooks = merge_hooks(hooks, refill)
 
-        if result.returncode != 0:
-            raise RuntimeError(f"Codex CLI error: {result.stderr}")
+    return hooks
 
-        return result.stdout
 
-    except FileNotFoundError:
-        raise RuntimeError("Codex CLI not found. Install with: npm install -g @openai/codex")
+def get_chunked_refill_excerpt(transcript_text: str) -> str:
+    """Get the transcript text refills draw on for a chunked (long) talk.
 
+    Args:
+        transcript_text: Full transcript text
 
-def _parse_hooks(response: str) -> list[Hook]:
-    """Parse LLM response into a list of Hook objects.
+    Returns:
+        The most salient chunk-sized stretch of the transcript
+    """
+    quote_config = load_settings().get("llm", {}).get("quote_generation", {})
+    return select_salient_excerpt(transcript_text, quote_config.get("chunk_words", 1500))
 
-    Expected format:
-    1. [Style]: "hook text"
-    2. [Style]: "hook text"
-    ...
+
+def refill_hooks(
+    episode_title: str,
+    transcript_excerpt: str,
+    kept: list[Hook],
+    slots: list[int] | None = None,
+    provider: str | None = None,
+    cancel_event: threading.Event | None = None
+) -> list[Hook]:
+    """Generate new hooks for some slots only, keeping the rest.
+
+    The provider is asked only for the given slot numbers (with each
+    slot's style), and is shown the kept hooks so it doesn't repeat them.
+
+    Args:
+        episode_title: Title of the meditation episode
+        transcript_excerpt: Excerpt of the transcript text
+        kept: Hooks the user is keeping
+        slots: Slot numbers (1-15) to refill. If None, every slot not in kept.
+        provider: LLM provider to use (gemini, claude, codex). If None, uses settings default.
+        cancel_event: When set, the provider call is killed and
+            ProviderCancelled raised
+
+    Returns:
+        The new hooks, numbered by slot (combine with merge_hooks)
     """
-    hooks = []
+    llm_config = load_settings().get("llm", {})
+    if provider is None:
+        provider = llm_config.get("quote_generation", {}).get("provider", "gemini")
 
-    # Pattern to match numbered hooks with optional style labels
-    # Matches: 1. [Label]: "text" or 1. "text" or 1. text
-    pattern = r'(\d+)\.\s*(?:\[([^\]]+)\]:\s*)?["\']?(.+?)["\']?\s*$'
+    if slots is None:
+        slots = missing_hook_slots(kept)
+    slots = [number for number in slots if number in HOOK_SLOTS]
+    if not slots:
+        return []
 
-    lines = response.strip().split("\n")
+    prompt = build_refill_prompt(episode_title, transcript_excerpt, kept, slots, provider)
+
+    def is_complete(response: str) -> bool:
+        return set(slots) <= {hook.number for hook in _parse_refill(response, slots)}
+
+    # Always a fresh answer: refilling is asking for something different
+    response = call_with_fallback(prompt, llm_config, provider, is_complete, cancel_event).text
+    return _parse_refill(response, slots)
+
+
+def build_refill_prompt(
+    episode_title: str,
+    transcript_excerpt: str,
+    kept: list[Hook],
+    slots: list[int],
+    provider: str | None = None
+) -> str:
+    """Fill the refill template within the provider's token budget."""
+    llm_config = load_settings().get("llm", {})
+    if provider is None:
+        provider = llm_config.get("quote_generation", {}).get("provider", "gemini")
 
+    kept_str = "\n".join(f"- [{hook.style}]: \"{hook.text}\"" for hook in kept) or "(none)"
+    slots_str = "\n".join(
+        f"{number}. [{HOOK_SLOTS[number].style}]: {HOOK_SLOTS[number].brief}" for number in slots
+    )
+
+    prompt = load_prompt_template("quote_refill").replace("{episode_title}", episode_title)
+    prompt = prompt.replace("{kept_hooks}", kept_str).replace("{slots}", slots_str)
+    if json_output_enabled(llm_config):
+        prompt = apply_json_output(prompt, HOOKS_SCHEMA._replace(count=len(slots)))
+    return fill_to_budget(
+        prompt,
+        "{transcript_excerpt}",
+        transcript_excerpt,
+        get_prompt_budget(provider, llm_config)
+    )
+
+
+def missing_hook_slots(hooks: list[Hook]) -> list[int]:
+    """Slot numbers (1-15) that have no hook."""
+    present = {hook.number for hook in hooks}
+    return [number for number in HOOK_SLOTS if number not in present]
+
+
+def merge_hooks(kept: list[Hook], new: list[Hook]) -> list[Hook]:
+    """Merge refilled hooks into kept ones: one hook per slot, in slot order.
+
+    A kept hook keeps its slot over a new one with the same number. No
+    hook is dropped: one whose number is already taken (a model repeating
+    a number, or a new hook for a kept slot) moves to the first free slot.
+    """
+    by_number: dict[int, Hook] = {}
+    duplicates = []
+    for hook in kept + new:
+        if hook.number in by_number:
+            duplicates.append(hook)
+        else:
+            by_number[hook.number] = hook
+
+    number = 1
+    for hook in duplicates:
+        while number in by_number:
+            number += 1
+        by_number[number] = hook._replace(number=number)
+    return [by_number[number] for number in sorted(by_number)]
+
+
+def _refill_missing(
+    episode_title: str,
+    transcript_text: str,
+    hooks: list[Hook],
+    provider: str,
+    cancel_event: threading.Event | None,
+    parse_path: str | None
+) -> list[Hook]:
+    """Ask once for any slots a response skipped. A failed refill is not an error.
+
+    Only with quote_generation.auto_refill on, and only when the JSON or
+    strict parser read the response: then a missing number means the
+    model skipped that slot. A lenient parse's gaps are as likely to be
+    parse misses, which a refill would only paper over. The extra call is
+    recorded as a "refill" span.
+    """
+    quote_config = load_settings().get("llm", {}).get("quote_generation", {})
+    if not quote_config.get("auto_refill", True) or parse_path not in ("json", "strict"):
+        return []
+    missing = missing_hook_slots(merge_hooks(hooks, []))
+    if not hooks or not missing:
+        return []
+    with span("refill", provider=provider, parse_path=parse_path) as fields:
+        try:
+            refill = refill_hooks(episode_title, transcript_text, merge_hooks(hooks, []), missing,
+                                  provider, cancel_event)
+        except ProviderCancelled:
+            raise
+        except RuntimeError as e:
+            fields["error"] = type(e).__name__
+            return []
+        fields["output_bytes"] = sum(len(hook.text.encode("utf-8")) for hook in refill)
+        return refill
+
+
+def _parse_refill(response: str, slots: list[int]) -> list[Hook]:
+    """Parse a refill response, keeping one hook per requested slot."""
+    if json_response_items(response, HOOKS_SCHEMA.key) is not None:
+        parsed = _parse_hooks(response)
+    else:
+        parsed = list(iter_hooks(response.strip().split("\n"))) or _parse_hooks_lenient(response)
+    hooks = {}
+    for hook in parsed:
+        if hook.number in slots and hook.number not in hooks:
+            hooks[hook.number] = Hook(number=hook.number, style=HOOK_SLOTS[hook.number].style, text=hook.text)
+    return [hooks[number] for number in slots if number in hooks]
+
+
+def split_into_chunks(text: str, chunk_words: int, overlap_words: int) -> list[str]:
+    """Split text into chunks of chunk_words words overlapping by overlap_words."""
+    words = text.split()
+    if len(words) <= chunk_words:
+        return [text]
+
+    step = max(1, chunk_words - overlap_words)
+    chunks = []
+    for start in range(0, len(words), step):
+        chunks.append(" ".join(words[start:start + chunk_words]))
+        if start + chunk_words >= len(words):
+            break
+    return chunks
+
+
+def _dedupe_hooks(hooks: list[Hook]) -> list[Hook]:
+    """Drop hooks whose text repeats an earlier one (ignoring formatting)."""
+    seen = set()
+    unique = []
+    for hook in hooks:
+        key = " ".join(re.sub(r"[^\w\s]", "", hook.text.lower()).split())
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(hook)
+    return unique
+
+
+def build_quote_prompt(
+    episode_title: str,
+    transcript_excerpt: str,
+    provider: str | None = None
+) -> str:
+    """Fill the quote generation template within the provider's token budget.
+
+    The transcript excerpt is trimmed at a word boundary if the filled
+    prompt would exceed llm.providers.<provider>.max_prompt_tokens.
+    """
+    llm_config = load_settings().get("llm", {})
+    if provider is None:
+        provider = llm_config.get("quote_generation", {}).get("provider", "gemini")
+
+    # Load prompt template
+    prompt_template = load_prompt_template("quote_generation")
+
+    # Fill in template
+    prompt = prompt_template.replace("{episode_title}", episode_title)
+    if json_output_enabled(llm_config):
+        prompt = apply_json_output(prompt, HOOKS_SCHEMA)
+    return fill_to_budget(
+        prompt,
+        "{transcript_excerpt}",
+        transcript_excerpt,
+        get_prompt_budget(provider, llm_config)
+    )
+
+
+def _is_valid_hooks_response(response: str) -> bool:
+    """Check a response parses into (nearly) a full set of hooks."""
+    return len(_parse_hooks(response)) >= 10
+
+
+def iter_hooks(lines: Iterable[str]) -> Iterator[Hook]:
+    """Incrementally parse hooks, yielding each as soon as its line is complete.
+
+    Expected line format: 1. [Style]: "hook text"
+    """
     for line in lines:
         line = line.strip()
         if not line:
             continue
 
-        match = re.match(pattern, line, re.MULTILINE)
+        match = HOOK_PATTERN.match(line)
         if match:
             number = int(match.group(1))
             style = match.group(2) or _infer_style(number)
             text = match.group(3).strip().strip('"\'')
 
-            hooks.append(Hook(number=number, style=style, text=text))
+            yield Hook(number=number, style=style, text=text)
+
+
+def iter_json_hooks(chunks: Iterable[str]) -> Iterator[Hook]:
+    """Incrementally parse a JSON-mode response, yielding each complete hook.
+
+    Items without a number or text are skipped; a missing style is
+    inferred from the number.
+    """
+    for item in iter_json_items(chunks, HOOKS_SCHEMA.key):
+        hook = _hook_from_item(item)
+        if hook is not None:
+            yield hook
+
+
+def _hook_from_item(item: dict) -> Hook | None:
+    number, text, style = item.get("number"), item.get("text"), item.get("style")
+    if not isinstance(number, int) or not isinstance(text, str) or not text.strip():
+        return None
+    if not isinstance(style, str) or not style.strip():
+        style = _infer_style(number)
+    return Hook(number=number, style=style.strip(), text=text.strip())
+
+
+def _parse_hooks(response: str, trace: dict | None = None, json_mode: bool | None = None) -> list[Hook]:
+    """Parse LLM response into a list of Hook objects.
+
+    Expected format:
+    1. [Style]: "hook text"
+    2. [Style]: "hook text"
+    ...
+
+    or, in JSON output mode, {"hooks": [{"number", "style", "text"}, ...]}
+
+    If trace is given, trace["parse_path"] is set to the parser that was
+    used ("json", "strict" or "lenient").
+
+    JSON found after a preamble is used when json_mode (default:
+    llm.output_format) is on; see json_response_items.
+    """
+    trace = trace if trace is not None else {}
+
+    items = json_response_items(response, HOOKS_SCHEMA.key, json_mode)
+    if items is not None:
+        trace["parse_path"] = "json"
+        return [hook for hook in map(_hook_from_item, items) if hook is not None]
+
+    hooks = list(iter_hooks(response.strip().split("\n")))
+    trace["parse_path"] = "strict"
 
     # If parsing failed, try a more lenient approach
     if len(hooks) < 5:
         hooks = _parse_hooks_lenient(response)
+        trace["parse_path"] = "lenient"
 
     return hooks
 
@@ -191,19 +657,8 @@ def _parse_hooks_lenient(response: str) -> list[Hook]:
 
 def _infer_style(number: int) -> str:
     """Infer style label from hook number."""
-    style_map = {
-        1: "Provocative Question",
-        2: "Minimalist Moment",
-        3: "Witty Reframe",
-        4: "Direct Invitation",
-        5: "Profound Tease",
-        6: "Poignant",
-        7: "Poignant",
-        8: "Poignant",
-        9: "Poignant",
-        10: "Poignant",
-    }
-    return style_map.get(number, "Varied")
+    slot = HOOK_SLOTS.get(number)
+    return slot.style if slot else "Varied"
 
 
 def format_hooks_display(hooks: list[Hook]) -> str:
@@ -213,24 +668,37 @@ def format_hooks_display(hooks: list[Hook]) -> str:
     current_section = None
 
     for hook in hooks:
-        # Determine section
-        if hook.number <= 5:
-            section = "CREATIVE STYLES"
-        elif hook.number <= 10:
-            section = "POIGNANT & EMOTIONALLY DEVASTATING"
-        else:
-            section = "VARIED TONES"
+        lines, current_section = format_hook_lines(hook, current_section)
+        output.extend(lines)
 
-        # Add section header if changed
-        if section != current_section:
-            if current_section is not None:
-                output.append("")
-            output.append(f"\n{section}:")
-            output.append("-" * 40)
-            current_section = section
+    return "\n".join(output)
 
-        # Format hook
-        output.append(f"  {hook.number:2}. [{hook.style}]")
-        output.append(f"      \"{hook.text}\"")
 
-    return "\n".join(output)
+def format_hook_lines(hook: Hook, current_section: str | None) -> tuple[list[str], str]:
+    """Format one hook for display, with a section header if the section changed.
+
+    Returns the display lines and the hook's section, to pass in with the
+    next hook.
+    """
+    output = []
+
+    # Determine section
+    if hook.number <= 5:
+        section = "CREATIVE STYLES"
+    elif hook.number <= 10:
+        section = "POIGNANT & EMOTIONALLY DEVASTATING"
+    else:
+        section = "VARIED TONES"
+
+    # Add section header if changed
+    if section != current_section:
+        if current_section is not None:
+            output.append("")
+        output.append(f"\n{section}:")
+        output.append("-" * 40)
+
+    # Format hook
+    output.append(f"  {hook.number:2}. [{hook.style}]")
+    output.append(f"      \"{hook.text}\"")
+
+    return output, section
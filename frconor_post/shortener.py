@@ -5,6 +5,7 @@ import subprocess
 from pathlib import Path
 
 from .config import get_cache_path, load_settings
+from .telemetry import span
 
 
 def get_shortened_urls_cache() -> dict[str, str]:
@@ -84,12 +85,14 @@ def shorten_url(url: str, use_cache: bool = True) -> str:
     python_path = shortener_config.get("python_path", "python")
 
     try:
-        result = subprocess.run(
-            [python_path, script_path, "--no-copy", url],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        with span("shorten", provider=Path(script_path).stem) as fields:
+            result = subprocess.run(
+                [python_path, script_path, "--no-copy", url],
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+            fields.update(exit_code=result.returncode, output_bytes=len(result.stdout.encode("utf-8")))
 
         if result.returncode == 0:
             shortened = result.stdout.strip()
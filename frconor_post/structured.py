@@ -0,0 +1,262 @@
+"""Structured JSON output mode for LLM responses.
+
+Opt-in with llm.output_format = "json". Prompt templates keep their
+numbered-list "## Output Format" section for text mode; in JSON mode that
+section is replaced with prompts/json_output.md, filled from an
+OutputSchema. Responses are parsed in a single pass (items are yielded as
+soon as each one is complete, so streamed responses can be shown early),
+validated against the schema, and any missing or invalid fields are fixed
+with one targeted repair call (prompts/json_repair.md) rather than a full
+regenerate.
+"""
+
+import json
+import re
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from typing import NamedTuple
+
+from .config import load_prompt_template, load_settings
+from .hedging import HedgedResponse, call_with_fallback
+
+
+class OutputSchema(NamedTuple):
+    """Shape of a structured response: {key: [item, ...]}."""
+    key: str
+    count: int
+    # field name -> (type, description); every field is required
+    fields: dict[str, tuple[type, str]]
+
+
+OUTPUT_FORMAT_HEADING = "## Output Format"
+
+# Start of the item array: "key": [  (or a bare top-level array)
+_BARE_ARRAY = re.compile(r"\s*(?:```(?:json)?\s*)?\[")
+_JSON_START = re.compile(r"\s*(?:```(?:json)?\s*)?[{\[]")
+_decoder = json.JSONDecoder()
+
+
+def json_output_enabled(llm_config: dict) -> bool:
+    """Whether prompts should ask for JSON output (llm.output_format)."""
+    return llm_config.get("output_format", "text") == "json"
+
+
+def apply_json_output(prompt: str, schema: OutputSchema) -> str:
+    """Replace a prompt's "## Output Format" section with JSON instructions."""
+    head, _, _ = prompt.partition(OUTPUT_FORMAT_HEADING)
+
+    fields = "\n".join(
+        f"- `{name}` ({'integer' if kind is int else 'string'}): {description}"
+        for name, (kind, description) in schema.fields.items()
+    )
+    example = {name: (1 if kind is int else "...") for name, (kind, _) in schema.fields.items()}
+
+    instructions = load_prompt_template("json_output")
+    instructions = instructions.replace("{key}", schema.key)
+    instructions = instructions.replace("{count}", str(schema.count))
+    instructions = instructions.replace("{fields}", fields)
+    instructions = instructions.replace("{example}", json.dumps({schema.key: [example]}))
+
+    return head.rstrip() + "\n\n" + instructions
+
+
+def looks_like_json(response: str) -> bool:
+    """Whether a response is a JSON document (optionally in a code fence)."""
+    return _JSON_START.match(response) is not None
+
+
+def iter_json_items(chunks: Iterable[str], key: str) -> Iterator[dict]:
+    """Yield each object of a response's item array as soon as it is complete.
+
+    Accepts {"key": [...]} (anywhere in the text, e.g. after a code fence)
+    or a bare [...] array. Text is consumed in one pass; only an item that
+    is still incomplete is re-read when more text arrives. Parsing stops at
+    the end of the array or at the first item that never becomes valid.
+    """
+    key_pattern = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+    buffer = ""
+    pos = None  # Position inside the array, once found
+
+    for chunk in chunks:
+        buffer += chunk
+
+        if pos is None:
+            match = key_pattern.search(buffer) or _BARE_ARRAY.match(buffer)
+            if match is None:
+                continue
+            pos = match.end()
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                return
+            try:
+                item, pos = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # Incomplete so far; wait for more text
+            if isinstance(item, dict):
+                yield item
+
+
+def parse_json_items(response: str, key: str) -> list[dict]:
+    """Parse all items of a complete response."""
+    return list(iter_json_items([response], key))
+
+
+def json_response_items(response: str, key: str, json_mode: bool | None = None) -> list[dict] | None:
+    """Items of a JSON response, or None if the response is for the text parsers.
+
+    A response that starts as JSON (optionally in a code fence) is always
+    parsed as JSON. In JSON output mode, an item array after a preamble
+    ("Here you go:\n{...}") is found too.
+
+    Args:
+        response: Complete response
+        key: Item array key, e.g. "hooks"
+        json_mode: Whether JSON output was requested (default: llm.output_format)
+    """
+    if looks_like_json(response):
+        return parse_json_items(response, key)
+    if json_mode is None:
+        json_mode = json_output_enabled(load_settings().get("llm", {}))
+    if json_mode:
+        items = parse_json_items(response, key)
+        if items:
+            return items
+    return None
+
+
+def validate_items(items: list[dict], schema: OutputSchema, check_count: bool = True) -> list[str]:
+    """List every problem with a response's items, e.g. "concepts[2].mood: missing".
+
+    Returns an empty list if the items match the schema.
+    """
+    problems = []
+
+    for index, item in enumerate(items, 1):
+        for name, (kind, _) in schema.fields.items():
+            value = item.get(name)
+            where = f"{schema.key}[{index}].{name}"
+            if value is None:
+                problems.append(f"{where}: missing")
+            elif kind is int and (not isinstance(value, int) or isinstance(value, bool)):
+                problems.append(f"{where}: expected an integer")
+            elif kind is str and not isinstance(value, str):
+                problems.append(f"{where}: expected a string")
+            elif kind is str and not value.strip():
+                problems.append(f"{where}: empty")
+
+    if check_count:
+        numbers = {item.get("number") for item in items}
+        absent = [n for n in range(1, schema.count + 1) if n not in numbers]
+        if absent:
+            problems.append(f"{schema.key}: missing number(s) {', '.join(map(str, absent))}")
+
+    return problems
+
+
+def repair_json_response(
+    response: str,
+    schema: OutputSchema,
+    provider: str,
+    llm_config: dict,
+    check_count: bool = True,
+    cancel_event: threading.Event | None = None
+) -> str:
+    """Fix a JSON response's missing or invalid fields with one targeted call.
+
+    The provider is shown the items and the list of problems, and returns
+    only the corrected or added items, which are merged back by number.
+    Text-mode responses and responses without problems are returned as-is;
+    JSON after a preamble is repaired like any other (see
+    json_response_items).
+
+    Returns:
+        The (possibly repaired) response, as JSON
+    """
+    items = json_response_items(response, schema.key, json_output_enabled(llm_config))
+    if items is None:
+        return response
+
+    problems = validate_items(items, schema, check_count)
+    if not problems:
+        return response
+
+    prompt = load_prompt_template("json_repair")
+    prompt = prompt.replace("{key}", schema.key).replace("{count}", str(schema.count))
+    prompt = prompt.replace("{problems}", "\n".join(f"- {problem}" for problem in problems))
+    prompt = prompt.replace("{items}", json.dumps({schema.key: items}, indent=2, ensure_ascii=False))
+    prompt = apply_json_output(prompt, schema)
+
+    def is_json(repair: str) -> bool:
+        return bool(parse_json_items(repair, schema.key))
+
+    try:
+        repair = call_with_fallback(prompt, llm_config, provider, is_json, cancel_event).text
+    except RuntimeError:
+        return response  # Keep what we have; the parser drops unusable items
+
+    merged = {item.get("number"): item for item in items}
+    for item in parse_json_items(repair, schema.key):
+        number = item.get("number")
+        if isinstance(number, int) and number in merged:
+            merged[number] = {**merged[number], **item}
+        else:
+            merged[number] = item
+
+    ordered = sorted(merged.values(), key=lambda item: (not isinstance(item.get("number"), int),
+                                                         item.get("number") or 0))
+    return json.dumps({schema.key: ordered}, ensure_ascii=False)
+
+
+def call_structured(
+    prompt: str,
+    schema: OutputSchema,
+    llm_config: dict,
+    provider: str,
+    validate: Callable[[str], bool],
+    check_count: bool = True,
+    cancel_event: threading.Event | None = None
+) -> HedgedResponse:
+    """Hedged provider call whose JSON response is repaired by the provider that answered.
+
+    In JSON output mode the hedge only needs a response with items under
+    schema.key: missing or invalid fields and counts are left to the
+    targeted repair, and validate is applied after it. Only a response
+    that is still invalid after the repair is regenerated (hedged with
+    validate). In text mode, validate drives the hedge directly.
+
+    Args:
+        validate: Returns True if a response parses well enough to use
+
+    Returns:
+        The (possibly repaired) response and the provider that gave it
+    """
+    if not json_output_enabled(llm_config):
+        return call_with_fallback(prompt, llm_config, provider, validate, cancel_event)
+
+    def has_items(response: str) -> bool:
+        return bool(json_response_items(response, schema.key, json_mode=True))
+
+    answered_by, response = call_with_fallback(prompt, llm_config, provider, has_items, cancel_event)
+    response = repair_json_response(response, schema, answered_by, llm_config,
+                                    check_count=check_count, cancel_event=cancel_event)
+    if validate(response):
+        return HedgedResponse(answered_by, response)
+    return call_with_fallback(prompt, llm_config, provider, validate, cancel_event)
+
+
+def complete_items(items: list[dict], schema: OutputSchema) -> list[dict]:
+    """Items that have every field, with string fields stripped."""
+    complete = []
+    for item in items:
+        if validate_items([item], schema, check_count=False):
+            continue
+        complete.append({
+            name: item[name].strip() if kind is str else item[name]
+            for name, (kind, _) in schema.fields.items()
+        })
+    return complete
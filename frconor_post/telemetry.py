@@ -0,0 +1,180 @@
+"""Timing spans for the slow stages of a run.
+
+Every provider call, transcript fetch, URL shortener run, image job and
+response parse appends one span (one JSON line) to state/telemetry.jsonl.
+The file is rotated at telemetry.max_bytes, keeping telemetry.backups
+older files. `frcmed-post --stats` summarises the spans as latency
+percentiles per stage and provider.
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import NamedTuple
+
+from .config import get_state_dir, load_settings
+
+
+_write_lock = threading.Lock()
+
+# The telemetry settings, read on the first span (spans are recorded
+# inside per-hook parsing, far too often to re-read settings.json)
+_config: dict | None = None
+
+
+class Span(NamedTuple):
+    """One timed stage."""
+    timestamp: float
+    stage: str  # "provider", "fetch", "extract", "shorten", "image", "parse.hooks", ...
+    seconds: float
+    provider: str | None = None  # Provider, extraction backend or host
+    model: str | None = None
+    prompt_bytes: int | None = None  # Input size: prompt, or page for "extract"
+    output_bytes: int | None = None
+    exit_code: int | None = None  # Process exit status or HTTP status
+    parse_path: str | None = None  # "json", "strict" or "lenient"
+    error: str | None = None
+
+
+def get_telemetry_path() -> Path:
+    """Get the path to the current telemetry file."""
+    return get_state_dir() / "telemetry.jsonl"
+
+
+def _get_telemetry_config() -> dict:
+    global _config
+    if _config is None:
+        _config = load_settings().get("telemetry", {})
+    return _config
+
+
+def record_span(stage: str, seconds: float, **fields) -> None:
+    """Append a span to the telemetry file. Never raises.
+
+    Args:
+        stage: Stage name
+        seconds: Wall time of the stage
+        **fields: Any other Span field (provider, model, exit_code, ...)
+    """
+    try:
+        config = _get_telemetry_config()
+    except (OSError, ValueError):
+        return
+    if not config.get("enabled", True):
+        return
+
+    record = Span(time.time(), stage, round(seconds, 4), **fields)
+    path = get_telemetry_path()
+    try:
+        with _write_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if path.exists() and path.stat().st_size >= config.get("max_bytes", 1_000_000):
+                _rotate(path, config.get("backups", 3))
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record._asdict(), ensure_ascii=False) + "\n")
+    except OSError:
+        pass  # Telemetry must never fail a run
+
+
+def _rotate(path: Path, backups: int) -> None:
+    """Shift telemetry.jsonl -> .1 -> .2 ..., dropping the oldest."""
+    if backups <= 0:
+        path.unlink()
+        return
+    for n in range(backups - 1, 0, -1):
+        older = path.with_name(f"{path.name}.{n}")
+        if older.exists():
+            older.replace(path.with_name(f"{path.name}.{n + 1}"))
+    path.replace(path.with_name(f"{path.name}.1"))
+
+
+@contextmanager
+def span(stage: str, **fields) -> Iterator[dict]:
+    """Time a block and record it as a span.
+
+    Yields a dict the block can add fields to (e.g. output_bytes). If the
+    block raises, the exception's type name is recorded as the error.
+
+    Example:
+        with span("shorten", provider="tinyurl") as fields:
+            result = run()
+            fields["exit_code"] = result.returncode
+    """
+    start = time.monotonic()
+    try:
+        yield fields
+    except BaseException as e:
+        fields.setdefault("error", type(e).__name__)
+        raise
+    finally:
+        record_span(stage, time.monotonic() - start, **fields)
+
+
+def load_spans() -> list[Span]:
+    """Read all recorded spans, oldest first (rotated files included)."""
+    path = get_telemetry_path()
+    rotated = [p for p in path.parent.glob(f"{path.name}.*") if p.suffix[1:].isdigit()]
+    paths = sorted(rotated, key=lambda p: -int(p.suffix[1:]))
+    spans = []
+    for file_path in paths + [path]:
+        try:
+            with open(file_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        spans.append(Span(**json.loads(line)))
+                    except (ValueError, TypeError):
+                        continue  # Partial line from an interrupted write
+        except OSError:
+            continue
+    return spans
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Nearest-rank percentile (p in 0-100) of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))  # ceil(n * p / 100)
+    return ordered[int(rank) - 1]
+
+
+def format_stats(spans: list[Span]) -> str:
+    """Latency percentiles per stage and provider, as a printable table."""
+    if not spans:
+        return f"No telemetry recorded yet ({get_telemetry_path()})."
+
+    groups: dict[tuple[str, str], list[Span]] = defaultdict(list)
+    for record in spans:
+        groups[(record.stage, record.provider or "-")].append(record)
+
+    lines = [
+        f"{'Stage':14} {'Provider':24} {'Count':>6} {'Errors':>6} "
+        f"{'p50 s':>8} {'p95 s':>8} {'p99 s':>8}  Parse paths",
+        "─" * 100,
+    ]
+    for (stage, provider), records in sorted(groups.items()):
+        # Cancelled calls (hedging losers, dropped prefetches) were cut
+        # short on purpose: neither errors nor representative latencies
+        finished = [record for record in records if record.error != "cancelled"]
+        errors = sum(1 for record in finished if record.error)
+        paths = defaultdict(int)
+        for record in records:
+            if record.parse_path:
+                paths[record.parse_path] += 1
+        paths_str = ", ".join(f"{name} {count}" for name, count in sorted(paths.items()))
+
+        if finished:
+            seconds = [record.seconds for record in finished]
+            latencies = " ".join(f"{percentile(seconds, p):>8.3f}" for p in (50, 95, 99))
+        else:
+            latencies = " ".join(f"{'-':>8}" for _ in range(3))
+        lines.append(
+            f"{stage:14} {provider[:24]:24} {len(records):>6} {errors:>6} {latencies}  {paths_str}"
+        )
+
+    first = time.strftime("%Y-%m-%d %H:%M", time.localtime(spans[0].timestamp))
+    lines.append("")
+    lines.append(f"{len(spans)} span(s) since {first}")
+    return "\n".join(lines)
@@ -0,0 +1,142 @@
+"""Corpus-wide theme keyword index for TF-IDF theme ranking.
+
+Stores a sparse keyword-by-transcript count matrix (one row of non-zero
+counts per transcript, keyed by the transcript's content hash) plus the
+document frequency of every keyword, persisted to cache/theme_index.json.
+The index is updated incrementally as transcripts are fetched with the
+transcript cache enabled.
+"""
+
+import math
+import threading
+from pathlib import Path
+
+from .config import get_cache_path, load_json, save_json
+
+
+INDEX_VERSION = 1
+
+
+def get_theme_index_path() -> Path:
+    """Get the path to the theme index file."""
+    return get_cache_path() / "theme_index.json"
+
+
+class ThemeIndex:
+    """Sparse keyword-document count matrix with document frequencies."""
+
+    def __init__(
+        self,
+        documents: dict[str, dict[str, int]] | None = None,
+        document_frequency: dict[str, int] | None = None
+    ):
+        self.documents = documents or {}
+        self.document_frequency = document_frequency or {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> "ThemeIndex":
+        """Load the index from disk, or return an empty index."""
+        path = path or get_theme_index_path()
+        if not path.exists():
+            return cls()
+        try:
+            data = load_json(path)
+        except (OSError, ValueError):
+            return cls()
+        if data.get("version") != INDEX_VERSION:
+            return cls()
+        return cls(data.get("documents", {}), data.get("document_frequency", {}))
+
+    def save(self, path: Path | None = None) -> None:
+        """Persist the index to disk."""
+        with self.lock:
+            save_json(path or get_theme_index_path(), {
+                "version": INDEX_VERSION,
+                "documents": self.documents,
+                "document_frequency": self.document_frequency,
+            })
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.documents
+
+    def add_document(self, doc_id: str, counts: dict[str, int]) -> bool:
+        """Add a transcript's keyword counts. Returns False if already indexed."""
+        with self.lock:
+            if doc_id in self.documents:
+                return False
+            row = {keyword: count for keyword, count in counts.items() if count > 0}
+            self.documents[doc_id] = row
+            for keyword in row:
+                self.document_frequency[keyword] = self.document_frequency.get(keyword, 0) + 1
+            return True
+
+    def idf(self, keyword: str) -> float:
+        """Smoothed inverse document frequency of a keyword."""
+        df = self.document_frequency.get(keyword, 0)
+        return math.log((1 + len(self.documents)) / (1 + df)) + 1.0
+
+
+# Process-wide index, loaded on first use
+_index: ThemeIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_theme_index() -> ThemeIndex:
+    """Get the process-wide theme index, loading it from disk on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ThemeIndex.load()
+        return _index
+
+
+def update_theme_index(doc_id: str, counts: dict[str, int]) -> ThemeIndex:
+    """Add a transcript to the index and persist it if it was new."""
+    index = get_theme_index()
+    if index.add_document(doc_id, counts):
+        try:
+            index.save()
+        except OSError:
+            pass  # Index is a cache; a failed write only costs a rebuild
+    return index
+
+
+def backfill_theme_index() -> int:
+    """Index every parsed transcript in the transcript cache.
+
+    Returns the number of transcripts added.
+    """
+    from .fetcher import count_theme_keywords, get_transcript_cache_dir
+
+    index = get_theme_index()
+    added = 0
+
+    for result_path in sorted(get_transcript_cache_dir().glob("*.json")):
+        doc_id = result_path.stem
+        if doc_id in index:
+            continue
+        try:
+            text = load_json(result_path)["text"]
+        except (OSError, ValueError, KeyError):
+            continue
+        if index.add_document(doc_id, count_theme_keywords(text)):
+            added += 1
+
+    if added:
+        index.save()
+    return added
+
+
+if __name__ == "__main__":
+    # Usage: python -m frconor_post.theme_index
+    import time
+
+    start = time.perf_counter()
+    added = backfill_theme_index()
+    elapsed = time.perf_counter() - start
+    print(f"Indexed {added} new transcript(s) in {elapsed:.2f}s "
+          f"({len(get_theme_index())} total)")
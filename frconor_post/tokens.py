@@ -0,0 +1,104 @@
+"""Prompt token estimation and per-provider prompt budgets."""
+
+import math
+
+
+# Used when a provider has no max_prompt_tokens setting
+DEFAULT_PROMPT_BUDGET = 4000
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens in a text.
+
+    Averages the two usual rules of thumb for English (about 4 characters
+    per token and about 0.75 words per token). Good to within ~10% for
+    prose, which is all a budget needs.
+    """
+    if not text:
+        return 0
+    by_chars = len(text) / 4
+    by_words = len(text.split()) * 4 / 3
+    return math.ceil((by_chars + by_words) / 2)
+
+
+def get_prompt_budget(provider: str, llm_config: dict) -> int:
+    """Get the prompt token budget for a provider from settings."""
+    provider_config = llm_config.get("providers", {}).get(provider, {})
+    return provider_config.get("max_prompt_tokens", DEFAULT_PROMPT_BUDGET)
+
+
+def fit_text_to_tokens(text: str, max_tokens: int) -> str:
+    """Trim text at a word boundary so it fits within max_tokens.
+
+    Returns the longest word prefix whose estimate is within the budget.
+    Text that already fits is returned unchanged.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+
+    words = text.split(" ")
+    low, high = 0, len(words)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(" ".join(words[:mid])) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+
+    return " ".join(words[:low]).rstrip()
+
+
+def fill_to_budget(prompt: str, placeholder: str, text: str, max_tokens: int) -> str:
+    """Fill a placeholder with as much of text as the prompt budget allows.
+
+    Args:
+        prompt: Filled template still containing the placeholder
+        placeholder: Placeholder to replace, e.g. "{transcript_excerpt}"
+        text: Text to insert, trimmed at a word boundary if needed
+        max_tokens: Token budget for the whole prompt
+
+    Returns:
+        The prompt with the placeholder replaced
+    """
+    overhead = estimate_tokens(prompt.replace(placeholder, ""))
+    fitted = fit_text_to_tokens(text, max_tokens - overhead)
+    filled = prompt.replace(placeholder, fitted)
+
+    # Estimates are not exactly additive; shave off any rounding overshoot
+    excess = estimate_tokens(filled) - max_tokens
+    while excess > 0 and fitted:
+        fitted = fit_text_to_tokens(fitted, estimate_tokens(fitted) - excess)
+        filled = prompt.replace(placeholder, fitted)
+        excess = estimate_tokens(filled) - max_tokens
+
+    return filled
+
+
+def fill_lines_to_budget(prompt: str, placeholder: str, lines: list[str], max_tokens: int) -> str:
+    """Fill a placeholder with as many whole lines as the prompt budget allows.
+
+    Like fill_to_budget, but never cuts a line in half: lines are kept in
+    order and the ones that don't fit are dropped from the end.
+
+    Args:
+        prompt: Filled template still containing the placeholder
+        placeholder: Placeholder to replace, e.g. "{candidates}"
+        lines: Lines to insert, most important first
+        max_tokens: Token budget for the whole prompt
+
+    Returns:
+        The prompt with the placeholder replaced
+    """
+    def fill(count: int) -> str:
+        return prompt.replace(placeholder, "\n".join(lines[:count]))
+
+    low, high = 0, len(lines)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(fill(mid)) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return fill(low)
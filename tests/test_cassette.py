@@ -0,0 +1,65 @@
+"""Cassette loading, prompt lookup and replay."""
+
+import json
+import time
+
+from frconor_post import cassette
+from frconor_post.cassette import Interaction, find_interaction, load_cassette, prompt_key, replay
+
+
+def interaction(prompt, stdout, returncode=0, seconds=5.0):
+    return Interaction(prompt_key(prompt), "claude", prompt, [(1.0, stdout)], "", returncode, seconds)
+
+
+def write_cassette(path, *interactions):
+    path.write_text("".join(json.dumps(i._asdict()) + "\n" for i in interactions), encoding="utf-8")
+
+
+def test_truncated_line_is_skipped_and_later_recording_wins(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    write_cassette(path, interaction("a", "first\n"), interaction("b", "other\n"), interaction("a", "second\n"))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(interaction("c", "cut\n")._asdict())[:40])  # Interrupted mid-write
+
+    interactions = load_cassette(path)
+
+    assert set(interactions) == {prompt_key("a"), prompt_key("b")}
+    assert interactions[prompt_key("a")].lines == [[1.0, "second\n"]]
+
+
+def test_find_interaction_tries_stdin_then_argv():
+    interactions = {prompt_key(p): interaction(p, p) for p in ("stdin prompt", "argv prompt")}
+
+    # stdin mode: the prompt is the stdin candidate; flags in argv have no recording
+    assert find_interaction(interactions, ["stdin prompt", "-p"]).prompt == "stdin prompt"
+    # argv mode: empty stdin is not a candidate, the prompt is an argument
+    assert find_interaction(interactions, ["-p", "argv prompt"]).prompt == "argv prompt"
+    assert find_interaction(interactions, ["-p", "unrecorded"]) is None
+
+
+def test_replay_returns_exit_status_without_delay_at_scale_zero(capsys):
+    recorded = Interaction(prompt_key("p"), "claude", "p", [(2.0, "line 1\n"), (4.0, "line 2\n")],
+                           "rate limited\n", 2, 30.0)
+
+    start = time.monotonic()
+    status = replay(recorded, 0)
+    elapsed = time.monotonic() - start
+
+    out = capsys.readouterr()
+    assert status == 2
+    assert out.out == "line 1\nline 2\n"
+    assert out.err == "rate limited\n"
+    assert elapsed < 1.0
+
+
+def test_replay_keeps_scaled_timing(capsys):
+    recorded = Interaction(prompt_key("p"), "claude", "p", [(0.5, "x\n")], "", 0, 1.0)
+
+    start = time.monotonic()
+    assert replay(recorded, 0.2) == 0
+    assert 0.2 <= time.monotonic() - start < 1.0
+
+
+def test_is_recording_follows_mode():
+    assert cassette.is_recording({"cassette": {"mode": "record"}})
+    assert not cassette.is_recording({})
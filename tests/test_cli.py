@@ -0,0 +1,32 @@
+"""Streaming hooks around the selection prompt."""
+
+import threading
+
+from frconor_post import cli
+from frconor_post.quote_generator import Hook
+
+
+def test_hooks_arriving_during_a_prompt_print_after_it(capsys, monkeypatch):
+    release = threading.Event()
+
+    def generate(cancel_event):
+        yield Hook(number=1, style="Question", text="First")
+        release.wait()
+        yield Hook(number=2, style="Question", text="Second")
+
+    stream = cli.HookStream(generate)
+    stream.wait_first()
+
+    def fake_input(prompt):
+        print(prompt, end="")
+        release.set()
+        stream.done.wait()
+        print("<answer>")
+        return "2"
+
+    monkeypatch.setattr("builtins.input", fake_input)
+
+    assert stream.get_input("Pick") == "2"
+    out = capsys.readouterr().out
+    assert out.index("First") < out.index("Pick: <answer>") < out.index("Second")
+    assert "Pick: <answer>\n" in out
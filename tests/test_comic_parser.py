@@ -0,0 +1,53 @@
+"""Comic concepts: prompt layout wording and text-mode parsing."""
+
+from frconor_post import comic_generator
+from frconor_post.comic_generator import _parse_comic_concepts
+
+
+def concept(n):
+    return f"""{n}. [Strip {n}]
+   Arc: A child learns to wait.
+   Panel 1: A boy at a window.
+   Dialogue 1: SPEECH: "Is it time yet?"
+   Panel 2: His mother at the stove.
+   Dialogue 2: SPEECH: "Not yet."
+   Panel 3: The boy kneels by his bed,
+   hands folded.
+   Dialogue 3: THOUGHT: "Maybe if I pray..."
+   Panel 4: Morning light on the door.
+   Dialogue 4: CAPTION: "Patience is love
+   that waits."
+"""
+
+
+RESPONSE = (
+    "Here are four comic strip concepts:\n\n"
+    + "\n---\n\n".join(concept(n) for n in range(1, 5))
+    + "\n---\n\nI hope these work for your post! Let me know if you'd like any changes."
+)
+
+
+def test_separators_and_closing_remark_are_dropped():
+    trace = {}
+    concepts = _parse_comic_concepts(RESPONSE, 4, trace, json_mode=False)
+
+    assert trace["parse_path"] == "strict"
+    assert [c.title for c in concepts] == ["Strip 1", "Strip 2", "Strip 3", "Strip 4"]
+    for c in concepts:
+        # Multi-line fields are kept whole
+        assert c.panels[2] == "The boy kneels by his bed, hands folded."
+        assert c.dialogues[3] == 'CAPTION: "Patience is love that waits."'
+        assert all("---" not in text for text in c.dialogues + c.panels)
+    assert "hope" not in concepts[-1].dialogues[-1]
+
+
+def test_prompt_layout_follows_panel_count(monkeypatch):
+    style = {"name": "Ink", "prompt_elements": {"style_description": "ink wash"}}
+    for panel_count, layout in [(4, "4-panel horizontal strip (read left to right)"),
+                                (6, "6-panel strip laid out as a grid of two rows of 3")]:
+        monkeypatch.setattr(comic_generator, "load_settings",
+                            lambda: {"comic_generation": {"panel_count": panel_count}, "llm": {}})
+        prompt = comic_generator.build_comic_concept_prompt(["mercy"], "excerpt", style, "claude")
+
+        assert layout in prompt
+        assert "{strip_layout}" not in prompt
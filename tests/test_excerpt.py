@@ -0,0 +1,38 @@
+"""Salience excerpts keep the transcript's paragraph structure."""
+
+import pytest
+
+from frconor_post import excerpt
+
+
+@pytest.fixture(autouse=True)
+def score_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(excerpt, "get_cache_path", lambda: tmp_path)
+
+
+TRANSCRIPT = "\n\n".join([
+    "Mercy is the heart of the Gospel. The father runs to meet his son. Mercy comes first.",
+    "The weather was mild that week. Nobody remembers the road.",
+    "Mercy again waits at the door. The father forgives the son before a word is said.",
+])
+
+
+def test_adjacent_sentences_keep_paragraph_breaks():
+    text = "Mercy waits for the son. Mercy runs to him.\n\nThe father forgives the son."
+
+    assert excerpt.select_salient_excerpt(text, 100) == text
+
+
+def test_gaps_are_marked_between_paragraphs():
+    result = excerpt.select_salient_excerpt(TRANSCRIPT, 30)
+
+    assert "\n\n[...]\n\n" in result
+    assert "weather" not in result
+    for passage in result.split("\n\n"):
+        assert passage == "[...]" or passage in TRANSCRIPT
+
+
+def test_paragraph_numbers_follow_split_sentences():
+    sentences = excerpt.split_sentences(TRANSCRIPT)
+
+    assert excerpt.paragraph_numbers(TRANSCRIPT, sentences) == [0, 0, 0, 1, 1, 2, 2]
@@ -0,0 +1,60 @@
+"""Parity of the streaming and BeautifulSoup transcript extractors."""
+
+from pathlib import Path
+
+import pytest
+
+from frconor_post.extractor import CLOSING_PRAYER_PREFIX, extract_paragraphs
+from frconor_post.fetcher import _parse_transcript
+
+
+FIXTURES = Path(__file__).parent / "fixtures" / "transcripts"
+PAGES = sorted(FIXTURES.glob("*.html"))
+
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda path: path.stem)
+def test_backends_extract_the_same_paragraphs(page):
+    html = page.read_text(encoding="utf-8")
+
+    stream = extract_paragraphs(html, "stream")
+    bs4 = extract_paragraphs(html, "bs4")
+
+    assert stream == bs4
+    assert stream
+    assert not any(text.startswith(CLOSING_PRAYER_PREFIX) for text in stream)
+
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda path: path.stem)
+def test_backends_parse_the_same_transcript(page):
+    html = page.read_text(encoding="utf-8")
+    url = f"https://frconor-ebook.github.io/meditations/{page.stem}"
+
+    assert _parse_transcript(html, url, "stream") == _parse_transcript(html, url, "bs4")
+
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda path: path.stem)
+def test_streamed_chunks_match_whole_page(page):
+    html = page.read_text(encoding="utf-8")
+    chunks = [html[i:i + 37] for i in range(0, len(html), 37)]
+
+    assert extract_paragraphs(iter(chunks), "stream") == extract_paragraphs(html, "bs4")
+
+
+def test_article_page_content():
+    html = (FIXTURES / "article_page.html").read_text(encoding="utf-8")
+    paragraphs = extract_paragraphs(html, "stream")
+
+    # Only the <article>: no tagline from the header, no footer
+    assert paragraphs[0] == "Mar 12, 2024"
+    assert not any("Daily meditations" in text or "©" in text for text in paragraphs)
+    # Entities decoded, inline markup flattened
+    assert paragraphs[1].startswith("Let’s begin")
+    assert "extraordinary" in paragraphs[2] and "resting & praying" in paragraphs[2]
+
+
+def test_main_page_skips_template_and_aside():
+    html = (FIXTURES / "main_page.html").read_text(encoding="utf-8")
+    paragraphs = extract_paragraphs(html, "stream")
+
+    assert not any("Hidden template" in text or "Related:" in text for text in paragraphs)
+    assert not any(text == "Skip to content" for text in paragraphs)
@@ -0,0 +1,31 @@
+"""Pool sizing of the shared HTTP session."""
+
+from frconor_post import fetcher, theme_index
+
+
+def test_larger_pool_size_remounts_the_adapter(monkeypatch):
+    monkeypatch.setattr(fetcher, "_session", None)
+    monkeypatch.setattr(fetcher, "_session_pool_size", 0)
+
+    session = fetcher.get_session(pool_size=4)
+    assert session.get_adapter("https://example.org")._pool_maxsize == 4
+
+    assert fetcher.get_session(pool_size=16) is session
+    assert session.get_adapter("https://example.org")._pool_maxsize == 16
+
+    fetcher.get_session(pool_size=2)
+    assert session.get_adapter("https://example.org")._pool_maxsize == 16
+
+
+def test_uncached_fetch_leaves_the_theme_index_file_alone(tmp_path, monkeypatch):
+    path = tmp_path / "theme_index.json"
+    monkeypatch.setattr(theme_index, "get_theme_index_path", lambda: path)
+    monkeypatch.setattr(theme_index, "_index", None)
+    result = fetcher.TranscriptResult(text="prayer and silence", word_count=3, themes=[])
+
+    fetcher._with_corpus_themes(result, "abc", {}, use_cache=False)
+    assert not path.exists()
+    assert "abc" not in theme_index.get_theme_index()
+
+    fetcher._with_corpus_themes(result, "abc", {})
+    assert path.exists()
@@ -0,0 +1,85 @@
+"""Image job queue: batch scoping and fan-out through the stand-in CLI."""
+
+import stat
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from frconor_post import artifacts, image_jobs, telemetry
+
+
+SETTINGS = {"image_generation": {"max_concurrency": 2}}
+
+
+@pytest.fixture(autouse=True)
+def job_queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_jobs, "get_jobs_db_path", lambda: tmp_path / "image_jobs.sqlite3")
+    monkeypatch.setattr(telemetry, "get_telemetry_path", lambda: tmp_path / "telemetry.jsonl")
+    monkeypatch.setattr(image_jobs, "_worker", None)
+
+
+@pytest.fixture
+def ran(monkeypatch):
+    monkeypatch.setattr(image_jobs, "_record_job_files", lambda job, watcher, seconds: [])
+    monkeypatch.setattr(image_jobs, "OutputWatcher", lambda: None)
+    prompts = []
+
+    def run(job, settings):
+        prompts.append(job.prompt)
+        return image_jobs.JobResult(True, 0.0, "")
+
+    monkeypatch.setattr(image_jobs, "run_image_job", run)
+    return prompts
+
+
+def image_prompt(text, n=1):
+    return SimpleNamespace(prompt=text, n=n, aspect_ratio="1:1", model_tier="pro",
+                           resolution="1K", style_id="ink", style_name="Ink")
+
+
+def test_wait_runs_only_its_own_batch(ran, capsys):
+    old = image_jobs.enqueue_images(image_prompt("left over"), SETTINGS)
+
+    batch = image_jobs.submit_images(image_prompt("new"), SETTINGS)
+    jobs = batch.wait()
+
+    assert [job.status for job in jobs] == ["done"]
+    assert [job.status for job in image_jobs.list_jobs(old)] == ["pending"]
+    assert not any("left over" in prompt for prompt in ran)
+
+
+def test_resume_runs_every_pending_job(ran, capsys):
+    old = image_jobs.enqueue_images(image_prompt("left over"), SETTINGS)
+
+    image_jobs.ensure_worker(SETTINGS).join()
+
+    assert [job.status for job in image_jobs.list_jobs(old)] == ["done"]
+
+
+def test_fan_out_queues_and_collects_every_variation(tmp_path, monkeypatch, capsys):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    monkeypatch.setattr(artifacts, "get_output_dir", lambda: output_dir)
+    monkeypatch.setattr(artifacts, "get_artifacts_db_path", lambda: tmp_path / "image_artifacts.sqlite3")
+    monkeypatch.setenv("FRCMED_STANDIN_SECONDS", "0")
+    monkeypatch.setenv("FRCMED_STANDIN_OUTPUT", str(output_dir))
+    monkeypatch.setenv("PYTHONPATH", str(Path(__file__).resolve().parent.parent))
+
+    # frcmed-image-standin, run from this checkout
+    command = tmp_path / "image-standin"
+    command.write_text(f"#!{sys.executable}\nfrom frconor_post.image_standin import main\nmain()\n")
+    command.chmod(command.stat().st_mode | stat.S_IXUSR)
+    settings = {"image_generation": {"fan_out": True, "max_concurrency": 3, "command": str(command)}}
+
+    batch = image_jobs.submit_images(image_prompt("A lighthouse at dawn", n=3), settings)
+    jobs = batch.wait()
+
+    assert [(job.variation, job.status) for job in jobs] == [(1, "done"), (2, "done"), (3, "done")]
+    assert all("File name: variation_" in job.prompt for job in jobs)
+    collected = batch.artifacts()
+    assert [(a.variation, Path(a.path).name, a.width, a.height) for a in collected] == [
+        (n, f"variation_{n}.png", 320, 320) for n in (1, 2, 3)
+    ]
+    assert image_jobs.format_batch_summary(jobs) == "  3 of 3 variations generated"
@@ -0,0 +1,78 @@
+"""Response caching: only valid responses, keyed by the provider that answered."""
+
+import pytest
+
+from frconor_post import llm_cache
+
+
+@pytest.fixture(autouse=True)
+def response_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "get_llm_cache_path", lambda: tmp_path / "llm_responses.sqlite3")
+    monkeypatch.setattr(llm_cache, "_get_cache_config", lambda: {})
+
+
+def is_valid(response):
+    return response.startswith("1.")
+
+
+def test_invalid_response_is_returned_but_not_cached():
+    calls = []
+
+    def call():
+        calls.append(1)
+        return "claude", "Sorry, I can't help with that."
+
+    for _ in range(2):
+        _, response = llm_cache.cached_call("claude", None, "prompt", call, validate=is_valid)
+        assert response == "Sorry, I can't help with that."
+
+    assert len(calls) == 2
+    assert llm_cache.get_cached_response("claude", None, "prompt") is None
+
+
+def test_valid_response_is_served_from_cache():
+    calls = []
+
+    def call():
+        calls.append(1)
+        return "claude", "1. A hook"
+
+    for _ in range(2):
+        assert llm_cache.cached_call("claude", None, "prompt", call, validate=is_valid) == ("claude", "1. A hook")
+
+    assert len(calls) == 1
+
+
+def test_invalid_cached_response_is_a_miss():
+    llm_cache.store_response("claude", None, "prompt", "stale fallback text")
+
+    _, response = llm_cache.cached_call("claude", None, "prompt", lambda: ("claude", "1. Fresh"),
+                                        validate=is_valid)
+
+    assert response == "1. Fresh"
+    assert llm_cache.get_cached_response("claude", None, "prompt") == "1. Fresh"
+
+
+def test_fallback_response_is_keyed_by_the_fallback(monkeypatch):
+    monkeypatch.setattr(llm_cache, "get_provider_model", lambda provider, llm_config: f"{provider}-model")
+
+    answered = llm_cache.cached_call("claude", "claude-model", "prompt", lambda: ("gemini", "1. From gemini"))
+
+    assert answered == ("gemini", "1. From gemini")
+    assert llm_cache.get_cached_response("gemini", "gemini-model", "prompt") == "1. From gemini"
+
+
+def test_fallback_response_is_served_for_the_requested_provider(monkeypatch):
+    monkeypatch.setattr(llm_cache, "get_provider_model", lambda provider, llm_config: f"{provider}-model")
+    calls = []
+
+    def call():
+        calls.append(1)
+        return "gemini", "1. From gemini"
+
+    first = llm_cache.cached_call("claude", "claude-model", "prompt", call)
+    second = llm_cache.cached_call("claude", "claude-model", "prompt", call)
+
+    assert first == ("gemini", "1. From gemini")
+    assert second == ("claude", "1. From gemini")
+    assert len(calls) == 1
@@ -0,0 +1,76 @@
+"""Provider CLI plumbing: stdin prompt delivery and persistent sessions."""
+
+import hashlib
+import stat
+import sys
+
+import pytest
+
+from frconor_post import providers, telemetry
+
+
+STANDIN = """#!{python}
+import hashlib, sys
+data = sys.stdin.buffer.read()
+print(len(data), hashlib.sha256(data).hexdigest())
+"""
+
+
+SESSION_STANDIN = """#!{python}
+import json, os, sys
+turns = 0
+for line in sys.stdin:
+    turns += 1
+    text = f"pid {os.getpid()} turn {turns}"
+    print(json.dumps({"type": "assistant", "message": {"content": [{"type": "text", "text": text}]}}))
+    print(json.dumps({"type": "result", "is_error": False}), flush=True)
+"""
+
+
+@pytest.fixture(autouse=True)
+def telemetry_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(telemetry, "get_telemetry_path", lambda: tmp_path / "telemetry.jsonl")
+
+
+def write_script(path, source):
+    path.write_text(source.replace("{python}", sys.executable))
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return path
+
+
+@pytest.fixture
+def standin(tmp_path):
+    """A stand-in provider CLI that reports the size and hash of its stdin."""
+    return write_script(tmp_path / "standin", STANDIN)
+
+
+@pytest.fixture
+def session_standin(tmp_path):
+    """A stand-in stream-json session CLI that reports its pid and turn count."""
+    yield write_script(tmp_path / "session_standin", SESSION_STANDIN)
+    providers.shutdown_sessions()
+    providers._sessions.pop("standin", None)
+
+
+@pytest.mark.parametrize("backend", ["claude", "gemini", "codex"])
+def test_100k_word_prompt_arrives_intact_over_stdin(standin, backend):
+    prompt = " ".join(f"word{i}" for i in range(100_000))
+    data = prompt.encode("utf-8")
+    # A settings entry running a built-in backend with the stand-in as its command
+    config = {"providers": {"standin": {"backend": backend, "command": str(standin), "prompt_via": "stdin"}}}
+
+    response = providers.call_provider("standin", prompt, config, timeout=60)
+
+    assert response.split() == [str(len(data)), hashlib.sha256(data).hexdigest()]
+    assert "standin" not in providers.BACKENDS
+
+
+def test_each_session_request_gets_its_own_conversation(session_standin):
+    config = {"providers": {"standin": {
+        "backend": "claude", "command": str(session_standin), "session": {"enabled": True}
+    }}}
+
+    responses = [providers.call_provider("standin", f"prompt {n}", config, timeout=30) for n in range(3)]
+
+    assert all(response.endswith("turn 1") for response in responses)
+    assert len({response.split()[1] for response in responses}) == 3
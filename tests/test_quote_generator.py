@@ -0,0 +1,63 @@
+"""Hook merging and automatic refill of skipped slots."""
+
+import json
+
+import pytest
+
+from frconor_post import quote_generator, telemetry
+from frconor_post.quote_generator import Hook, merge_hooks
+
+
+@pytest.fixture(autouse=True)
+def telemetry_file(tmp_path, monkeypatch):
+    path = tmp_path / "telemetry.jsonl"
+    monkeypatch.setattr(telemetry, "get_telemetry_path", lambda: path)
+    return path
+
+
+def hooks(*numbers):
+    return [Hook(number=n, style="Question", text=f"Hook {i}") for i, n in enumerate(numbers)]
+
+
+def test_duplicate_numbers_keep_both_hooks():
+    merged = merge_hooks(hooks(1, 2, 2, 4), [])
+
+    assert [hook.text for hook in merged] == ["Hook 0", "Hook 1", "Hook 2", "Hook 3"]
+    assert [hook.number for hook in merged] == [1, 2, 3, 4]
+
+
+def test_kept_hook_keeps_its_slot():
+    kept = [Hook(number=3, style="Paradox", text="Kept")]
+    new = [Hook(number=3, style="Paradox", text="New"), Hook(number=5, style="Question", text="Five")]
+
+    merged = merge_hooks(kept, new)
+
+    assert [(hook.number, hook.text) for hook in merged] == [(1, "New"), (3, "Kept"), (5, "Five")]
+
+
+@pytest.fixture
+def refills(monkeypatch):
+    calls = []
+
+    def refill(episode_title, transcript, kept, slots, provider, cancel_event):
+        calls.append(slots)
+        return [Hook(number=n, style="Question", text=f"Refill {n}") for n in slots]
+
+    monkeypatch.setattr(quote_generator, "refill_hooks", refill)
+    return calls
+
+
+def test_lenient_parse_is_not_refilled(refills):
+    assert quote_generator._refill_missing("Title", "text", hooks(1, 2), "claude", None, "lenient") == []
+    assert refills == []
+
+
+def test_skipped_slots_are_refilled_once_and_recorded(refills, telemetry_file):
+    parsed = hooks(*range(1, 14), 13)  # 14 hooks, 13 numbered twice: only slot 15 is missing
+
+    refill = quote_generator._refill_missing("Title", "text", parsed, "claude", None, "strict")
+
+    assert refills == [[15]]
+    assert [hook.number for hook in refill] == [15]
+    spans = [json.loads(line) for line in telemetry_file.read_text().splitlines()]
+    assert [(s["stage"], s["provider"], s["parse_path"]) for s in spans] == [("refill", "claude", "strict")]
@@ -0,0 +1,84 @@
+"""JSON responses: found after a preamble, and repaired before any regenerate."""
+
+import json
+
+from frconor_post import structured
+from frconor_post.hedging import HedgedResponse
+from frconor_post.quote_generator import _parse_hooks
+from frconor_post.structured import OutputSchema, json_response_items
+
+
+HOOKS = {"hooks": [
+    {"number": 1, "style": "Question", "text": "What if mercy came first?"},
+    {"number": 2, "style": "Paradox", "text": "The last shall be first."},
+]}
+
+PREAMBLE = "Here you go:\n" + json.dumps(HOOKS) + "\nLet me know if you want changes."
+
+
+def test_preamble_json_is_parsed_in_json_mode():
+    assert json_response_items(PREAMBLE, "hooks", json_mode=True) == HOOKS["hooks"]
+
+    trace = {}
+    hooks = _parse_hooks(PREAMBLE, trace, json_mode=True)
+
+    assert [hook.text for hook in hooks] == ["What if mercy came first?", "The last shall be first."]
+    assert trace["parse_path"] == "json"
+
+
+def test_preamble_is_left_to_the_text_parsers_in_text_mode():
+    assert json_response_items(PREAMBLE, "hooks", json_mode=False) is None
+
+
+def test_leading_json_is_parsed_in_either_mode():
+    fenced = "```json\n" + json.dumps(HOOKS) + "\n```"
+
+    assert json_response_items(fenced, "hooks", json_mode=False) == HOOKS["hooks"]
+
+
+SCHEMA = OutputSchema("hooks", 2, {"number": (int, "Slot"), "style": (str, "Style"), "text": (str, "Hook")})
+
+JSON_MODE = {"output_format": "json"}
+
+
+def missing_text_response():
+    items = [dict(HOOKS["hooks"][0]), {"number": 2, "style": "Paradox"}]
+    return "Here you go:\n" + json.dumps({"hooks": items})
+
+
+def fake_provider(monkeypatch, responses):
+    """Stand in for call_with_fallback: pop canned responses, recording each call's validator."""
+    calls = []
+
+    def call(prompt, llm_config, provider, validate, cancel_event=None):
+        response = responses.pop(0)
+        calls.append((prompt, validate(response)))
+        return HedgedResponse(provider, response)
+
+    monkeypatch.setattr(structured, "call_with_fallback", call)
+    return calls
+
+
+def test_preamble_response_with_missing_field_is_repaired(monkeypatch):
+    repair = json.dumps({"hooks": [{"number": 2, "style": "Paradox", "text": "The last shall be first."}]})
+    calls = fake_provider(monkeypatch, [repair])
+
+    repaired = structured.repair_json_response(missing_text_response(), SCHEMA, "claude", JSON_MODE)
+
+    assert len(calls) == 1 and "hooks[2].text" in calls[0][0]
+    assert json.loads(repaired) == HOOKS
+
+
+def test_call_structured_repairs_before_regenerating(monkeypatch):
+    repair = json.dumps({"hooks": [{"number": 2, "style": "Paradox", "text": "The last shall be first."}]})
+    calls = fake_provider(monkeypatch, [missing_text_response(), repair])
+
+    def is_complete(response):
+        return len(structured.complete_items(structured.parse_json_items(response, "hooks"), SCHEMA)) == 2
+
+    answered_by, response = structured.call_structured("prompt", SCHEMA, JSON_MODE, "claude", is_complete)
+
+    # The first call is hedged on "has items", not on the full validator
+    assert [valid for _, valid in calls] == [True, True]
+    assert answered_by == "claude"
+    assert is_complete(response)
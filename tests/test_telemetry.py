@@ -0,0 +1,72 @@
+"""Telemetry spans: settings read once, rotation, and --stats aggregation."""
+
+import pytest
+
+from frconor_post import telemetry
+from frconor_post.telemetry import Span, format_stats, load_spans, record_span
+
+
+@pytest.fixture(autouse=True)
+def telemetry_file(tmp_path, monkeypatch):
+    path = tmp_path / "telemetry.jsonl"
+    monkeypatch.setattr(telemetry, "get_telemetry_path", lambda: path)
+    monkeypatch.setattr(telemetry, "_config", {"max_bytes": 300, "backups": 2})
+    return path
+
+
+def test_settings_are_read_once(monkeypatch):
+    reads = []
+    monkeypatch.setattr(telemetry, "_config", None)
+    monkeypatch.setattr(telemetry, "load_settings", lambda: reads.append(1) or {"telemetry": {}})
+
+    for _ in range(5):
+        record_span("parse.hooks", 0.01, provider="claude")
+
+    assert len(reads) == 1
+    assert len(load_spans()) == 5
+
+
+def test_rotation_keeps_the_configured_backups(telemetry_file):
+    for n in range(40):
+        record_span("provider", n, provider="claude")
+
+    rotated = sorted(p.name for p in telemetry_file.parent.glob("telemetry.jsonl.*"))
+    assert rotated == ["telemetry.jsonl.1", "telemetry.jsonl.2"]
+    assert telemetry_file.stat().st_size < 300 + 200
+
+    spans = load_spans()
+    seconds = [span.seconds for span in spans]
+    # Oldest spans were dropped with the third file; the rest are in order
+    assert 0 < len(spans) < 40
+    assert seconds == sorted(seconds) and seconds[-1] == 39
+
+
+def test_disabled_telemetry_writes_nothing(telemetry_file, monkeypatch):
+    monkeypatch.setattr(telemetry, "_config", {"enabled": False})
+
+    record_span("provider", 1.0)
+
+    assert not telemetry_file.exists()
+
+
+def test_stats_group_by_stage_and_provider():
+    spans = [Span(1.0, "provider", float(n), provider="claude") for n in range(1, 11)]
+    spans += [
+        Span(2.0, "provider", 99.0, provider="claude", error="cancelled"),
+        Span(2.0, "provider", 3.0, provider="gemini", error="timeout"),
+        Span(2.0, "parse.hooks", 0.01, provider="claude", parse_path="strict"),
+        Span(2.0, "parse.hooks", 0.02, provider="claude", parse_path="json"),
+        Span(2.0, "parse.hooks", 0.03, provider="claude", parse_path="json"),
+    ]
+
+    rows = {tuple(line.split()[:2]): line.split() for line in format_stats(spans).splitlines()[2:-2]}
+
+    # Count, errors, p50, p95, p99; the cancelled call is neither an error nor a latency
+    assert rows[("provider", "claude")][2:7] == ["11", "0", "5.000", "10.000", "10.000"]
+    assert rows[("provider", "gemini")][2:4] == ["1", "1"]
+    assert " ".join(rows[("parse.hooks", "claude")][7:]) == "json 2, strict 1"
+    assert "15 span(s) since" in format_stats(spans)
+
+
+def test_no_spans():
+    assert format_stats([]).startswith("No telemetry recorded yet")
@@ -0,0 +1,21 @@
+"""Prompt budgets keep whole lines."""
+
+from frconor_post.tokens import estimate_tokens, fill_lines_to_budget
+
+
+def test_lines_are_dropped_whole_from_the_end():
+    lines = [f'- [Question]: "Candidate hook number {n} about mercy"' for n in range(200)]
+    prompt = "Pick the best hooks:\n{candidates}\nReturn 15."
+
+    filled = fill_lines_to_budget(prompt, "{candidates}", lines, 500)
+
+    assert estimate_tokens(filled) <= 500
+    kept = filled.split("\n")[1:-1]
+    assert kept == lines[:len(kept)]
+    assert 0 < len(kept) < len(lines)
+
+
+def test_lines_within_budget_are_all_kept():
+    lines = ["one", "two", "three"]
+
+    assert fill_lines_to_budget("{x}", "{x}", lines, 100) == "one\ntwo\nthree"